@@ -0,0 +1,84 @@
+"""Benchmark memory of the coordinator device index at fleet scale.
+
+Compares keeping the raw /ea/devices dicts against the slotted Device
+records the coordinator builds, for the same parsed payload.
+
+Usage:
+    python benchmarks/bench_model_memory.py [--devices 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.simulator import generate_devices  # noqa: E402
+from custom_components.unifi_site_manager.models import Device  # noqa: E402
+
+
+def build_raw(groups: list[dict[str, Any]]) -> dict[str, Any]:
+    """Index the raw device dicts by MAC, as the coordinator used to."""
+    return {
+        device["mac"]: device for group in groups for device in group["devices"]
+    }
+
+
+def build_records(groups: list[dict[str, Any]]) -> dict[str, Any]:
+    """Index Device records by MAC, as the coordinator does now."""
+    return {
+        device["mac"]: Device.from_api(device, host_id=group["hostId"])
+        for group in groups
+        for device in group["devices"]
+    }
+
+
+def measure(body: bytes, build: Callable[[list[dict[str, Any]]], Any]) -> tuple[int, float]:
+    """Return retained bytes and build time of an index built from a body."""
+    gc.collect()
+    tracemalloc.start()
+    groups = json.loads(body)
+    start = time.perf_counter()
+    index = build(groups)
+    elapsed = time.perf_counter() - start
+    # Only the index survives a refresh, the parsed payload is dropped
+    del groups
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del index
+    return retained, elapsed
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=10_000)
+    parser.add_argument("--hosts", type=int, default=500)
+    args = parser.parse_args()
+
+    body = json.dumps(generate_devices(args.hosts, args.devices)).encode()
+    raw_bytes, raw_time = measure(body, build_raw)
+    record_bytes, record_time = measure(body, build_records)
+
+    print(f"devices:        {args.devices}")
+    print(f"payload:        {len(body) / 1024:.0f} KiB")
+    print(
+        f"raw dicts:      {raw_bytes / 1024:.0f} KiB retained, "
+        f"{raw_bytes / args.devices:.0f} B/device, {raw_time * 1000:.1f} ms"
+    )
+    print(
+        f"Device records: {record_bytes / 1024:.0f} KiB retained, "
+        f"{record_bytes / args.devices:.0f} B/device, {record_time * 1000:.1f} ms"
+    )
+    print(f"reduction:      {raw_bytes / record_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Benchmark full refresh cycles against the local API simulator.
+
+Each scenario starts the simulator in its own process, so only the client
+side is measured, then runs a number of refresh cycles and reports per
+cycle:
+
+- wall time
+- requests made and response bytes received (as counted by the simulator)
+- event loop blocking time, the time a 1 ms ticker task was held up
+- peak RSS of the benchmark process
+
+By default the coordinator is driven through a throwaway Home Assistant
+instance. With ``--mode api`` only the API client is driven, issuing the
+same requests as one coordinator refresh. Both modes need Home Assistant
+installed, since importing the API client loads the integration package.
+
+Every scenario runs in a fresh interpreter so peak RSS is not carried over
+from the previous one. Nothing leaves the machine.
+
+Usage:
+    python benchmarks/bench_refresh.py [--scenario fleet] [--mode api]
+        [--cycles 3] [--latency 0.05] [--error-rate 0.02]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass
+import json
+from pathlib import Path
+import resource
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from aiohttp import ClientSession  # noqa: E402
+
+from custom_components.unifi_site_manager.api import UnifiSiteManagerAPI  # noqa: E402
+from custom_components.unifi_site_manager.const import (  # noqa: E402
+    DEVICE_QUERY_CHUNK_SIZE,
+    METRIC_TYPE_5M,
+)
+
+# name: (sites, devices)
+SCENARIOS = {
+    "single": (1, 10),
+    "small": (50, 500),
+    "large": (500, 2_000),
+    "fleet": (500, 10_000),
+}
+
+
+@dataclass
+class CycleResult:
+    """Measurements of one refresh cycle."""
+
+    wall_ms: float
+    requests: int
+    bytes: int
+    blocked_ms: float
+    worst_block_ms: float
+
+
+class LoopBlockMonitor:
+    """Measure how long the event loop was unable to run a ticker task."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        """Initialize the monitor."""
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+        self.blocked = 0.0
+        self.worst = 0.0
+
+    async def _tick(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self._interval)
+            # Anything beyond the requested sleep and a little scheduling
+            # slack was spent running something else on the loop
+            lag = time.perf_counter() - start - self._interval
+            if lag > self._interval:
+                self.blocked += lag
+                self.worst = max(self.worst, lag)
+
+    def reset(self) -> None:
+        """Start a new measurement window."""
+        self.blocked = 0.0
+        self.worst = 0.0
+
+    def start(self) -> None:
+        """Start ticking."""
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+
+    async def stop(self) -> None:
+        """Stop ticking."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def start_simulator(args: argparse.Namespace, sites: int, devices: int) -> tuple[
+    asyncio.subprocess.Process, str
+]:
+    """Start the simulator in a child process and return it with its URL."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "benchmarks.simulator",
+        "--sites", str(sites),
+        "--devices", str(devices),
+        "--latency", str(args.latency),
+        "--error-rate", str(args.error_rate),
+        "--rate-limited-rate", str(args.rate_limited_rate),
+        cwd=ROOT,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    assert process.stdout is not None
+    url = (await process.stdout.readline()).decode().strip()
+    if not url:
+        raise RuntimeError("Simulator did not start")
+    return process, url
+
+
+async def simulator_stats(session: ClientSession, url: str) -> dict[str, int]:
+    """Return the counters of the simulator."""
+    async with session.get(f"{url}/_stats") as resp:
+        return await resp.json()
+
+
+async def api_refresh(api: UnifiSiteManagerAPI) -> None:
+    """Issue the requests of one coordinator refresh through the API client.
+
+    Mirrors the coordinator pipeline: sites then streamed metrics, alongside
+    hosts then devices in concurrent chunks of host IDs.
+    """
+
+    async def sites_then_metrics() -> None:
+        sites = await api.async_get_sites()
+        async for _record in api.async_iter_isp_metrics(
+            METRIC_TYPE_5M, site_ids=[site["siteId"] for site in sites]
+        ):
+            pass
+
+    async def hosts_then_devices() -> None:
+        host_ids = [host["id"] for host in await api.async_get_hosts()]
+        await asyncio.gather(
+            *(
+                api.async_get_devices(
+                    host_ids=host_ids[index : index + DEVICE_QUERY_CHUNK_SIZE]
+                )
+                for index in range(0, len(host_ids), DEVICE_QUERY_CHUNK_SIZE)
+            )
+        )
+
+    await asyncio.gather(sites_then_metrics(), hosts_then_devices())
+
+
+async def make_coordinator_refresh(api: UnifiSiteManagerAPI, config_dir: str) -> Any:
+    """Return a callable running one full coordinator refresh."""
+    # Imported here as the API mode does not need a Home Assistant instance
+    from homeassistant.core import HomeAssistant  # pylint: disable=import-outside-toplevel
+
+    from custom_components.unifi_site_manager.coordinator import (  # pylint: disable=import-outside-toplevel
+        UnifiSiteManagerDataUpdateCoordinator,
+    )
+
+    hass = HomeAssistant(config_dir)
+    entry = SimpleNamespace(entry_id="benchmark", options={}, data={})
+    coordinator = UnifiSiteManagerDataUpdateCoordinator(hass, api, entry)  # type: ignore[arg-type]
+
+    async def refresh() -> None:
+        await coordinator.async_refresh_all()
+        if not coordinator.last_update_success:
+            raise RuntimeError(f"Refresh failed: {coordinator.last_exception}")
+
+    return refresh
+
+
+async def run_scenario(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the cycles of one scenario and return the measurements."""
+    sites, devices = SCENARIOS[args.scenario]
+    process, url = await start_simulator(args, sites, devices)
+    monitor = LoopBlockMonitor()
+    cycles: list[CycleResult] = []
+    try:
+        async with ClientSession() as session:
+            api = UnifiSiteManagerAPI(
+                hass=None,  # type: ignore[arg-type]
+                api_key="benchmark",
+                host=url,
+                session=session,
+                rate_limit=100_000,
+            )
+            with tempfile.TemporaryDirectory() as config_dir:
+                if args.mode == "coordinator":
+                    refresh = await make_coordinator_refresh(api, config_dir)
+                else:
+                    async def refresh() -> None:
+                        await api_refresh(api)
+
+                monitor.start()
+                for _ in range(args.cycles):
+                    before = await simulator_stats(session, url)
+                    monitor.reset()
+                    start = time.perf_counter()
+                    await refresh()
+                    wall = time.perf_counter() - start
+                    after = await simulator_stats(session, url)
+                    cycles.append(
+                        CycleResult(
+                            wall_ms=wall * 1000,
+                            requests=after["requests"] - before["requests"],
+                            bytes=after["bytes"] - before["bytes"],
+                            blocked_ms=monitor.blocked * 1000,
+                            worst_block_ms=monitor.worst * 1000,
+                        )
+                    )
+                await monitor.stop()
+    finally:
+        process.terminate()
+        await process.wait()
+
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mib = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return {
+        "scenario": args.scenario,
+        "mode": args.mode,
+        "sites": sites,
+        "devices": devices,
+        "peak_rss_mib": round(peak_mib, 1),
+        "cycles": [asdict(cycle) for cycle in cycles],
+    }
+
+
+def print_report(results: list[dict[str, Any]]) -> None:
+    """Print one line per cycle of every scenario."""
+    print(
+        f"{'scenario':<8} {'sites':>5} {'devices':>7} {'cycle':>5} {'wall ms':>9} "
+        f"{'requests':>8} {'KiB':>9} {'blocked ms':>10} {'worst ms':>8} {'RSS MiB':>8}"
+    )
+    for result in results:
+        for index, cycle in enumerate(result["cycles"], 1):
+            print(
+                f"{result['scenario']:<8} {result['sites']:>5} {result['devices']:>7} "
+                f"{index:>5} {cycle['wall_ms']:>9.1f} {cycle['requests']:>8} "
+                f"{cycle['bytes'] / 1024:>9.1f} {cycle['blocked_ms']:>10.1f} "
+                f"{cycle['worst_block_ms']:>8.1f} {result['peak_rss_mib']:>8.1f}"
+            )
+
+
+def run_isolated(args: argparse.Namespace, scenario: str) -> dict[str, Any]:
+    """Run one scenario in a fresh interpreter and return its measurements."""
+    import subprocess  # pylint: disable=import-outside-toplevel
+
+    output = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--scenario", scenario,
+            "--mode", args.mode,
+            "--cycles", str(args.cycles),
+            "--latency", str(args.latency),
+            "--error-rate", str(args.error_rate),
+            "--rate-limited-rate", str(args.rate_limited_rate),
+            "--json",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS)
+    parser.add_argument("--mode", choices=("coordinator", "api"), default="coordinator")
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limited-rate", type=float, default=0.0)
+    parser.add_argument("--json", action="store_true", help="print raw results")
+    args = parser.parse_args()
+
+    if args.scenario:
+        results = [asyncio.run(run_scenario(args))]
+    else:
+        results = [run_isolated(args, scenario) for scenario in SCENARIOS]
+
+    if args.json:
+        print(json.dumps(results[0] if args.scenario else results))
+    else:
+        print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark refresh cycle wall time with and without request overlap.
+
+Runs the request pattern of one coordinator refresh (sites, then hosts,
+devices and metrics concurrently) against the local simulator. A single
+request slot reproduces the old global request lock; the default slot count
+lets the independent endpoints overlap.
+
+Usage:
+    python benchmarks/bench_request_scheduler.py [--latency 0.2] [--cycles 5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+import time
+
+from aiohttp import ClientSession
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.simulator import SiteManagerSimulator  # noqa: E402
+from custom_components.unifi_site_manager.api import UnifiSiteManagerAPI  # noqa: E402
+from custom_components.unifi_site_manager.const import (  # noqa: E402
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    METRIC_TYPE_5M,
+)
+
+
+async def refresh_cycle(api: UnifiSiteManagerAPI, host_ids: list[str]) -> None:
+    """Issue the requests of one coordinator refresh."""
+    sites = await api.async_get_sites()
+    await asyncio.gather(
+        api.async_get_hosts(),
+        api.async_get_devices(host_ids=host_ids),
+        api.async_get_isp_metrics_by_site(
+            METRIC_TYPE_5M, site_ids=[site["siteId"] for site in sites]
+        ),
+    )
+
+
+async def measure(url: str, max_concurrent: int, cycles: int) -> float:
+    """Return the mean wall time of a refresh cycle."""
+    async with ClientSession() as session:
+        api = UnifiSiteManagerAPI(
+            hass=None,
+            api_key="benchmark",
+            host=url,
+            session=session,
+            max_concurrent_requests=max_concurrent,
+        )
+        host_ids = [host["id"] for host in await api.async_get_hosts()]
+        start = time.perf_counter()
+        for _ in range(cycles):
+            await refresh_cycle(api, host_ids)
+        return (time.perf_counter() - start) / cycles
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--sites", type=int, default=10)
+    args = parser.parse_args()
+
+    simulator = SiteManagerSimulator(sites=args.sites, latency=args.latency)
+    url = await simulator.start()
+    try:
+        serial = await measure(url, 1, args.cycles)
+        overlapped = await measure(url, DEFAULT_MAX_CONCURRENT_REQUESTS, args.cycles)
+    finally:
+        await simulator.stop()
+
+    print(f"latency per request:       {args.latency * 1000:.0f} ms")
+    print(f"serialized (1 slot):       {serial * 1000:.0f} ms/cycle")
+    print(
+        f"scheduled ({DEFAULT_MAX_CONCURRENT_REQUESTS} slots):       "
+        f"{overlapped * 1000:.0f} ms/cycle"
+    )
+    print(f"speedup:                   {serial / overlapped:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,205 @@
+"""Benchmark entity setup of the sensor platforms at fleet scale.
+
+Loads generated sites, hosts, devices and ISP metrics into a coordinator
+running on a throwaway Home Assistant instance, then sets up the sensor and
+binary sensor platforms the way Home Assistant does at startup. Entities
+are collected rather than registered, so only the integration's own setup
+path is measured. Reports:
+
+- entities built and the DeviceInfo objects behind them
+- wall time of each platform setup
+- chunks handed to the platform
+- event loop blocking time, the time a 1 ms ticker task was held up
+
+Usage:
+    python benchmarks/bench_startup.py [--sites 500] [--devices 10000]
+        [--chunk-size 500]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Iterable
+from pathlib import Path
+import sys
+import tempfile
+import time
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from benchmarks.bench_refresh import LoopBlockMonitor  # noqa: E402
+from benchmarks.simulator import (  # noqa: E402
+    generate_devices,
+    generate_hosts,
+    generate_isp_metrics,
+    generate_sites,
+)
+from custom_components.unifi_site_manager import (  # noqa: E402
+    binary_sensor,
+    discovery,
+    sensor,
+)
+from custom_components.unifi_site_manager.aggregation import (  # noqa: E402
+    aggregate_sites,
+    pack_periods,
+)
+from custom_components.unifi_site_manager.const import DOMAIN  # noqa: E402
+from custom_components.unifi_site_manager.coordinator import (  # noqa: E402
+    UnifiSiteManagerDataUpdateCoordinator,
+)
+from custom_components.unifi_site_manager.models import (  # noqa: E402
+    Device,
+    Host,
+    IspPeriod,
+    Site,
+)
+
+PLATFORMS = {"sensor": sensor, "binary_sensor": binary_sensor}
+METRIC_PERIODS = 12  # one hour of 5m periods per site
+
+
+class BenchmarkEntry:
+    """Config entry stand-in with the parts the platforms use."""
+
+    entry_id = "benchmark"
+    domain = DOMAIN
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the entry."""
+        self.hass = hass
+        self.options: dict[str, Any] = {}
+        self.data: dict[str, Any] = {}
+        self._on_unload: list[Any] = []
+
+    def async_on_unload(self, func: Any) -> None:
+        """Keep an unload callback."""
+        self._on_unload.append(func)
+
+    def async_create_background_task(
+        self, hass: HomeAssistant, target: Any, name: str
+    ) -> asyncio.Task[Any]:
+        """Run a background task on the loop."""
+        return hass.loop.create_task(target, name=name)
+
+
+def load_fleet(
+    coordinator: UnifiSiteManagerDataUpdateCoordinator, sites: int, devices: int
+) -> None:
+    """Fill the coordinator with generated data, as a first refresh would."""
+    coordinator.data["sites"] = {
+        site["siteId"]: Site.from_api(site) for site in generate_sites(sites)
+    }
+    coordinator.data["hosts"] = {
+        host["id"]: Host.from_api(host) for host in generate_hosts(sites)
+    }
+    coordinator.data["devices"] = {
+        device["mac"]: Device.from_api(device, host_id=group["hostId"])
+        for group in generate_devices(sites, devices)
+        for device in group["devices"]
+    }
+    coordinator.data["metrics"] = {
+        result["siteId"]: [
+            period
+            for raw in result["periods"]
+            if (period := IspPeriod.from_api(raw)) is not None
+        ]
+        for result in generate_isp_metrics(sites, METRIC_PERIODS)
+    }
+    coordinator.device_index.update(coordinator.data["devices"])
+    coordinator._aggregates = aggregate_sites(  # pylint: disable=protected-access
+        {
+            site_id: pack_periods(periods)
+            for site_id, periods in coordinator.data["metrics"].items()
+        }
+    )
+    coordinator.async_update_listeners()
+
+
+async def setup_platform(
+    hass: HomeAssistant,
+    entry: BenchmarkEntry,
+    platform: Any,
+    monitor: LoopBlockMonitor,
+) -> dict[str, Any]:
+    """Set up one platform and return its measurements."""
+    entities: list[Any] = []
+    chunks = 0
+
+    def async_add_entities(new_entities: Iterable[Any], update_before_add: bool = False) -> None:
+        nonlocal chunks
+        chunks += 1
+        entities.extend(new_entities)
+
+    monitor.reset()
+    start = time.perf_counter()
+    await platform.async_setup_entry(hass, entry, async_add_entities)
+    wall = time.perf_counter() - start
+    # Let the ticker catch up with the last stretch of setup
+    await asyncio.sleep(0.01)
+
+    return {
+        "entities": len(entities),
+        "device_infos": len({id(entity.device_info) for entity in entities}),
+        "chunks": chunks,
+        "wall_ms": wall * 1000,
+        "blocked_ms": monitor.blocked * 1000,
+        "worst_block_ms": monitor.worst * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict[str, Any]]:
+    """Set up every platform against a generated fleet."""
+    discovery.ENTITY_ADD_CHUNK_SIZE = args.chunk_size
+    monitor = LoopBlockMonitor()
+    results: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = BenchmarkEntry(hass)
+        coordinator = UnifiSiteManagerDataUpdateCoordinator(
+            hass, None, entry  # type: ignore[arg-type]
+        )
+        coordinator.api = argparse.Namespace(instrumentation=None)
+        load_fleet(coordinator, args.sites, args.devices)
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+        monitor.start()
+        for name, platform in PLATFORMS.items():
+            results[name] = await setup_platform(hass, entry, platform, monitor)
+        await monitor.stop()
+    return results
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, default=500)
+    parser.add_argument("--devices", type=int, default=10_000)
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=discovery.ENTITY_ADD_CHUNK_SIZE,
+        help="entities added at a time, a large value adds them all at once",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    print(f"sites: {args.sites}, devices: {args.devices}, chunk size: {args.chunk_size}")
+    print(
+        f"{'platform':<14} {'entities':>8} {'DeviceInfo':>10} {'chunks':>6} "
+        f"{'wall ms':>9} {'blocked ms':>10} {'worst ms':>8}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<14} {result['entities']:>8} {result['device_infos']:>10} "
+            f"{result['chunks']:>6} {result['wall_ms']:>9.1f} "
+            f"{result['blocked_ms']:>10.1f} {result['worst_block_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
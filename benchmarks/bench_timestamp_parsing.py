@@ -0,0 +1,95 @@
+"""Benchmark device timestamp handling over a realistic device payload.
+
+Compares parsing adoptionTime/startupTime with dateutil on every sensor
+read (the old value_fn behaviour) against parsing once at ingestion with
+the cached ISO 8601 path, over several refresh cycles.
+
+Usage:
+    python benchmarks/bench_timestamp_parsing.py [--devices 5000] [--cycles 10]
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.simulator import generate_devices  # noqa: E402
+from custom_components.unifi_site_manager.models import (  # noqa: E402
+    Device,
+    _parse_iso,
+)
+
+try:
+    import dateutil.parser
+except ImportError:  # pragma: no cover
+    dateutil = None
+
+
+def realistic_devices(hosts: int, count: int) -> list[dict]:
+    """Return device dicts with varied adoption and startup times."""
+    rng = random.Random(0)
+    devices = [
+        device for group in generate_devices(hosts, count) for device in group["devices"]
+    ]
+    for device in devices:
+        device["adoptionTime"] = (
+            f"20{rng.randint(19, 24)}-{rng.randint(1, 12):02d}-"
+            f"{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:"
+            f"{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}Z"
+        )
+        # Devices rebooted by the same firmware rollout share a startup time
+        device["startupTime"] = f"2024-06-{rng.randint(1, 28):02d}T08:00:00Z"
+    return devices
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=5000)
+    parser.add_argument("--hosts", type=int, default=250)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument(
+        "--reads", type=int, default=1, help="sensor reads per device per cycle"
+    )
+    args = parser.parse_args()
+
+    devices = realistic_devices(args.hosts, args.devices)
+    parses = args.devices * 2 * args.reads * args.cycles
+    print(f"devices: {args.devices}, cycles: {args.cycles}, reads: {args.reads}")
+
+    if dateutil is not None:
+        start = time.perf_counter()
+        for _ in range(args.cycles):
+            for device in devices:
+                for _ in range(args.reads):
+                    dateutil.parser.parse(device["adoptionTime"])
+                    dateutil.parser.parse(device["startupTime"])
+        elapsed = time.perf_counter() - start
+        print(
+            f"dateutil per read:      {elapsed * 1000:8.1f} ms "
+            f"({elapsed / parses * 1e6:.2f} us/parse)"
+        )
+    else:
+        print("dateutil per read:      skipped, python-dateutil not installed")
+
+    _parse_iso.cache_clear()
+    start = time.perf_counter()
+    for _ in range(args.cycles):
+        records = [Device.from_api(device) for device in devices]
+        for record in records:
+            for _ in range(args.reads):
+                record.adoption_time, record.startup_time  # noqa: B018
+    elapsed = time.perf_counter() - start
+    info = _parse_iso.cache_info()
+    print(
+        f"ingestion, cached ISO:  {elapsed * 1000:8.1f} ms "
+        f"(includes building records; cache hits {info.hits}, misses {info.misses})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""Local stand-in for the UniFi Site Manager cloud API.
+
+Serves the ``/ea/*`` endpoints from generated data so the integration can be
+exercised without network access or an API key. Hosts and devices are
+paginated like the real API, ISP metrics honour the duration and timestamp
+window parameters, and a share of requests can be answered with 429 or 5xx
+errors to exercise the retry path.
+
+The simulator can also run as its own process, so that its memory and CPU
+do not count against the client being measured:
+
+    python -m benchmarks.simulator --sites 500 --devices 10000 --port 8765
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+import json
+import random
+import time
+from typing import Any
+
+from aiohttp import web
+
+METRIC_STEPS = {"5m": timedelta(minutes=5), "1h": timedelta(hours=1)}
+METRIC_DURATIONS = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+DEFAULT_DURATIONS = {"5m": "24h", "1h": "7d"}
+
+
+def generate_sites(count: int) -> list[dict[str, Any]]:
+    """Generate site payloads."""
+    return [
+        {
+            "siteId": f"site{index:05d}",
+            "hostId": f"host{index:05d}",
+            "meta": {"name": f"Site {index}", "desc": "default"},
+            "statistics": {
+                "counts": {"totalDevice": 4, "offlineDevice": 0},
+                "percentages": {"wanUptime": 100},
+            },
+        }
+        for index in range(count)
+    ]
+
+
+def generate_hosts(count: int) -> list[dict[str, Any]]:
+    """Generate host payloads."""
+    return [
+        {
+            "id": f"host{index:05d}",
+            "type": "console",
+            "reportedState": {
+                "state": "connected",
+                "version": "4.0.6",
+                "controllers": [
+                    {"name": "network", "state": "active", "status": "ok"},
+                    {"name": "protect", "state": "inactive", "status": "ok"},
+                ],
+            },
+        }
+        for index in range(count)
+    ]
+
+
+def generate_devices(hosts: int, devices: int) -> list[dict[str, Any]]:
+    """Generate device groups, spreading devices evenly across hosts."""
+    groups: list[dict[str, Any]] = [
+        {"hostId": f"host{index:05d}", "devices": []} for index in range(hosts)
+    ]
+    for index in range(devices):
+        groups[index % hosts]["devices"].append(
+            {
+                "id": f"dev{index:06d}",
+                "mac": f"{index >> 16 & 0xFF:02x}:{index >> 8 & 0xFF:02x}:"
+                f"{index & 0xFF:02x}:00:00:01",
+                "name": f"Device {index}",
+                "model": "U6 Pro",
+                "productLine": "network",
+                "status": "online",
+                "version": "6.6.77",
+                "firmwareStatus": "upToDate",
+                "isManaged": True,
+                "ip": f"10.{index >> 16 & 0xFF}.{index >> 8 & 0xFF}.{index & 0xFF}",
+                "adoptionTime": "2024-01-05T10:11:12Z",
+                "startupTime": "2024-06-01T08:00:00Z",
+                # Fields no entity reads, present in real payloads
+                "shortname": "U6PRO",
+                "isConsole": False,
+                "updateAvailable": None,
+                "note": None,
+                "uidb": {
+                    "guid": f"00000000-0000-4000-8000-{index:012d}",
+                    "id": f"{index:08x}-uidb",
+                    "images": {
+                        "default": "a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6",
+                        "nopadding": "b1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6",
+                        "topology": "c1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6",
+                    },
+                },
+            }
+        )
+    return groups
+
+
+def _metric_times(
+    metric_type: str, begin: datetime, end: datetime
+) -> list[datetime]:
+    """Return the period boundaries of a metric type within [begin, end]."""
+    step = METRIC_STEPS[metric_type]
+    seconds = int(step.total_seconds())
+    last = datetime.fromtimestamp(
+        int(end.timestamp()) // seconds * seconds, timezone.utc
+    )
+    times = []
+    while last >= begin:
+        times.append(last)
+        last -= step
+    times.reverse()
+    return times
+
+
+def generate_isp_metrics(
+    sites: int,
+    periods: int,
+    end: datetime | None = None,
+    metric_type: str = "5m",
+) -> list[dict[str, Any]]:
+    """Generate ISP metric results for every site, ending at end."""
+    end = end or datetime.now(timezone.utc)
+    step = METRIC_STEPS[metric_type]
+    times = _metric_times(metric_type, end - step * periods, end)[-periods:]
+    return _isp_metrics(sites, metric_type, times)
+
+
+def _isp_metrics(
+    sites: int, metric_type: str, times: list[datetime]
+) -> list[dict[str, Any]]:
+    """Build ISP metric results for every site over the given period times."""
+    stamps = [
+        (metric_time.strftime("%Y-%m-%dT%H:%M:%SZ"), int(metric_time.timestamp()))
+        for metric_time in times
+    ]
+    return [
+        {
+            "metricType": metric_type,
+            "siteId": f"site{index:05d}",
+            "hostId": f"host{index:05d}",
+            "periods": [
+                {
+                    "metricTime": metric_time,
+                    "version": "4.0.6",
+                    "data": {
+                        "wan": {
+                            # Derived from the timestamp, so a period has the
+                            # same values whichever window it is served in
+                            "avgLatency": 10 + seed % 7,
+                            "maxLatency": 30 + seed % 11,
+                            "download_kbps": 90_000 + seed % 13 * 100,
+                            "upload_kbps": 20_000 + seed % 17 * 100,
+                            "packetLoss": seed % 50 == 0,
+                            "uptime": 100,
+                            "ispName": "Example ISP",
+                        }
+                    },
+                }
+                for metric_time, seed in stamps
+            ],
+        }
+        for index in range(sites)
+    ]
+
+
+def _parse_time(value: str) -> datetime:
+    """Parse a timestamp query parameter."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class SiteManagerSimulator:
+    """Serve generated Site Manager data over HTTP.
+
+    Args:
+        sites: Number of sites, each with its own host
+        devices: Number of devices spread across the hosts
+        latency: Seconds added to every response
+        rate_limit: Quota advertised in the rate limit headers per minute
+        error_rate: Share of requests answered with a 502
+        rate_limited_rate: Share of requests answered with a 429
+        max_page_size: Upper bound on the pageSize a client may ask for
+        seed: Seed of the error injection, for repeatable runs
+    """
+
+    def __init__(
+        self,
+        sites: int = 1,
+        devices: int = 10,
+        latency: float = 0.05,
+        rate_limit: int = 10_000,
+        error_rate: float = 0.0,
+        rate_limited_rate: float = 0.0,
+        max_page_size: int = 500,
+        seed: int | None = 0,
+    ) -> None:
+        """Initialize the simulator."""
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.rate_limited_rate = rate_limited_rate
+        self.max_page_size = max_page_size
+        self.request_count = 0
+        self.bytes_sent = 0
+        self.errors_injected = 0
+        self.rate_limits_injected = 0
+        self.site_count = sites
+        self.sites = generate_sites(sites)
+        self.hosts = generate_hosts(sites)
+        self.devices = generate_devices(sites, devices)
+        self._random = random.Random(seed)
+        self._window_start = time.time()
+        self._window_requests = 0
+        # Full-window metric bodies are large, encode each once per bucket
+        self._metric_bodies: dict[tuple[str, str, int], bytes] = {}
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    def stats(self) -> dict[str, int]:
+        """Return what has been served so far."""
+        return {
+            "requests": self.request_count,
+            "bytes": self.bytes_sent,
+            "errors_injected": self.errors_injected,
+            "rate_limits_injected": self.rate_limits_injected,
+        }
+
+    def _headers(self) -> dict[str, str]:
+        """Return rate limit headers for the current request."""
+        now = time.time()
+        if now - self._window_start >= 60:
+            self._window_start = now
+            self._window_requests = 0
+        return {
+            "X-RateLimit-Remaining": str(
+                max(0, self.rate_limit - self._window_requests)
+            ),
+            "X-RateLimit-Reset": str(int(self._window_start) + 60),
+        }
+
+    async def _respond(self, data: Any = None, body: bytes | None = None) -> web.Response:
+        """Count the request, apply latency and injected failures, then reply."""
+        self.request_count += 1
+        self._window_requests += 1
+        await asyncio.sleep(self.latency)
+
+        roll = self._random.random()
+        if roll < self.rate_limited_rate:
+            self.rate_limits_injected += 1
+            return web.json_response(
+                {"code": "rate_limit", "message": "Too many requests"},
+                status=429,
+                headers={**self._headers(), "Retry-After": "1"},
+            )
+        if roll < self.rate_limited_rate + self.error_rate:
+            self.errors_injected += 1
+            return web.json_response(
+                {"code": "bad_gateway", "message": "Upstream error"},
+                status=502,
+                headers=self._headers(),
+            )
+
+        if body is None:
+            body = json.dumps(
+                {"data": data, "httpStatusCode": 200}, separators=(",", ":")
+            ).encode()
+        self.bytes_sent += len(body)
+        return web.Response(
+            body=body, content_type="application/json", headers=self._headers()
+        )
+
+    async def _paginated(
+        self, request: web.Request, items: list[dict[str, Any]]
+    ) -> web.Response:
+        """Serve one page of a list, following pageSize and nextToken."""
+        page_size = min(
+            int(request.query.get("pageSize", self.max_page_size)), self.max_page_size
+        )
+        offset = int(request.query.get("nextToken", 0))
+        page: dict[str, Any] = {
+            "data": items[offset : offset + page_size],
+            "httpStatusCode": 200,
+        }
+        if offset + page_size < len(items):
+            page["nextToken"] = str(offset + page_size)
+        return await self._respond(
+            body=json.dumps(page, separators=(",", ":")).encode()
+        )
+
+    async def _sites(self, request: web.Request) -> web.Response:
+        return await self._respond(self.sites)
+
+    async def _hosts(self, request: web.Request) -> web.Response:
+        return await self._paginated(request, self.hosts)
+
+    async def _host(self, request: web.Request) -> web.Response:
+        host_id = request.match_info["host_id"]
+        for host in self.hosts:
+            if host["id"] == host_id:
+                return await self._respond(host)
+        raise web.HTTPNotFound
+
+    async def _devices(self, request: web.Request) -> web.Response:
+        host_ids = set(request.query.getall("hostIds[]", []))
+        groups = [
+            group for group in self.devices
+            if not host_ids or group["hostId"] in host_ids
+        ]
+        return await self._paginated(request, groups)
+
+    async def _metrics(self, request: web.Request) -> web.Response:
+        metric_type = request.match_info["metric_type"]
+        if metric_type not in METRIC_STEPS:
+            raise web.HTTPBadRequest(text=f"Unknown metric type {metric_type}")
+        now = datetime.now(timezone.utc)
+
+        if "beginTimestamp" in request.query:
+            begin = _parse_time(request.query["beginTimestamp"])
+            end = (
+                _parse_time(request.query["endTimestamp"])
+                if "endTimestamp" in request.query
+                else now
+            )
+            times = _metric_times(metric_type, begin, min(end, now))
+            return await self._respond(_isp_metrics(self.site_count, metric_type, times))
+
+        duration = request.query.get("duration", DEFAULT_DURATIONS[metric_type])
+        if duration not in METRIC_DURATIONS:
+            raise web.HTTPBadRequest(text=f"Unknown duration {duration}")
+        step = int(METRIC_STEPS[metric_type].total_seconds())
+        key = (metric_type, duration, int(now.timestamp()) // step)
+        body = self._metric_bodies.get(key)
+        if body is None:
+            times = _metric_times(metric_type, now - METRIC_DURATIONS[duration], now)
+            body = json.dumps(
+                {
+                    "data": _isp_metrics(self.site_count, metric_type, times),
+                    "httpStatusCode": 200,
+                },
+                separators=(",", ":"),
+            ).encode()
+            # Older buckets are never served again
+            self._metric_bodies = {
+                cached: value
+                for cached, value in self._metric_bodies.items()
+                if cached[2] == key[2]
+            }
+            self._metric_bodies[key] = body
+        return await self._respond(body=body)
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        """Report counters, not counted as an API request."""
+        return web.json_response(self.stats())
+
+    async def start(self, port: int = 0) -> str:
+        """Start serving on a local port and return the base URL."""
+        app = web.Application()
+        app.router.add_get("/ea/sites", self._sites)
+        app.router.add_get("/ea/hosts", self._hosts)
+        app.router.add_get("/ea/hosts/{host_id}", self._host)
+        app.router.add_get("/ea/devices", self._devices)
+        app.router.add_get("/ea/isp-metrics/{metric_type}", self._metrics)
+        app.router.add_get("/_stats", self._stats)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Serve until cancelled, printing the base URL once listening."""
+    simulator = SiteManagerSimulator(
+        sites=args.sites,
+        devices=args.devices,
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        rate_limited_rate=args.rate_limited_rate,
+        max_page_size=args.max_page_size,
+        seed=args.seed,
+    )
+    url = await simulator.start(args.port)
+    print(url, flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    """Run the simulator as a standalone server."""
+    parser = argparse.ArgumentParser(description="UniFi Site Manager API simulator")
+    parser.add_argument("--sites", type=int, default=1)
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rate-limit", type=int, default=10_000)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limited-rate", type=float, default=0.0)
+    parser.add_argument("--max-page-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,19 @@ import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-from homeassistant.helpers import config_validation as cv
-
-from .api import (
-    UnifiSiteManagerAPI,
-    UnifiSiteManagerAuthError,
-    UnifiSiteManagerConnectionError,
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+
+from .api import UnifiSiteManagerAuthError, UnifiSiteManagerConnectionError
+from .const import DATA_HUBS, DOMAIN
+from .coordinator import async_remove_snapshot
+from .hub import (
+    UnifiSiteManagerHub,
+    async_acquire_hub,
+    async_release_hub,
+    new_entry_unique_id,
 )
-from .const import DEFAULT_API_HOST, DOMAIN
-from .coordinator import UnifiSiteManagerDataUpdateCoordinator
 from .services import async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,20 +41,87 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     return True
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry."""
+    if entry.version > 1:
+        return False
+
+    if entry.minor_version < 2:
+        # Entries sharing an API key can show the same objects, so the
+        # unique IDs of site, host and device entities gain the entry ID
+        prefix = f"{entry.entry_id}_"
+
+        @callback
+        def _async_migrate_unique_id(
+            entity_entry: er.RegistryEntry,
+        ) -> dict[str, str] | None:
+            if entity_entry.unique_id.startswith(prefix):
+                return None
+            return {"new_unique_id": f"{prefix}{entity_entry.unique_id}"}
+
+        await er.async_migrate_entries(hass, entry.entry_id, _async_migrate_unique_id)
+        hass.config_entries.async_update_entry(entry, minor_version=2)
+        _LOGGER.debug("Migrated entry %s to version 1.2", entry.entry_id)
+
+    if entry.minor_version < 3:
+        # The unique ID was the raw API key, shared by entries of one key
+        hass.config_entries.async_update_entry(
+            entry,
+            unique_id=new_entry_unique_id(entry.data[CONF_API_KEY]),
+            minor_version=3,
+        )
+        _LOGGER.debug("Migrated entry %s to version 1.3", entry.entry_id)
+
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up UniFi Site Manager from a config entry."""
     # Ensure domain data is initialized
     hass.data.setdefault(DOMAIN, {})
-    
+
+    # Entries of the same account share one API client and coordinator
+    hub = async_acquire_hub(hass, entry)
+    coordinator = hub.coordinator
     try:
-        api = UnifiSiteManagerAPI(
-            hass=hass,
-            api_key=entry.data[CONF_API_KEY],
-            host=DEFAULT_API_HOST,
+        async with hub.setup_lock:
+            restored = False
+            if not hub.ready:
+                restored = await _async_load_first_data(hub)
+                hub.ready = True
+    except Exception:
+        await async_release_hub(hass, entry)
+        raise
+
+    # Store coordinator for platforms to access
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+
+    # Set up all platforms for this device/entry
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} snapshot reconcile"
         )
 
+    # Register update listener for config entry changes
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    return True
+
+
+async def _async_load_first_data(hub: UnifiSiteManagerHub) -> bool:
+    """Load the first data of a new hub, returning if it came from the snapshot."""
+    coordinator = hub.coordinator
+
+    # Entities come up from the last saved snapshot right away and are
+    # reconciled with a live refresh once setup is done
+    if await coordinator.async_load_snapshot():
+        return True
+
+    try:
         # Verify we can authenticate
-        await api.async_validate_api_key()
+        await hub.api.async_validate_api_key()
 
     except UnifiSiteManagerAuthError as err:
         raise ConfigEntryAuthFailed from err
@@ -61,28 +130,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             f"Error communicating with UniFi Site Manager API: {err}"
         ) from err
 
-    coordinator = UnifiSiteManagerDataUpdateCoordinator(
-        hass=hass,
-        api=api,
-        entry=entry,
-    )
-
     # Fetch initial data so we have data when entities subscribe
     try:
         await coordinator.async_config_entry_first_refresh()
     except ConfigEntryNotReady as err:
         raise ConfigEntryNotReady(f"Failed to load initial data: {err}") from err
-
-    # Store coordinator for platforms to access
-    hass.data[DOMAIN][entry.entry_id] = coordinator
-
-    # Set up all platforms for this device/entry
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-    # Register update listener for config entry changes
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
-
-    return True
+    return False
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -91,9 +144,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        await async_release_hub(hass, entry)
 
         # If this is the last instance, clean up services
-        if not hass.data[DOMAIN]:
+        if not hass.data[DOMAIN].get(DATA_HUBS):
             await async_unload_services(hass)
             hass.data.pop(DOMAIN)
 
@@ -102,4 +156,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload the config entry when it changed."""
-    await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved snapshot when a config entry is removed."""
+    await async_remove_snapshot(hass, entry)
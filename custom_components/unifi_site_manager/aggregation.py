@@ -0,0 +1,212 @@
+"""Rolling window statistics of ISP metrics for UniFi Site Manager.
+
+The 5m periods of every site are packed into columnar float arrays, one
+column per WAN metric with NaN for missing values, and every window
+statistic is computed from those columns. The metrics buffer of each site
+keeps its columns up to date as periods are merged, so they are not
+rebuilt from the period records on every fetch. With NumPy available the columns
+of all sites are stacked into matrices and each statistic is a single
+vectorized pass over every site; without it the same columns are reduced
+site by site from ``array`` storage.
+
+Windows end at the newest period of each site, so a site whose metrics
+lag behind still reports full windows.
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import timedelta
+import math
+from statistics import fmean
+from typing import Any
+import warnings
+
+from .const import KBPS_TO_MBPS
+from .instrumentation import percentile
+from .models import IspPeriod
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+WINDOW_1H = timedelta(hours=1)
+WINDOW_24H = timedelta(hours=24)
+LATENCY_PERCENTILE = 0.95
+
+# Columns packed from each period, None values become NaN
+_COLUMNS: dict[str, Callable[[IspPeriod], float | None]] = {
+    "download": lambda period: (
+        period.download_kbps / KBPS_TO_MBPS
+        if period.download_kbps is not None
+        else None
+    ),
+    "upload": lambda period: (
+        period.upload_kbps / KBPS_TO_MBPS if period.upload_kbps is not None else None
+    ),
+    "latency": lambda period: period.avg_latency,
+    "packet_loss": lambda period: period.packet_loss,
+    "uptime": lambda period: period.uptime,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SiteAggregates:
+    """Window statistics of the ISP metrics of one site."""
+
+    download_1h: float | None = None
+    download_24h: float | None = None
+    upload_1h: float | None = None
+    upload_24h: float | None = None
+    latency_1h: float | None = None
+    latency_24h: float | None = None
+    latency_p95_24h: float | None = None
+    packet_loss_24h: float | None = None
+    uptime_24h: float | None = None
+
+
+# Field of SiteAggregates: (column, reducer, window)
+_AGGREGATES: dict[str, tuple[str, str, timedelta]] = {
+    "download_1h": ("download", "mean", WINDOW_1H),
+    "download_24h": ("download", "mean", WINDOW_24H),
+    "upload_1h": ("upload", "mean", WINDOW_1H),
+    "upload_24h": ("upload", "mean", WINDOW_24H),
+    "latency_1h": ("latency", "mean", WINDOW_1H),
+    "latency_24h": ("latency", "mean", WINDOW_24H),
+    "latency_p95_24h": ("latency", "p95", WINDOW_24H),
+    "packet_loss_24h": ("packet_loss", "mean", WINDOW_24H),
+    "uptime_24h": ("uptime", "mean", WINDOW_24H),
+}
+
+
+COLUMN_NAMES: tuple[str, ...] = ("time", *_COLUMNS)
+
+
+def empty_columns() -> dict[str, array]:
+    """Return empty columns of times (epoch seconds) and WAN metrics."""
+    return {name: array("d") for name in COLUMN_NAMES}
+
+
+def period_row(period: IspPeriod) -> tuple[float, ...]:
+    """Return the column values of a period, in COLUMN_NAMES order."""
+    values = [
+        value_fn(period) if period.has_wan else None for value_fn in _COLUMNS.values()
+    ]
+    return (
+        period.metric_time.timestamp(),
+        *(math.nan if value is None else value for value in values),
+    )
+
+
+def pack_periods(periods: Iterable[IspPeriod]) -> dict[str, array]:
+    """Pack periods into columns of times (epoch seconds) and WAN metrics."""
+    columns = empty_columns()
+    packed = list(columns.values())
+    for period in periods:
+        for column, value in zip(packed, period_row(period)):
+            column.append(value)
+    return columns
+
+
+def _rounded(value: Any) -> float | None:
+    """Return a statistic for display, None for NaN."""
+    value = float(value)
+    return None if math.isnan(value) else round(value, 2)
+
+
+def _aggregate_numpy(
+    packed: Mapping[str, dict[str, array]],
+) -> dict[str, SiteAggregates]:
+    """Compute the statistics of all sites in vectorized passes."""
+    site_ids = list(packed)
+    width = max(len(columns["time"]) for columns in packed.values())
+    if not width:
+        # No site has any period, as in the pure Python path
+        return {site_id: SiteAggregates() for site_id in site_ids}
+
+    def matrix(name: str) -> Any:
+        """Stack a column of every site into a NaN padded matrix."""
+        stacked = np.full((len(site_ids), width), np.nan)
+        for row, site_id in enumerate(site_ids):
+            column = packed[site_id][name]
+            stacked[row, : len(column)] = np.frombuffer(column, dtype=np.float64)
+        return stacked
+
+    values: dict[str, Any] = {}
+    with warnings.catch_warnings():
+        # Sites without any value in a window come out as NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        times = matrix("time")
+        newest = np.nanmax(times, axis=1, keepdims=True)
+        masks = {
+            window: times > newest - window.total_seconds()
+            for window in {window for _, _, window in _AGGREGATES.values()}
+        }
+        columns = {column: matrix(column) for column, _, _ in _AGGREGATES.values()}
+        for field, (column, reducer, window) in _AGGREGATES.items():
+            windowed = np.where(masks[window], columns[column], np.nan)
+            if reducer == "mean":
+                values[field] = np.nanmean(windowed, axis=1)
+            else:
+                # Nearest rank, matching the pure Python path
+                values[field] = np.nanpercentile(
+                    windowed,
+                    LATENCY_PERCENTILE * 100,
+                    axis=1,
+                    method="inverted_cdf",
+                )
+
+    return {
+        site_id: SiteAggregates(
+            **{field: _rounded(values[field][row]) for field in _AGGREGATES}
+        )
+        for row, site_id in enumerate(site_ids)
+    }
+
+
+def _aggregate_python(
+    packed: Mapping[str, dict[str, array]],
+) -> dict[str, SiteAggregates]:
+    """Compute the statistics of each site from its columns."""
+    results: dict[str, SiteAggregates] = {}
+    for site_id, columns in packed.items():
+        times = columns["time"]
+        if not times:
+            results[site_id] = SiteAggregates()
+            continue
+        newest = max(times)
+        values: dict[str, float | None] = {}
+        for field, (column, reducer, window) in _AGGREGATES.items():
+            start = newest - window.total_seconds()
+            windowed = [
+                value
+                for time, value in zip(times, columns[column])
+                if time > start and not math.isnan(value)
+            ]
+            if not windowed:
+                values[field] = None
+            elif reducer == "mean":
+                values[field] = round(fmean(windowed), 2)
+            else:
+                values[field] = round(percentile(windowed, LATENCY_PERCENTILE), 2)
+        results[site_id] = SiteAggregates(**values)
+    return results
+
+
+def aggregate_sites(
+    packed: Mapping[str, dict[str, array]],
+    use_numpy: bool | None = None,
+) -> dict[str, SiteAggregates]:
+    """Return the window statistics of every site's packed 5m periods.
+
+    use_numpy forces a backend, by default NumPy is used when installed.
+    """
+    if not packed:
+        return {}
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        return _aggregate_numpy(packed)
+    return _aggregate_python(packed)
@@ -2,20 +2,53 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import AsyncExitStack, contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+import json
 import logging
-from datetime import datetime
-from typing import Any
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, TypeVar
 
 import async_timeout
-from aiohttp import ClientError, ClientResponse, ClientSession
+from aiohttp import (
+    ClientError,
+    ClientResponse,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DEFAULT_API_HOST, UNIFI_API_HEADERS
+from .const import (
+    API_RETRIES,
+    API_RETRY_DEADLINE,
+    API_RETRY_DELAY,
+    API_RETRY_MAX_DELAY,
+    DEFAULT_API_HOST,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_REQUEST_TIMEOUT,
+    JSON_EXECUTOR_THRESHOLD,
+    STREAM_CHUNK_SIZE,
+    UNIFI_API_HEADERS,
+)
+from .cache import CachedResponse, ResponseCache, body_digest, make_cache_key
+from .instrumentation import Instrumentation
+from .models import parse_timestamp
+from .scheduler import RequestScheduler
+from .streaming import JsonArrayStream
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 # First define the base exception class
 class UnifiSiteManagerAPIError(Exception):
     """General API error."""
@@ -36,6 +69,93 @@ class UnifiSiteManagerAuthError(UnifiSiteManagerAPIError):
 class UnifiSiteManagerRateLimitError(UnifiSiteManagerAPIError):
     """API rate limit error."""
 
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """Initialize the error with the server requested delay."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+# Failures worth another attempt, everything else is raised immediately
+RETRYABLE_ERRORS = (
+    UnifiSiteManagerRateLimitError,
+    UnifiSiteManagerServerError,
+    UnifiSiteManagerConnectionError,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
+JsonDecoder = Callable[[bytes], Any]
+
+# Prefer orjson, it decodes large payloads several times faster
+DEFAULT_JSON_DECODER: JsonDecoder = orjson.loads if orjson else json.loads
+
+# Only idempotent requests are retried
+RETRYABLE_METHODS = frozenset({"GET", "HEAD"})
+
+# Monotonic deadline shared by all requests of one refresh cycle
+_retry_deadline: ContextVar[float | None] = ContextVar(
+    "unifi_site_manager_retry_deadline", default=None
+)
+
+def _format_timestamp(value: datetime) -> str:
+    """Format a datetime as the RFC 3339 UTC string the API expects."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _isp_metrics_params(
+    metric_type: str,
+    begin_timestamp: datetime | None,
+    end_timestamp: datetime | None,
+    duration: str | None,
+) -> dict[str, str]:
+    """Return the query of an ISP metrics window."""
+    # Ask only for the requested window when a start is given, otherwise
+    # fall back to the documented duration parameter
+    if begin_timestamp:
+        params = {"beginTimestamp": _format_timestamp(begin_timestamp)}
+        if end_timestamp:
+            params["endTimestamp"] = _format_timestamp(end_timestamp)
+        return params
+    return {"duration": duration or ("24h" if metric_type == "5m" else "7d")}
+
+def _site_periods(
+    metrics: list[dict[str, Any]],
+    wanted: set[str] | None,
+    since: datetime | None,
+) -> list[tuple[str, dict[str, Any]]]:
+    """Return the (siteId, period) records of ISP metrics that are wanted."""
+    records: list[tuple[str, dict[str, Any]]] = []
+    for metric in metrics:
+        site_id = metric.get("siteId")
+        if not site_id or (wanted is not None and site_id not in wanted):
+            continue
+        for period in metric.get("periods", []):
+            if since is not None:
+                metric_time = parse_timestamp(period.get("metricTime"))
+                if metric_time is None or metric_time < since:
+                    continue
+            records.append((site_id, period))
+    return records
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given as seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
 class UnifiSiteManagerAPI:
     """UniFi Site Manager API client."""
 
@@ -45,8 +165,16 @@ class UnifiSiteManagerAPI:
         api_key: str,
         host: str = DEFAULT_API_HOST,
         session: ClientSession | None = None,
-        rate_limit: int = 100,
-        timeout: int = 10,
+        rate_limit: int = DEFAULT_RATE_LIMIT,
+        timeout: int = DEFAULT_REQUEST_TIMEOUT,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        retries: int = API_RETRIES,
+        retry_delay: float = API_RETRY_DELAY,
+        retry_max_delay: float = API_RETRY_MAX_DELAY,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        json_decoder: JsonDecoder | None = None,
+        executor_decode_threshold: int = JSON_EXECUTOR_THRESHOLD,
+        instrumentation: Instrumentation | None = None,
     ) -> None:
         """Initialize the API client."""
         self._hass = hass
@@ -56,48 +184,256 @@ class UnifiSiteManagerAPI:
         self._rate_limit_remaining = rate_limit
         self._request_timeout = timeout
         self._rate_limit_reset: datetime | None = None
-        self._request_lock = asyncio.Lock()
+        self._scheduler = RequestScheduler(
+            max_concurrent=max_concurrent_requests,
+            rate_limit=rate_limit,
+        )
+        self._response_cache = ResponseCache()
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._retry_max_delay = retry_max_delay
+        self._page_size = page_size
+        self._json_decoder = json_decoder or DEFAULT_JSON_DECODER
+        self._executor_decode_threshold = executor_decode_threshold
+        self.decode_stats: dict[str, dict[str, float]] = {}
+        # None when instrumentation is disabled, checked before measuring
+        self.instrumentation = instrumentation
+
+    @property
+    def rate_limit_remaining(self) -> int:
+        """Return the remaining request quota reported by the API."""
+        return self._rate_limit_remaining
 
     def _update_rate_limit(self, response: ClientResponse) -> None:
         """Update rate limit information from response headers."""
-        if "X-RateLimit-Remaining" in response.headers:
-            self._rate_limit_remaining = int(response.headers["X-RateLimit-Remaining"])
-        if "X-RateLimit-Reset" in response.headers:
-            self._rate_limit_reset = datetime.fromtimestamp(
-                int(response.headers["X-RateLimit-Reset"])
-            )
+        remaining = reset = None
+        try:
+            if "X-RateLimit-Remaining" in response.headers:
+                remaining = int(response.headers["X-RateLimit-Remaining"])
+                self._rate_limit_remaining = remaining
+            if "X-RateLimit-Reset" in response.headers:
+                reset = int(response.headers["X-RateLimit-Reset"])
+                self._rate_limit_reset = datetime.fromtimestamp(reset)
+        except ValueError:
+            _LOGGER.debug("Ignoring malformed rate limit headers")
+        self._scheduler.update_quota(remaining, reset)
 
-    async def _handle_rate_limit(self) -> None:
-        """Handle rate limiting."""
-        if self._rate_limit_remaining <= 0 and self._rate_limit_reset:
-            wait_time = (self._rate_limit_reset - datetime.now()).total_seconds()
-            if wait_time > 0:
-                _LOGGER.warning(
-                    "Rate limit reached. Waiting %s seconds before next request",
-                    wait_time,
+    async def _decode(self, endpoint: str, body: bytes) -> Any:
+        """Decode a JSON body, off the event loop when it is large."""
+        start = time.perf_counter()
+        try:
+            if len(body) >= self._executor_decode_threshold:
+                data = await asyncio.get_running_loop().run_in_executor(
+                    None, self._json_decoder, body
                 )
-                await asyncio.sleep(wait_time)
+            else:
+                data = self._json_decoder(body)
+        except ValueError as err:
+            raise UnifiSiteManagerAPIError(
+                f"Invalid JSON response from {endpoint}: {err}"
+            ) from err
+        self._record_decode(endpoint, len(body), time.perf_counter() - start)
+        return data
+
+    def _record_decode(self, endpoint: str, size: int, elapsed: float) -> None:
+        """Record the size and decode time of a response body."""
+        stats = self.decode_stats.setdefault(
+            endpoint, {"count": 0, "bytes": 0, "decode_time": 0.0}
+        )
+        stats["count"] += 1
+        stats["bytes"] = size
+        stats["decode_time"] = elapsed
+        if self.instrumentation is not None:
+            self.instrumentation.record_decode(endpoint, elapsed)
+        _LOGGER.debug(
+            "Decoded %s bytes from %s in %.1f ms", size, endpoint, elapsed * 1000
+        )
+
+    def clear_cache(self) -> None:
+        """Drop all cached responses so the next requests fetch full bodies."""
+        self._response_cache.clear()
+
+    @contextmanager
+    def retry_deadline(self, seconds: float) -> Iterator[None]:
+        """Bound the time spent retrying for all requests made in this context.
+
+        The deadline is carried in a context variable, so tasks spawned with
+        asyncio.gather inside the block share it.
+        """
+        token = _retry_deadline.set(time.monotonic() + seconds)
+        try:
+            yield
+        finally:
+            _retry_deadline.reset(token)
+
+    def _backoff_delay(self, attempt: int, err: UnifiSiteManagerAPIError) -> float:
+        """Return how long to wait before the next attempt."""
+        delay = min(self._retry_max_delay, self._retry_delay * 2**attempt)
+        # Equal jitter keeps a floor while spreading out concurrent retries
+        delay = random.uniform(delay / 2, delay)
+        if isinstance(err, UnifiSiteManagerRateLimitError) and err.retry_after:
+            delay = max(delay, err.retry_after)
+        return delay
 
     async def _request(
         self,
         method: str,
         endpoint: str,
+        *,
+        cache: bool = True,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Make an API request, retrying transient failures of idempotent calls."""
+        if method.upper() not in RETRYABLE_METHODS:
+            try:
+                return await self._request_once(
+                    method, endpoint, cache=False, **kwargs
+                )
+            except RETRYABLE_ERRORS as err:
+                _LOGGER.error("%s %s failed: %s", method, endpoint, err)
+                raise
+        return await self._retrying(
+            method,
+            endpoint,
+            lambda: self._request_once(method, endpoint, cache=cache, **dict(kwargs)),
+        )
+
+    async def _retrying(
+        self,
+        method: str,
+        endpoint: str,
+        attempt_fn: Callable[[], Awaitable[_T]],
+    ) -> _T:
+        """Run a request attempt, retrying transient failures until the deadline.
+
+        Failed attempts that are retried are logged at debug level, only the
+        final failure is logged as an error.
+        """
+        deadline = _retry_deadline.get()
+        if deadline is None:
+            deadline = time.monotonic() + API_RETRY_DEADLINE
+
+        attempt = 0
+        while True:
+            try:
+                return await attempt_fn()
+            except RETRYABLE_ERRORS as err:
+                if attempt >= self._retries:
+                    _LOGGER.error(
+                        "%s %s failed after %s attempts: %s",
+                        method,
+                        endpoint,
+                        attempt + 1,
+                        err,
+                    )
+                    raise
+                delay = self._backoff_delay(attempt, err)
+                if time.monotonic() + delay > deadline:
+                    _LOGGER.error(
+                        "%s %s failed after %s attempts, not retrying past the "
+                        "retry deadline: %s",
+                        method,
+                        endpoint,
+                        attempt + 1,
+                        err,
+                    )
+                    raise
+                attempt += 1
+                if self.instrumentation is not None:
+                    self.instrumentation.record_retry(endpoint)
+                _LOGGER.debug(
+                    "Retrying %s %s in %.1f seconds (attempt %s of %s): %s",
+                    method,
+                    endpoint,
+                    delay,
+                    attempt,
+                    self._retries,
+                    err,
+                )
+                await asyncio.sleep(delay)
+
+    async def _check_response(self, endpoint: str, resp: ClientResponse) -> None:
+        """Track the rate limit of a response and raise for error statuses."""
+        self._update_rate_limit(resp)
+
+        # Enhanced error handling
+        if resp.status == 401:
+            raise ConfigEntryAuthFailed("Invalid API key")
+        elif resp.status == 429:
+            if self.instrumentation is not None:
+                self.instrumentation.record_rate_limited(endpoint)
+            retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+            _LOGGER.warning(
+                "Rate limit exceeded. Need to wait %s seconds",
+                retry_after if retry_after is not None else "unknown"
+            )
+            raise UnifiSiteManagerRateLimitError(
+                "Rate limit exceeded",
+                retry_after=retry_after,
+            )
+        elif resp.status >= 500:
+            _LOGGER.debug(
+                "Server error %s from %s: %s", resp.status, endpoint, await resp.text()
+            )
+            raise UnifiSiteManagerServerError(f"Server error: {resp.status}")
+
+    @staticmethod
+    def _client_error(
+        url: str, err: asyncio.TimeoutError | ClientError
+    ) -> UnifiSiteManagerAPIError:
+        """Return the API error raised for a failed aiohttp request."""
+        if isinstance(err, asyncio.TimeoutError):
+            _LOGGER.debug("Timeout requesting data from %s: %s", url, str(err))
+            return UnifiSiteManagerConnectionError(
+                f"Timeout error requesting data from {url}"
+            )
+        if isinstance(err, ClientResponseError):
+            return UnifiSiteManagerAPIError(
+                f"Error requesting data from {url}: {err.status}"
+            )
+        _LOGGER.debug("Error requesting data from %s: %s", url, str(err))
+        return UnifiSiteManagerConnectionError(
+            f"Error requesting data from {url}: {err}"
+        )
+
+    async def _request_once(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        cache: bool = True,
         **kwargs: Any,
     ) -> dict[str, Any]:
-        """Make an API request with improved error handling."""
-        async with self._request_lock:
-            await self._handle_rate_limit()
+        """Make a single API request with improved error handling.
 
+        Cacheable GET responses are revalidated with the stored ETag or
+        Last-Modified value, and a 304 or an unchanged body returns the
+        previously parsed object without decoding the JSON again.
+        """
+        async with self._scheduler.slot():
             headers = {
                 **UNIFI_API_HEADERS,
                 "X-API-Key": self._api_key,
             }
 
+            cache_key = None
+            cached: CachedResponse | None = None
+            if cache and method.upper() == "GET":
+                cache_key = make_cache_key(method, endpoint, kwargs.get("params"))
+                # Held until the response arrives, so a 304 still resolves
+                # when a concurrent request evicts the entry meanwhile
+                if (cached := self._response_cache.get(cache_key)) is not None:
+                    headers.update(cached.conditional_headers())
+
             if "headers" in kwargs:
                 headers.update(kwargs.pop("headers"))
 
             url = f"{self._host}{endpoint}"
 
+            start = time.perf_counter()
+            # Set once the response arrived, so decoding is not counted
+            elapsed: float | None = None
+            size = 0
             try:
                 async with async_timeout.timeout(self._request_timeout):
                     async with self._session.request(
@@ -106,67 +442,140 @@ class UnifiSiteManagerAPI:
                         headers=headers,
                         **kwargs,
                     ) as resp:
-                        self._update_rate_limit(resp)
-
-                        # Enhanced error handling
-                        if resp.status == 401:
-                            raise ConfigEntryAuthFailed("Invalid API key")
-                        elif resp.status == 429:
-                            retry_after = int(resp.headers.get("Retry-After", 60))
-                            _LOGGER.warning(
-                                "Rate limit exceeded. Need to wait %s seconds",
-                                retry_after
-                            )
-                            raise UnifiSiteManagerRateLimitError(
-                                f"Rate limit exceeded, retry after {retry_after} seconds"
-                            )
-                        elif resp.status >= 500:
-                            _LOGGER.error(
-                                "Server error %s: %s", 
-                                resp.status,
-                                await resp.text()
-                            )
-                            raise UnifiSiteManagerServerError(
-                                f"Server error: {resp.status}"
-                            )
-                        
+                        await self._check_response(endpoint, resp)
+
+                        if resp.status == 304:
+                            if cached is None:
+                                # Nothing was revalidated, ask again in full
+                                raise UnifiSiteManagerServerError(
+                                    f"Unexpected 304 response from {endpoint}"
+                                )
+                            elapsed = time.perf_counter() - start
+                            _LOGGER.debug("%s not modified, using cached data", endpoint)
+                            return cached.data
+
                         resp.raise_for_status()
-                        return await resp.json()
+                        body = await resp.read()
+                        size = len(body)
+                        elapsed = time.perf_counter() - start
+                        if cache_key is None:
+                            return await self._decode(endpoint, body)
+
+                        digest = body_digest(body)
+                        if cached is not None and cached.digest == digest:
+                            _LOGGER.debug("%s unchanged, skipping decode", endpoint)
+                            data = cached.data
+                        else:
+                            data = await self._decode(endpoint, body)
+                        self._response_cache.set(
+                            cache_key,
+                            CachedResponse(
+                                data=data,
+                                digest=digest,
+                                etag=resp.headers.get("ETag"),
+                                last_modified=resp.headers.get("Last-Modified"),
+                            ),
+                        )
+                        return data
 
-            except asyncio.TimeoutError as err:
-                _LOGGER.error("Timeout requesting data from %s: %s", url, str(err))
-                raise UnifiSiteManagerConnectionError(
-                    f"Timeout error requesting data from {url}"
-                ) from err
+            except (asyncio.TimeoutError, ClientError) as err:
+                raise self._client_error(url, err) from err
+            finally:
+                if self.instrumentation is not None:
+                    self.instrumentation.record_request(
+                        endpoint,
+                        elapsed if elapsed is not None else time.perf_counter() - start,
+                        size,
+                        failed=elapsed is None,
+                    )
 
     async def async_get_sites(self) -> list[dict[str, Any]]:
         """Get all sites."""
         response = await self._request("GET", "/ea/sites")
         return response.get("data", [])
 
-    async def async_get_devices(
+    async def async_iter_pages(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        page_size: int | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield the data of a paginated endpoint one page at a time.
+
+        Pages are requested lazily, following nextToken until the API stops
+        returning one, so only a single page is held at a time. A result that
+        fits in one page is cached and revalidated like any other response.
+        Multi-page results bypass the cache, which would otherwise keep every
+        page of the fleet.
+        """
+        params = {**(params or {}), "pageSize": str(page_size or self._page_size)}
+        seen_tokens: set[str] = set()
+        first_page = True
+        while True:
+            page_params = dict(params)
+            response = await self._request(
+                "GET", endpoint, cache=first_page, params=page_params
+            )
+            yield response.get("data", [])
+
+            next_token = response.get("nextToken")
+            if first_page and next_token:
+                self._response_cache.discard(
+                    make_cache_key("GET", endpoint, page_params)
+                )
+            first_page = False
+            if not next_token:
+                return
+            if next_token in seen_tokens:
+                _LOGGER.warning(
+                    "%s returned page token %s again, stopping pagination",
+                    endpoint,
+                    next_token,
+                )
+                return
+            seen_tokens.add(next_token)
+            params["nextToken"] = next_token
+
+    def async_iter_devices(
         self,
         host_ids: list[str] | None = None,
         time: datetime | None = None,
-    ) -> list[dict[str, Any]]:
-        """Get all devices managed by hosts."""
-        params = {}
+        page_size: int | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield pages of device groups managed by hosts."""
+        params: dict[str, Any] = {}
         if host_ids:
             params["hostIds[]"] = host_ids
         if time:
             params["time"] = time.isoformat()
-        
+        return self.async_iter_pages("/ea/devices", params, page_size)
+
+    def async_iter_hosts(
+        self,
+        page_size: int | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield pages of hosts."""
+        return self.async_iter_pages("/ea/hosts", page_size=page_size)
+
+    async def async_get_devices(
+        self,
+        host_ids: list[str] | None = None,
+        time: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get all devices managed by hosts."""
         try:
-            response = await self._request("GET", "/ea/devices", params=params)
-            return response.get("data", [])
+            return [
+                group
+                async for page in self.async_iter_devices(host_ids, time)
+                for group in page
+            ]
         except Exception as err:
             _LOGGER.error("Error getting devices data: %s", err)
             return []
 
     async def async_get_hosts(self) -> list[dict[str, Any]]:
         """Get all hosts."""
-        response = await self._request("GET", "/ea/hosts")
-        return response.get("data", [])
+        return [host async for page in self.async_iter_hosts() for host in page]
 
     async def async_get_host(self, host_id: str) -> dict[str, Any]:
         """Get host by ID."""
@@ -186,11 +595,14 @@ class UnifiSiteManagerAPI:
         Args:
             metric_type: Either '5m' or '1h'
             site_id: Optional site ID to filter results
+            begin_timestamp: Optional start of the window, overrides duration
+            end_timestamp: Optional end of the window when begin is given
             duration: Time duration ('24h' for 5m metrics, '7d' or '30d' for 1h metrics)
         """
         try:
-            # Use duration parameter as documented
-            params = {"duration": "24h" if metric_type == "5m" else "7d"}
+            params = _isp_metrics_params(
+                metric_type, begin_timestamp, end_timestamp, duration
+            )
             
             _LOGGER.debug(
                 "Getting metrics with type=%s, params=%s, site_id=%s",
@@ -203,6 +615,9 @@ class UnifiSiteManagerAPI:
                 "GET",
                 f"/ea/isp-metrics/{metric_type}",
                 params=params,
+                # Metric windows move on between requests, so a body never
+                # revalidates and a cached one only holds memory
+                cache=False,
             )
             
             _LOGGER.debug("Raw API response: %s", response)
@@ -225,6 +640,173 @@ class UnifiSiteManagerAPI:
             _LOGGER.error("Error getting metrics: %s", err)
             return []
 
+    async def async_get_isp_metrics_by_site(
+        self,
+        metric_type: str,
+        site_ids: list[str] | None = None,
+        begin_timestamp: datetime | None = None,
+        end_timestamp: datetime | None = None,
+        duration: str | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Get ISP metrics for all sites in a single request.
+
+        The endpoint always returns metrics for every site on the account, so
+        the response is partitioned into a per-site index in one pass instead
+        of being downloaded again for each site.
+
+        Args:
+            metric_type: Either '5m' or '1h'
+            site_ids: Optional site IDs to keep, all sites are kept if omitted
+            begin_timestamp: Optional start of the window to fetch
+            end_timestamp: Optional end of the window to fetch
+            duration: Optional window when no start is given
+        """
+        metrics = await self.async_get_isp_metrics(
+            metric_type,
+            begin_timestamp=begin_timestamp,
+            end_timestamp=end_timestamp,
+            duration=duration,
+        )
+
+        wanted = set(site_ids) if site_ids is not None else None
+        metrics_by_site: dict[str, list[dict[str, Any]]] = {}
+        for metric in metrics:
+            site_id = metric.get("siteId")
+            if not site_id or (wanted is not None and site_id not in wanted):
+                continue
+            metrics_by_site.setdefault(site_id, []).append(metric)
+
+        _LOGGER.debug("Partitioned metrics for %d sites", len(metrics_by_site))
+        return metrics_by_site
+
+    async def _async_open_stream(
+        self, endpoint: str, params: dict[str, str]
+    ) -> tuple[AsyncExitStack, ClientResponse]:
+        """Send a GET request whose body the caller reads as it arrives.
+
+        The request slot is held until the returned stack is closed, which
+        also releases the response.
+        """
+        url = f"{self._host}{endpoint}"
+        stack = AsyncExitStack()
+        try:
+            await stack.enter_async_context(self._scheduler.slot())
+            resp = await stack.enter_async_context(
+                self._session.get(
+                    url,
+                    headers={**UNIFI_API_HEADERS, "X-API-Key": self._api_key},
+                    params=params,
+                    # Bound each wait for data rather than the whole body
+                    timeout=ClientTimeout(
+                        total=None,
+                        connect=self._request_timeout,
+                        sock_read=self._request_timeout,
+                    ),
+                )
+            )
+            await self._check_response(endpoint, resp)
+            resp.raise_for_status()
+        except (asyncio.TimeoutError, ClientError) as err:
+            await stack.aclose()
+            raise self._client_error(url, err) from err
+        except BaseException:
+            await stack.aclose()
+            raise
+        return stack, resp
+
+    async def async_iter_isp_metrics(
+        self,
+        metric_type: str,
+        site_ids: list[str] | None = None,
+        begin_timestamp: datetime | None = None,
+        end_timestamp: datetime | None = None,
+        duration: str | None = None,
+        since: datetime | None = None,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Yield (siteId, period) records of ISP metrics as the response arrives.
+
+        The body is never held whole: the object of each site is decoded once
+        it has been received and dropped after its periods are yielded, so
+        peak memory stays at about one site's periods however many sites the
+        account has. Large bodies are parsed in the executor a batch at a
+        time. Unlike async_get_isp_metrics, errors are raised.
+
+        Args:
+            metric_type: Either '5m' or '1h'
+            site_ids: Optional site IDs to keep, all sites are kept if omitted
+            begin_timestamp: Optional start of the window, overrides duration
+            end_timestamp: Optional end of the window when begin is given
+            duration: Optional window when no start is given
+            since: Optional time before which periods are skipped
+        """
+        endpoint = f"/ea/isp-metrics/{metric_type}"
+        url = f"{self._host}{endpoint}"
+        params = _isp_metrics_params(
+            metric_type, begin_timestamp, end_timestamp, duration
+        )
+        wanted = set(site_ids) if site_ids is not None else None
+        parser = JsonArrayStream("data", self._json_decoder)
+
+        start = time.perf_counter()
+        stack, resp = await self._retrying(
+            "GET", endpoint, lambda: self._async_open_stream(endpoint, params)
+        )
+        elapsed = time.perf_counter() - start
+        decode_time = 0.0
+        completed = False
+
+        def parse(data: bytes) -> list[tuple[str, dict[str, Any]]]:
+            """Feed received bytes to the parser and keep the wanted records."""
+            return _site_periods(parser.feed(data), wanted, since)
+
+        loop = asyncio.get_running_loop()
+        # Received bytes are parsed in batches of the executor decode
+        # threshold off the event loop; a body smaller than one batch is
+        # parsed in place like a small buffered response
+        batch = bytearray()
+        offloaded = False
+        try:
+            async with stack:
+                async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    batch += chunk
+                    if len(batch) < self._executor_decode_threshold:
+                        continue
+                    decode_start = time.perf_counter()
+                    records = await loop.run_in_executor(None, parse, bytes(batch))
+                    decode_time += time.perf_counter() - decode_start
+                    batch.clear()
+                    offloaded = True
+                    for record in records:
+                        yield record
+
+                decode_start = time.perf_counter()
+                if offloaded:
+                    records = await loop.run_in_executor(None, parse, bytes(batch))
+                else:
+                    records = parse(bytes(batch))
+                decode_time += time.perf_counter() - decode_start
+                batch.clear()
+                for record in records:
+                    yield record
+                parser.close()
+                completed = True
+        except ValueError as err:
+            raise UnifiSiteManagerAPIError(
+                f"Invalid JSON response from {endpoint}: {err}"
+            ) from err
+        except (asyncio.TimeoutError, ClientError) as err:
+            # The body is not retried once records were yielded
+            _LOGGER.error("Reading %s failed: %s", endpoint, err)
+            raise self._client_error(url, err) from err
+        finally:
+            if self.instrumentation is not None:
+                self.instrumentation.record_request(
+                    endpoint, elapsed, parser.bytes, failed=not completed
+                )
+
+        self._record_decode(endpoint, parser.bytes, decode_time)
+        _LOGGER.debug("Streamed %s site metrics from %s", parser.items, endpoint)
+
     async def async_validate_api_key(self) -> bool:
         """Validate API key by making a test request."""
         try:
@@ -19,13 +19,21 @@ from .const import (
     ICON_NETWORK,
     ICON_PROTECT,
 )
-from .entity import UnifiSiteManagerHostEntity, UnifiSiteManagerSiteEntity, UnifiSiteManagerDeviceEntity
+from .discovery import async_setup_entity_discovery
+from .entity import (
+    UnifiSiteManagerDeviceEntity,
+    UnifiSiteManagerHostEntity,
+    UnifiSiteManagerSiteEntity,
+    device_device_info,
+    host_device_info,
+    site_device_info,
+)
 
 @dataclass(frozen=True, kw_only=True)
 class UnifiBinarySensorEntityDescription(BinarySensorEntityDescription):
     """Class describing UniFi binary sensor entities."""
 
-    is_on_fn: Callable[[dict[str, Any]], bool | None]
+    is_on_fn: Callable[[Any], bool | None]
 
 SITE_BINARY_SENSORS: Final[tuple[UnifiBinarySensorEntityDescription, ...]] = (
     UnifiBinarySensorEntityDescription(
@@ -33,22 +41,22 @@ SITE_BINARY_SENSORS: Final[tuple[UnifiBinarySensorEntityDescription, ...]] = (
         translation_key="site_online",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         entity_category=EntityCategory.DIAGNOSTIC,
-        is_on_fn=lambda data: data.get("statistics", {}).get("percentages", {}).get("wanUptime", 0) > 0,
+        is_on_fn=lambda site: site.wan_uptime > 0,
     ),
     UnifiBinarySensorEntityDescription(
         key="devices_all_online",
         translation_key="devices_all_online",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         entity_category=EntityCategory.DIAGNOSTIC,
-        is_on_fn=lambda data: data.get("statistics", {}).get("counts", {}).get("offlineDevice", 0) == 0
-        and data.get("statistics", {}).get("counts", {}).get("totalDevice", 0) > 0,
+        is_on_fn=lambda site: site.offline_devices == 0
+        and (site.total_devices or 0) > 0,
     ),
     UnifiBinarySensorEntityDescription(
         key="updates_available",
         translation_key="updates_available",
         device_class=BinarySensorDeviceClass.UPDATE,
         entity_category=EntityCategory.DIAGNOSTIC,
-        is_on_fn=lambda data: data.get("statistics", {}).get("counts", {}).get("pendingUpdateDevice", 0) > 0,
+        is_on_fn=lambda site: site.pending_update_devices > 0,
     ),
 )
 
@@ -58,29 +66,21 @@ HOST_BINARY_SENSORS: Final[tuple[UnifiBinarySensorEntityDescription, ...]] = (
         translation_key="host_online",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         entity_category=EntityCategory.DIAGNOSTIC,
-        is_on_fn=lambda data: data.get("reportedState", {}).get("state") == "connected",
+        is_on_fn=lambda host: host.is_connected,
     ),
     UnifiBinarySensorEntityDescription(
         key="network_active",
         translation_key="network_active",
         icon=ICON_NETWORK,
         entity_category=EntityCategory.DIAGNOSTIC,
-        is_on_fn=lambda data: any(
-            controller.get("name") == "network"
-            and controller.get("state") == "active"
-            for controller in data.get("reportedState", {}).get("controllers", [])
-        ),
+        is_on_fn=lambda host: host.controller_active("network"),
     ),
     UnifiBinarySensorEntityDescription(
         key="protect_active",
         translation_key="protect_active",
         icon=ICON_PROTECT,
         entity_category=EntityCategory.DIAGNOSTIC,
-        is_on_fn=lambda data: any(
-            controller.get("name") == "protect"
-            and controller.get("state") == "active"
-            for controller in data.get("reportedState", {}).get("controllers", [])
-        ),
+        is_on_fn=lambda host: host.controller_active("protect"),
     ),
 )
 
@@ -90,21 +90,21 @@ DEVICE_BINARY_SENSORS: Final[tuple[UnifiBinarySensorEntityDescription, ...]] = (
         translation_key="device_online",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         entity_category=EntityCategory.DIAGNOSTIC,
-        is_on_fn=lambda data: data.get("status") == "online",
+        is_on_fn=lambda device: device.status == "online",
     ),
     UnifiBinarySensorEntityDescription(
         key="device_managed",
         translation_key="device_managed",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         entity_category=EntityCategory.DIAGNOSTIC,
-        is_on_fn=lambda data: data.get("isManaged", False),
+        is_on_fn=lambda device: device.is_managed,
     ),
     UnifiBinarySensorEntityDescription(
         key="firmware_up_to_date",
         translation_key="firmware_up_to_date",
         device_class=BinarySensorDeviceClass.UPDATE,
         entity_category=EntityCategory.DIAGNOSTIC,
-        is_on_fn=lambda data: data.get("firmwareStatus") == "upToDate",
+        is_on_fn=lambda device: device.firmware_status == "upToDate",
     ),
 )
 
@@ -116,47 +116,65 @@ async def async_setup_entry(
     """Set up the UniFi Site Manager binary sensors."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    entities: list[
-        UnifiSiteManagerBinarySensor 
-        | UnifiSiteManagerHostBinarySensor 
-        | UnifiSiteManagerDeviceBinarySensor
-    ] = []
-
-    # Add site-level binary sensors
-    for site_id in coordinator.data["sites"]:
-        entities.extend(
+    def _build_site_binary_sensors(site_id: str) -> list[UnifiSiteManagerBinarySensor]:
+        """Build the binary sensors of a site."""
+        device_info = site_device_info(coordinator, site_id)
+        return [
             UnifiSiteManagerBinarySensor(
                 coordinator=coordinator,
                 description=description,
                 site_id=site_id,
+                entry_id=config_entry.entry_id,
+                device_info=device_info,
             )
             for description in SITE_BINARY_SENSORS
-        )
-
-    # Add host-level binary sensors
-    for host_id, host_data in coordinator.data["hosts"].items():
-        if host_data.get("type") == "console":  # Only add for UniFi OS Consoles
-            entities.extend(
-                UnifiSiteManagerHostBinarySensor(
-                    coordinator=coordinator,
-                    description=description,
-                    host_id=host_id,
-                )
-                for description in HOST_BINARY_SENSORS
+        ]
+
+    def _build_host_binary_sensors(
+        host_id: str,
+    ) -> list[UnifiSiteManagerHostBinarySensor]:
+        """Build the binary sensors of a host."""
+        host_data = coordinator.get_host(host_id)
+        if not host_data or host_data.type != "console":  # Only add for UniFi OS Consoles
+            return []
+        device_info = host_device_info(coordinator, host_id)
+        return [
+            UnifiSiteManagerHostBinarySensor(
+                coordinator=coordinator,
+                description=description,
+                host_id=host_id,
+                entry_id=config_entry.entry_id,
+                device_info=device_info,
             )
-
-    # Add device-level binary sensors
-    for device_id, device_data in coordinator.data.get("devices", {}).items():
-        entities.extend(
+            for description in HOST_BINARY_SENSORS
+        ]
+
+    def _build_device_binary_sensors(
+        device_id: str,
+    ) -> list[UnifiSiteManagerDeviceBinarySensor]:
+        """Build the binary sensors of a device."""
+        device_info = device_device_info(coordinator, device_id)
+        return [
             UnifiSiteManagerDeviceBinarySensor(
                 coordinator=coordinator,
                 description=description,
                 device_id=device_id,
+                entry_id=config_entry.entry_id,
+                device_info=device_info,
             )
             for description in DEVICE_BINARY_SENSORS
-        )
+        ]
 
-    async_add_entities(entities)
+    await async_setup_entity_discovery(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        {
+            "sites": _build_site_binary_sensors,
+            "hosts": _build_host_binary_sensors,
+            "devices": _build_device_binary_sensors,
+        },
+    )
 
 
 class UnifiSiteManagerBinarySensor(UnifiSiteManagerSiteEntity, BinarySensorEntity):
@@ -197,7 +215,7 @@ class UnifiSiteManagerHostBinarySensor(UnifiSiteManagerHostEntity, BinarySensorE
         # For host entities, we need both coordinator and host connection status
         return (
             self.coordinator.last_update_success
-            and self.host_data.get("reportedState", {}).get("state") == "connected"
+            and self.host_data.is_connected
         )
     
 class UnifiSiteManagerDeviceBinarySensor(UnifiSiteManagerDeviceEntity, BinarySensorEntity):
@@ -0,0 +1,85 @@
+"""HTTP response cache for the UniFi Site Manager API client."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+import hashlib
+from typing import Any
+
+from .const import RESPONSE_CACHE_SIZE
+
+CacheKey = tuple[str, str, tuple[tuple[str, Any], ...]]
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """A parsed response body and the validators needed to revalidate it."""
+
+    data: Any
+    digest: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return the headers revalidating this response."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def body_digest(body: bytes) -> bytes:
+    """Return a fingerprint of a response body."""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def make_cache_key(
+    method: str,
+    endpoint: str,
+    params: Mapping[str, Any] | None,
+) -> CacheKey:
+    """Build a hashable cache key from the request method, endpoint and params."""
+    items: list[tuple[str, Any]] = []
+    for key, value in (params or {}).items():
+        if isinstance(value, (list, tuple)):
+            value = tuple(value)
+        items.append((key, value))
+    return (method.upper(), endpoint, tuple(sorted(items)))
+
+
+class ResponseCache:
+    """Least recently used cache of parsed API responses."""
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        self._maxsize = maxsize
+        self._entries: OrderedDict[CacheKey, CachedResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> CachedResponse | None:
+        """Return the cached response for a key."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: CacheKey, entry: CachedResponse) -> None:
+        """Store a response, evicting the least recently used one if full."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: CacheKey) -> None:
+        """Drop the cached response for a key, if any."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
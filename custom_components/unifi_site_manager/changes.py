@@ -0,0 +1,64 @@
+"""Change detection for UniFi Site Manager coordinator data."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import is_dataclass
+import json
+from typing import Any
+
+ObjectKey = tuple[str, str]
+
+
+def fingerprint(obj: Any) -> int:
+    """Return a structural hash of a model record or JSON compatible object."""
+    if is_dataclass(obj):
+        # Records are frozen, so their hash already covers every field
+        return hash(obj)
+    return hash(json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str))
+
+
+class ChangeTracker:
+    """Track which coordinator objects changed between two refreshes.
+
+    Each object is fingerprinted by its content. Objects that are the very
+    same instance as last time (for example a cached API response) are not
+    hashed again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._seen: dict[ObjectKey, tuple[Any, int]] = {}
+        # None means every object must be treated as changed
+        self._changed: set[ObjectKey] | None = None
+
+    def has_changed(self, kind: str, object_id: str) -> bool:
+        """Return if an object changed in the last update."""
+        return self._changed is None or (kind, object_id) in self._changed
+
+    def update(
+        self,
+        collections: Iterable[tuple[str, Mapping[str, Any]]],
+    ) -> set[ObjectKey]:
+        """Fingerprint the given collections and record what changed."""
+        previous = self._seen
+        seen: dict[ObjectKey, tuple[Any, int]] = {}
+        changed: set[ObjectKey] = set()
+
+        for kind, objects in collections:
+            for object_id, obj in objects.items():
+                key = (kind, object_id)
+                old = previous.get(key)
+                if old is not None and old[0] is obj:
+                    seen[key] = old
+                    continue
+                digest = fingerprint(obj)
+                seen[key] = (obj, digest)
+                if old is None or old[1] != digest:
+                    changed.add(key)
+
+        # Objects that disappeared changed too
+        changed.update(previous.keys() - seen.keys())
+
+        self._seen = seen
+        self._changed = changed
+        return changed
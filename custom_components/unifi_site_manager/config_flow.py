@@ -6,8 +6,15 @@ from asyncio import timeout
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_API_KEY
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import (
@@ -15,12 +22,55 @@ from .api import (
     UnifiSiteManagerAuthError,
     UnifiSiteManagerConnectionError,
 )
-from .const import DOMAIN
+from .const import (
+    CONF_DEVICES_INTERVAL,
+    CONF_IMPORT_STATISTICS,
+    CONF_INSTRUMENTATION,
+    CONF_LOOP_BLOCK_THRESHOLD,
+    CONF_LOOP_WATCHDOG,
+    CONF_MAX_STALENESS,
+    CONF_METRICS_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    CONF_SITES,
+    CONF_SITES_INTERVAL,
+    CONF_SNAPSHOT_MAX_AGE,
+    DEFAULT_DEVICES_INTERVAL,
+    DEFAULT_IMPORT_STATISTICS,
+    DEFAULT_INSTRUMENTATION,
+    DEFAULT_LOOP_BLOCK_THRESHOLD,
+    DEFAULT_LOOP_WATCHDOG,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_METRICS_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SITES_INTERVAL,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DOMAIN,
+    MAX_LOOP_BLOCK_THRESHOLD,
+    MAX_MAX_STALENESS,
+    MAX_SCAN_INTERVAL,
+    MAX_SNAPSHOT_MAX_AGE,
+    METRICS_BUCKET,
+    MIN_SCAN_INTERVAL,
+)
+from .hub import new_entry_unique_id
+
+SCAN_INTERVAL_RANGE = vol.All(
+    vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL)
+)
 
 class UnifiSiteManagerFlowHandler(ConfigFlow, domain=DOMAIN):
     """Config flow for UniFi Site Manager."""
 
     VERSION = 1
+    # 2: entity unique IDs are prefixed with the entry ID
+    # 3: the entry unique ID no longer holds the API key
+    MINOR_VERSION = 3
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return UnifiSiteManagerOptionsFlow()
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -45,8 +95,9 @@ class UnifiSiteManagerFlowHandler(ConfigFlow, domain=DOMAIN):
             except Exception:  # pylint: disable=broad-except
                 errors["base"] = "unknown"
             else:
+                # Entries may share an API key to show different sites
                 await self.async_set_unique_id(
-                    user_input[CONF_API_KEY],
+                    new_entry_unique_id(user_input[CONF_API_KEY]),
                     raise_on_progress=False,
                 )
                 return self.async_create_entry(
@@ -90,13 +141,14 @@ class UnifiSiteManagerFlowHandler(ConfigFlow, domain=DOMAIN):
             except Exception:  # pylint: disable=broad-except
                 errors["base"] = "unknown"
             else:
-                existing_entry = await self.async_set_unique_id(
-                    user_input[CONF_API_KEY]
+                existing_entry = self.hass.config_entries.async_get_entry(
+                    self.context["entry_id"]
                 )
                 if existing_entry:
                     self.hass.config_entries.async_update_entry(
                         existing_entry,
                         data=user_input,
+                        unique_id=new_entry_unique_id(user_input[CONF_API_KEY]),
                     )
                     await self.hass.config_entries.async_reload(existing_entry.entry_id)
                     return self.async_abort(reason="reauth_successful")
@@ -105,4 +157,101 @@ class UnifiSiteManagerFlowHandler(ConfigFlow, domain=DOMAIN):
             step_id="reauth_confirm",
             data_schema=vol.Schema({vol.Required(CONF_API_KEY): str}),
             errors=errors,
-        )
\ No newline at end of file
+        )
+
+
+class UnifiSiteManagerOptionsFlow(OptionsFlow):
+    """Options flow for UniFi Site Manager."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the polling intervals and the sites this entry shows."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        selected = options.get(CONF_SITES, [])
+        sites = {site_id: site_id for site_id in selected}
+        if coordinator := self.hass.data.get(DOMAIN, {}).get(
+            self.config_entry.entry_id
+        ):
+            sites.update(
+                (site_id, site.name)
+                for site_id, site in coordinator.data.get("sites", {}).items()
+            )
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(CONF_SITES, default=selected): cv.multi_select(
+                        sites
+                    ),
+                    vol.Optional(
+                        CONF_SITES_INTERVAL,
+                        default=options.get(CONF_SITES_INTERVAL, DEFAULT_SITES_INTERVAL),
+                    ): SCAN_INTERVAL_RANGE,
+                    vol.Optional(
+                        CONF_SCAN_INTERVAL,
+                        default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    ): SCAN_INTERVAL_RANGE,
+                    vol.Optional(
+                        CONF_DEVICES_INTERVAL,
+                        default=options.get(
+                            CONF_DEVICES_INTERVAL, DEFAULT_DEVICES_INTERVAL
+                        ),
+                    ): SCAN_INTERVAL_RANGE,
+                    vol.Optional(
+                        CONF_METRICS_INTERVAL,
+                        default=options.get(
+                            CONF_METRICS_INTERVAL, DEFAULT_METRICS_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(
+                            min=int(METRICS_BUCKET.total_seconds()),
+                            max=MAX_SCAN_INTERVAL,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_MAX_STALENESS,
+                        default=options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=MAX_MAX_STALENESS)
+                    ),
+                    vol.Optional(
+                        CONF_SNAPSHOT_MAX_AGE,
+                        default=options.get(
+                            CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=MAX_SNAPSHOT_MAX_AGE)
+                    ),
+                    vol.Optional(
+                        CONF_IMPORT_STATISTICS,
+                        default=options.get(
+                            CONF_IMPORT_STATISTICS, DEFAULT_IMPORT_STATISTICS
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_INSTRUMENTATION,
+                        default=options.get(
+                            CONF_INSTRUMENTATION, DEFAULT_INSTRUMENTATION
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_LOOP_WATCHDOG,
+                        default=options.get(CONF_LOOP_WATCHDOG, DEFAULT_LOOP_WATCHDOG),
+                    ): bool,
+                    vol.Optional(
+                        CONF_LOOP_BLOCK_THRESHOLD,
+                        default=options.get(
+                            CONF_LOOP_BLOCK_THRESHOLD, DEFAULT_LOOP_BLOCK_THRESHOLD
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=1, max=MAX_LOOP_BLOCK_THRESHOLD),
+                    ),
+                }
+            ),
+        )
@@ -12,16 +12,40 @@ DEFAULT_SCAN_INTERVAL: Final = timedelta(minutes=1)
 # API configurations
 DEFAULT_REQUEST_TIMEOUT: Final = 10
 DEFAULT_RATE_LIMIT: Final = 100
+DEFAULT_MAX_CONCURRENT_REQUESTS: Final = 4
+RESPONSE_CACHE_SIZE: Final = 32
+DEFAULT_PAGE_SIZE: Final = 200
+DEVICE_QUERY_CHUNK_SIZE: Final = 50  # hostIds[] per concurrent /ea/devices query
+TIMESTAMP_CACHE_SIZE: Final = 16384
+JSON_EXECUTOR_THRESHOLD: Final = 1024 * 1024  # bytes, decode larger bodies off the loop
+STREAM_CHUNK_SIZE: Final = 64 * 1024  # bytes read at a time from streamed bodies
+INSTRUMENTATION_SAMPLES: Final = 512  # latency samples kept per endpoint and stage
+LOOP_PROFILE_LINES: Final = 15  # functions kept from the worst cycle profile
+DISCOVERY_REMOVAL_GRACE: Final = 3  # fetches of its data an object must be missing from
+ENTITY_ADD_CHUNK_SIZE: Final = 500  # entities handed to the platform at a time
 MIN_SCAN_INTERVAL: Final = 30  # seconds
 MAX_SCAN_INTERVAL: Final = 3600  # 1 hour
 
 API_RETRIES: Final = 3
 API_RETRY_DELAY: Final = 1.0  # seconds
+API_RETRY_MAX_DELAY: Final = 30.0  # seconds
+API_RETRY_DEADLINE: Final = 45.0  # seconds, kept below the scan interval
+REVALIDATE_DELAY: Final = 15.0  # seconds, first background retry of a failed stage
 
 # Entry Config
 CONF_API_KEY: Final = "api_key"
 CONF_SITE_ID: Final = "site_id"
 
+# Shared hubs, kept in hass.data[DOMAIN] next to the entry coordinators
+DATA_HUBS: Final = "hubs"
+# Hub key each entry was set up with, entry ID to key
+DATA_ENTRY_HUBS: Final = "entry_hubs"
+
+# Storage
+STORAGE_KEY: Final = DOMAIN
+STORAGE_VERSION: Final = 2
+SNAPSHOT_SAVE_DELAY: Final = 30  # seconds
+
 # Device Classes
 DEVICE_CLASS_CLIENTS: Final = "clients"
 DEVICE_CLASS_GATEWAY: Final = "gateway"
@@ -52,6 +76,8 @@ DEVICE_ATTR_UPTIME = "uptime"
 DEVICE_ATTR_ADOPTION_TIME = "adoption_time"
 DEVICE_ATTR_STARTUP_TIME = "startup_time"
 ATTR_LAST_UPDATED: Final = "last_updated"
+ATTR_STALE: Final = "stale"
+ATTR_FETCHED_AT: Final = "fetched_at"
 ATTR_API_VERSION: Final = "api_version"
 
 # ISP Metrics
@@ -123,6 +149,26 @@ ICON_STARTUP = "mdi:clock-start"
 # Metric Types
 METRIC_TYPE_5M: Final = "5m"
 METRIC_TYPE_1H: Final = "1h"
+METRICS_BUFFER_SIZE: Final = 288  # 24h of 5m periods
+METRICS_BUCKET: Final = timedelta(minutes=5)
+METRICS_PUBLISH_DELAY: Final = timedelta(seconds=30)  # lag after a bucket closes
+HISTORY_BUCKET: Final = timedelta(hours=1)
+HISTORY_PUBLISH_DELAY: Final = timedelta(minutes=5)  # lag after an hour closes
+HISTORY_BACKFILL_DURATION: Final = "30d"  # window for sites without imported hours
+
+# Refresh stages, one per data class
+STAGE_SITES: Final = "sites"
+STAGE_HOSTS: Final = "hosts"
+STAGE_DEVICES: Final = "devices"
+STAGE_METRICS: Final = "metrics"
+STAGE_HISTORY: Final = "history"
+# Stages whose results another stage reads, run first when both are due
+STAGE_DEPENDENCIES: Final = {
+    STAGE_METRICS: (STAGE_SITES,),
+    STAGE_DEVICES: (STAGE_HOSTS,),
+    # Hourly statistics take their min/max from the fresh 5m periods
+    STAGE_HISTORY: (STAGE_SITES, STAGE_METRICS),
+}
 
 # State Classes
 STATE_CLASS_MEASUREMENT: Final = "measurement"
@@ -148,13 +194,31 @@ UNIT_PERCENTAGE: Final = "%"
 
 # Configuration
 CONF_SCAN_INTERVAL = "scan_interval"
-CONF_CACHE_TTL = "cache_ttl"
+CONF_SITES_INTERVAL = "sites_interval"
+CONF_DEVICES_INTERVAL = "devices_interval"
 CONF_METRICS_INTERVAL = "metrics_interval"
+CONF_SNAPSHOT_MAX_AGE = "snapshot_max_age"
+CONF_INSTRUMENTATION = "instrumentation"
+CONF_SITES = "sites"
+CONF_MAX_STALENESS = "max_staleness"
+CONF_LOOP_WATCHDOG = "loop_watchdog"
+CONF_LOOP_BLOCK_THRESHOLD = "loop_block_threshold"
+CONF_IMPORT_STATISTICS = "import_statistics"
 
 # Defaults
 DEFAULT_SCAN_INTERVAL = 60  # seconds
-DEFAULT_CACHE_TTL = 300  # seconds
+DEFAULT_SITES_INTERVAL = 300  # seconds
+DEFAULT_DEVICES_INTERVAL = 300  # seconds
 DEFAULT_METRICS_INTERVAL = 300  # seconds
+DEFAULT_SNAPSHOT_MAX_AGE = 86400  # seconds
+MAX_SNAPSHOT_MAX_AGE = 604800  # 1 week
+DEFAULT_MAX_STALENESS = 900  # seconds
+MAX_MAX_STALENESS = 86400  # 1 day
+DEFAULT_INSTRUMENTATION = False
+DEFAULT_LOOP_WATCHDOG = False
+DEFAULT_LOOP_BLOCK_THRESHOLD = 50  # milliseconds
+MAX_LOOP_BLOCK_THRESHOLD = 5000  # milliseconds
+DEFAULT_IMPORT_STATISTICS = False
 
 # Services
 SERVICE_REFRESH = "refresh"
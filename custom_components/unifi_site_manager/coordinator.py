@@ -2,14 +2,21 @@
 from __future__ import annotations
 
 import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import AbstractContextManager, nullcontext
 import logging
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import (
     UnifiSiteManagerAPI,
@@ -18,16 +25,122 @@ from .api import (
     UnifiSiteManagerConnectionError,
     UnifiSiteManagerRateLimitError,
 )
+from .aggregation import SiteAggregates, aggregate_sites
+from .changes import ChangeTracker
+from .device_index import INDEX_HOST, DeviceCounts, DeviceIndex
 from .const import (
+    API_RETRY_DEADLINE,
+    CONF_DEVICES_INTERVAL,
+    CONF_IMPORT_STATISTICS,
+    CONF_LOOP_BLOCK_THRESHOLD,
+    CONF_LOOP_WATCHDOG,
+    CONF_MAX_STALENESS,
+    CONF_METRICS_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    CONF_SITES_INTERVAL,
+    CONF_SNAPSHOT_MAX_AGE,
+    DEFAULT_DEVICES_INTERVAL,
+    DEFAULT_IMPORT_STATISTICS,
+    DEFAULT_LOOP_BLOCK_THRESHOLD,
+    DEFAULT_LOOP_WATCHDOG,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_METRICS_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SITES_INTERVAL,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DEVICE_QUERY_CHUNK_SIZE,
     DOMAIN,
-    SCAN_INTERVAL_METRICS,
-    SCAN_INTERVAL_NORMAL,
+    HISTORY_BACKFILL_DURATION,
+    HISTORY_BUCKET,
+    HISTORY_PUBLISH_DELAY,
+    METRICS_BUCKET,
+    METRICS_BUFFER_SIZE,
+    METRICS_PUBLISH_DELAY,
+    REVALIDATE_DELAY,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    STAGE_DEPENDENCIES,
+    STAGE_DEVICES,
+    STAGE_HISTORY,
+    STAGE_HOSTS,
+    STAGE_METRICS,
+    STAGE_SITES,
+    METRIC_TYPE_1H,
     METRIC_TYPE_5M,
 )
+from .history import IspStatisticsImporter
+from .metrics import SiteMetricsBuffer
+from .models import Device, Host, IspPeriod, Site
+from .profiling import LoopWatchdog
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _stage_intervals(options: Mapping[str, Any]) -> dict[str, timedelta]:
+    """Return the polling interval of each data class from the entry options."""
+    intervals = {
+        STAGE_SITES: timedelta(
+            seconds=options.get(CONF_SITES_INTERVAL, DEFAULT_SITES_INTERVAL)
+        ),
+        STAGE_HOSTS: timedelta(
+            seconds=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        ),
+        STAGE_DEVICES: timedelta(
+            seconds=options.get(CONF_DEVICES_INTERVAL, DEFAULT_DEVICES_INTERVAL)
+        ),
+        STAGE_METRICS: max(
+            METRICS_BUCKET,
+            timedelta(
+                seconds=options.get(CONF_METRICS_INTERVAL, DEFAULT_METRICS_INTERVAL)
+            ),
+        ),
+    }
+    if options.get(CONF_IMPORT_STATISTICS, DEFAULT_IMPORT_STATISTICS):
+        intervals[STAGE_HISTORY] = HISTORY_BUCKET
+    return intervals
+
+
+# Stages polled just after their time bucket closes, with the publish lag
+_BUCKETED_STAGES: dict[str, tuple[timedelta, timedelta]] = {
+    STAGE_METRICS: (METRICS_BUCKET, METRICS_PUBLISH_DELAY),
+    STAGE_HISTORY: (HISTORY_BUCKET, HISTORY_PUBLISH_DELAY),
+}
+
+
+def _watchdog(options: Mapping[str, Any]) -> LoopWatchdog | None:
+    """Return a loop watchdog if the entry options enable it."""
+    if not options.get(CONF_LOOP_WATCHDOG, DEFAULT_LOOP_WATCHDOG):
+        return None
+    return LoopWatchdog(
+        options.get(CONF_LOOP_BLOCK_THRESHOLD, DEFAULT_LOOP_BLOCK_THRESHOLD) / 1000
+    )
+
+
+class _SnapshotStore(Store[dict[str, Any]]):
+    """Snapshot storage that discards snapshots of older schema versions."""
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Drop snapshots written with another schema, the next refresh rebuilds them."""
+        _LOGGER.debug("Discarding data snapshot of version %s", old_major_version)
+        return {}
+
+
+def _snapshot_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict[str, Any]]:
+    """Return the storage holding the data snapshot of a config entry."""
+    return _SnapshotStore(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}")
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the data snapshot of a config entry."""
+    await _snapshot_store(hass, entry).async_remove()
+
+
 class UnifiSiteManagerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Class to manage fetching UniFi Site Manager data."""
 
@@ -40,11 +153,13 @@ class UnifiSiteManagerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]
         entry: ConfigEntry,
     ) -> None:
         """Initialize the coordinator."""
+        self._intervals = _stage_intervals(entry.options)
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=SCAN_INTERVAL_NORMAL,
+            # Tick at the fastest cadence, each stage runs only when due
+            update_interval=min(self._intervals.values()),
         )
         self.api = api
         self.config_entry = entry
@@ -56,17 +171,83 @@ class UnifiSiteManagerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]
             "devices": {}, 
             "last_update": None,
         }
+        self._raw_sites: list[dict[str, Any]] | None = None
+        self._metric_buffers: dict[str, SiteMetricsBuffer] = {}
+        # Sites the full metrics window was requested for, whether or not
+        # they reported any periods
+        self._metric_sites: set[str] = set()
+        self._changes = ChangeTracker()
+        self._latest_metrics: dict[str, IspPeriod] = {}
+        self._aggregates: dict[str, SiteAggregates] = {}
+        self.device_index = DeviceIndex()
+        self._host_device_counts: dict[str, DeviceCounts] = {}
+        self._site_device_counts: dict[str, DeviceCounts] = {}
+        self._store = _snapshot_store(hass, entry)
+        # None unless the loop watchdog option is on
+        self.watchdog: LoopWatchdog | None = _watchdog(entry.options)
+        # None unless the statistics import option is on
+        self.statistics: IspStatisticsImporter | None = (
+            IspStatisticsImporter(hass) if STAGE_HISTORY in self._intervals else None
+        )
+        self._next_due: dict[str, datetime] = dict.fromkeys(
+            self._intervals, datetime.min.replace(tzinfo=timezone.utc)
+        )
+        # Freshness of each data class: when it was last fetched, and how
+        # many times in a row its stage has failed since
+        self._fetched_at: dict[str, datetime] = {}
+        self._failures: dict[str, int] = {}
+        self._max_staleness = timedelta(
+            seconds=entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+        )
+        self._revalidate_unsub: Callable[[], None] | None = None
         self._metric_update_lock = asyncio.Lock()
         self._site_update_lock = asyncio.Lock()
         self._host_update_lock = asyncio.Lock()
         self._device_update_lock = asyncio.Lock()
+        self._history_update_lock = asyncio.Lock()
+
+    @callback
+    def async_apply_entry(self, entry: ConfigEntry) -> None:
+        """Follow the options of another config entry, used when a shared hub changes owner."""
+        self.config_entry = entry
+        # Stages keep their current due times, new intervals apply from the
+        # next run of each stage
+        self._intervals = _stage_intervals(entry.options)
+        self.update_interval = min(self._intervals.values())
+        for stage in self._next_due.keys() - self._intervals.keys():
+            del self._next_due[stage]
+        for stage in self._intervals.keys() - self._next_due.keys():
+            self._next_due[stage] = datetime.min.replace(tzinfo=timezone.utc)
+        if (STAGE_HISTORY in self._intervals) != (self.statistics is not None):
+            self.statistics = (
+                IspStatisticsImporter(self.hass)
+                if STAGE_HISTORY in self._intervals
+                else None
+            )
+        self.watchdog = _watchdog(entry.options)
+        self._max_staleness = timedelta(
+            seconds=entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+        )
+
+    def timed_section(self, name: str) -> AbstractContextManager[None]:
+        """Return a context timing a synchronous section for the loop watchdog."""
+        if self.watchdog is None:
+            return nullcontext()
+        return self.watchdog.section(name)
 
     async def _async_update_sites(self) -> None:
         """Update sites data."""
         async with self._site_update_lock:
             try:
                 sites = await self.api.async_get_sites()
-                self.data["sites"] = {site["siteId"]: site for site in sites}
+                # The API client hands back the same object for an unchanged
+                # response, so there is nothing to rebuild
+                if sites is not self._raw_sites:
+                    self._raw_sites = sites
+                    with self.timed_section("build_sites"):
+                        self.data["sites"] = {
+                            site["siteId"]: Site.from_api(site) for site in sites
+                        }
                 _LOGGER.debug("Updated %s sites", len(sites))
             except UnifiSiteManagerAuthError as err:
                 self._available = False
@@ -79,8 +260,13 @@ class UnifiSiteManagerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]
         """Update hosts data."""
         async with self._host_update_lock:
             try:
-                hosts = await self.api.async_get_hosts()
-                self.data["hosts"] = {host["id"]: host for host in hosts}
+                # Fold each page into the index as it arrives
+                hosts: dict[str, Host] = {}
+                async for page in self.api.async_iter_hosts():
+                    with self.timed_section("build_hosts"):
+                        for host in page:
+                            hosts[host["id"]] = Host.from_api(host)
+                self.data["hosts"] = hosts
                 _LOGGER.debug("Updated %s hosts", len(hosts))
             except UnifiSiteManagerAPIError as err:
                 self._available = False
@@ -90,22 +276,41 @@ class UnifiSiteManagerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]
         """Update devices data."""
         async with self._device_update_lock:
             try:
-                # Get list of host IDs to query
+                # Get list of host IDs to query, the hosts stage of this
+                # cycle has already run when it was due
                 host_ids = list(self.data["hosts"].keys())
-                
-                devices_data = await self.api.async_get_devices(host_ids=host_ids)
-                
-                # Process and organize device data by host
-                devices = {}
-                for device_group in devices_data:
-                    # Each device group contains devices for a specific host
-                    for device in device_group.get("devices", []):
-                        device_id = device.get("mac")  # Use MAC as unique identifier
-                        if device_id:
-                            devices[device_id] = device
-                
+                # Large fleets are split into chunks fetched concurrently,
+                # without hosts a single unfiltered query is made
+                chunks = [
+                    host_ids[index : index + DEVICE_QUERY_CHUNK_SIZE]
+                    for index in range(0, len(host_ids), DEVICE_QUERY_CHUNK_SIZE)
+                ] or [[]]
+
+                # Process and organize device data by host, one page at a time
+                devices: dict[str, Device] = {}
+
+                async def fetch_chunk(chunk: list[str]) -> None:
+                    async for page in self.api.async_iter_devices(host_ids=chunk):
+                        with self.timed_section("build_devices"):
+                            for device_group in page:
+                                # Each device group contains devices for a specific host
+                                group_host_id = device_group.get("hostId")
+                                for device in device_group.get("devices", []):
+                                    # Use MAC as unique identifier
+                                    device_id = device.get("mac")
+                                    if device_id:
+                                        devices[device_id] = Device.from_api(
+                                            device, host_id=group_host_id
+                                        )
+
+                await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+
                 self.data["devices"] = devices
-                _LOGGER.debug("Updated %s devices", len(devices))
+                with self.timed_section("index_devices"):
+                    moved = self.device_index.update(devices)
+                _LOGGER.debug(
+                    "Updated %s devices (%s reindexed)", len(devices), moved
+                )
                 
             except Exception as err:
                 self._available = False
@@ -115,68 +320,464 @@ class UnifiSiteManagerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]
         """Update ISP metrics data."""
         async with self._metric_update_lock:
             try:
-                # Use timezone-aware datetime
-                end_time = datetime.now(timezone.utc)
-                start_time = end_time - SCAN_INTERVAL_METRICS
-
-                metrics = {}
-                for site_id in self.data["sites"]:
-                    try:
-                        site_metrics = await self.api.async_get_isp_metrics(
-                            METRIC_TYPE_5M,
-                            site_id=site_id,
-                            begin_timestamp=start_time,
-                            end_timestamp=end_time,
-                        )
-                        if site_metrics:
-                            metrics[site_id] = site_metrics
-                    except UnifiSiteManagerRateLimitError as err:
-                        _LOGGER.warning(
-                            "Rate limit reached while updating metrics for site %s: %s",
-                            site_id,
-                            err,
-                        )
-                        continue
-                    except UnifiSiteManagerAPIError as err:
-                        _LOGGER.error(
-                            "Error updating metrics for site %s: %s",
-                            site_id,
-                            err,
-                        )
-                        continue
+                site_ids = list(self.data["sites"])
+                buffers = self._metric_buffers
+
+                # Forget sites that no longer exist
+                for site_id in set(buffers) - set(site_ids):
+                    del buffers[site_id]
+                self._metric_sites.intersection_update(site_ids)
+
+                # Only ask for periods newer than what the sites already
+                # hold. A site not asked for the full window yet needs it,
+                # while one that never reported (no gateway) does not hold
+                # the window open for the others
+                now = datetime.now(timezone.utc)
+                begin_time = None
+                latest_times = [
+                    latest
+                    for site_id in site_ids
+                    if site_id in buffers
+                    and (latest := buffers[site_id].latest_time) is not None
+                ]
+                if latest_times and self._metric_sites.issuperset(site_ids):
+                    # A site that stopped reporting must not stretch the
+                    # window past what the buffers keep
+                    begin_time = max(
+                        min(latest_times),
+                        now - METRICS_BUCKET * METRICS_BUFFER_SIZE,
+                    )
+
+                # One request covers every site; the response is parsed as
+                # it streams in, keeping only the periods of known sites that
+                # are not older than what the buffers hold
+                fetched: dict[str, list[IspPeriod]] = {}
+                async for site_id, raw in self.api.async_iter_isp_metrics(
+                    METRIC_TYPE_5M,
+                    site_ids=site_ids,
+                    begin_timestamp=begin_time,
+                    end_timestamp=now if begin_time else None,
+                    since=begin_time,
+                ):
+                    if (period := IspPeriod.from_api(raw)) is not None:
+                        fetched.setdefault(site_id, []).append(period)
+                if begin_time is None:
+                    self._metric_sites = set(site_ids)
+
+                added = 0
+                with self.timed_section("merge_metrics"):
+                    for site_id, periods in fetched.items():
+                        buffer = buffers.setdefault(site_id, SiteMetricsBuffer())
+                        added += buffer.merge(periods)
+
+                    metrics = {}
+                    for site_id, buffer in buffers.items():
+                        if periods := buffer.periods():
+                            metrics[site_id] = periods
 
                 self.data["metrics"] = metrics
-                _LOGGER.debug("Updated metrics for %s sites", len(metrics))
+                with self.timed_section("aggregate_metrics"):
+                    self._aggregates = aggregate_sites(
+                        {site_id: buffers[site_id].columns() for site_id in metrics}
+                    )
+                _LOGGER.debug(
+                    "Updated metrics for %s sites (%s new periods, incremental=%s)",
+                    len(metrics),
+                    added,
+                    begin_time is not None,
+                )
 
+            except UnifiSiteManagerRateLimitError as err:
+                # A stage failure, so the metrics turn stale and are
+                # revalidated with backoff, but the API stays available
+                raise UpdateFailed(
+                    f"Rate limit reached while updating metrics: {err}"
+                ) from err
             except UnifiSiteManagerAPIError as err:
                 self._available = False
                 raise UpdateFailed(f"Error updating metrics: {err}") from err
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API."""
+    async def _async_update_history(self) -> None:
+        """Import the closed hours of 1h ISP metrics into long-term statistics."""
+        statistics = self.statistics
+        if statistics is None or "recorder" not in self.hass.config.components:
+            return
+        async with self._history_update_lock:
+            site_ids = list(self.data["sites"])
+            # Resume after the hours every site already has, sites without
+            # imported hours need the full backfill window
+            begin_time = await statistics.async_resume_time(site_ids)
+            now = dt_util.utcnow()
+
+            # One request covers every site, partitioned client side
+            fetched = await self.api.async_get_isp_metrics_by_site(
+                METRIC_TYPE_1H,
+                site_ids=site_ids,
+                begin_timestamp=begin_time,
+                end_timestamp=now if begin_time else None,
+                duration=HISTORY_BACKFILL_DURATION,
+            )
+
+            imported = 0
+            with self.timed_section("import_statistics"):
+                # Sites without hours are recorded as checked too
+                for site_id in site_ids:
+                    site = self.data["sites"].get(site_id)
+                    imported += statistics.async_import(
+                        site_id,
+                        site.name if site else site_id,
+                        (
+                            period
+                            for metric in fetched.get(site_id, [])
+                            for raw in metric.get("periods", [])
+                            if (period := IspPeriod.from_api(raw)) is not None
+                        ),
+                        self.data["metrics"].get(site_id, []),
+                        now,
+                    )
+            _LOGGER.debug(
+                "Imported %s hours of ISP statistics for %s sites (backfill=%s)",
+                imported,
+                len(fetched),
+                begin_time is None,
+            )
+
+    def _next_run(self, stage: str, now: datetime) -> datetime:
+        """Return when a stage is due again after running at now."""
+        interval = self._intervals[stage]
+        if stage not in _BUCKETED_STAGES:
+            return now + interval
+        # Metrics only change once per bucket, so poll just after the
+        # bucket boundary the interval lands in
+        bucket, publish_delay = _BUCKETED_STAGES[stage]
+        seconds = bucket.total_seconds()
+        target = (now + interval - bucket).timestamp()
+        boundary = (target // seconds + 1) * seconds
+        return datetime.fromtimestamp(boundary, timezone.utc) + publish_delay
+
+    async def _async_run_stage(
+        self, stage: str, update: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Run a refresh stage, timing it when instrumentation is enabled."""
+        instrumentation = self.api.instrumentation
+        if instrumentation is None:
+            await update()
+            return
+        start = time.perf_counter()
         try:
-            # Update sites first as we need site IDs for metrics
-            await self._async_update_sites()
-            
-            # Update hosts and metrics concurrently
-            await asyncio.gather(
-                self._async_update_hosts(),
-                self._async_update_devices(),
-                self._async_update_metrics(),
+            await update()
+        finally:
+            instrumentation.record_stage(stage, time.perf_counter() - start)
+
+    async def _async_run_pipeline(self, due: set[str]) -> dict[str, Exception]:
+        """Run the due stages as a dependency graph, returning the failed ones.
+
+        Every stage starts right away unless a stage it reads from is due in
+        the same cycle, in which case it waits for that stage only. A stage
+        whose dependency is not due, or failed, works from the data already
+        held.
+        """
+        updates: dict[str, Callable[[], Awaitable[None]]] = {
+            STAGE_SITES: self._async_update_sites,
+            STAGE_HOSTS: self._async_update_hosts,
+            STAGE_DEVICES: self._async_update_devices,
+            STAGE_METRICS: self._async_update_metrics,
+            STAGE_HISTORY: self._async_update_history,
+        }
+        tasks: dict[str, asyncio.Task[None]] = {}
+
+        async def run(stage: str) -> None:
+            if waits := [
+                tasks[dependency]
+                for dependency in STAGE_DEPENDENCIES.get(stage, ())
+                if dependency in tasks
+            ]:
+                await asyncio.gather(*waits, return_exceptions=True)
+            await self._async_run_stage(stage, updates[stage])
+
+        # Dependencies come first in updates, so their tasks exist by the time
+        # a dependent stage looks them up
+        for stage in updates:
+            if stage in due:
+                tasks[stage] = asyncio.create_task(run(stage))
+
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        failures: dict[str, Exception] = {}
+        for stage, result in zip(tasks, results):
+            if not isinstance(result, BaseException):
+                continue
+            # Authentication failures and cancellation end the cycle
+            if isinstance(result, ConfigEntryAuthFailed) or not isinstance(
+                result, Exception
+            ):
+                raise result
+            failures[stage] = result
+        return failures
+
+    def _is_expired(self, stage: str, now: datetime) -> bool:
+        """Return if a data class is too old to keep serving."""
+        if stage == STAGE_HISTORY:
+            # No entity reads the statistics import, it never takes them down
+            return False
+        fetched_at = self._fetched_at.get(stage)
+        return fetched_at is None or now - fetched_at > self._max_staleness
+
+    @callback
+    def _async_schedule_revalidation(self, failures: Mapping[str, Exception]) -> None:
+        """Retry failed stages in the background, backing off per stage."""
+        now = dt_util.utcnow()
+        delay = None
+        for stage in failures:
+            attempt = self._failures[stage] = self._failures.get(stage, 0) + 1
+            stage_delay = min(
+                REVALIDATE_DELAY * 2 ** (attempt - 1),
+                self._intervals[stage].total_seconds(),
             )
+            self._next_due[stage] = now + timedelta(seconds=stage_delay)
+            delay = stage_delay if delay is None else min(delay, stage_delay)
+
+        if delay is None:
+            return
+        if self._revalidate_unsub is not None:
+            self._revalidate_unsub()
+        self._revalidate_unsub = async_call_later(
+            self.hass, delay, self._async_revalidate
+        )
+
+    async def _async_revalidate(self, _now: datetime) -> None:
+        """Refresh, running only the stages that are due again."""
+        self._revalidate_unsub = None
+        await self.async_request_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel a pending revalidation, then shut down."""
+        if self._revalidate_unsub is not None:
+            self._revalidate_unsub()
+            self._revalidate_unsub = None
+        await super().async_shutdown()
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch the data classes that are due from the API."""
+        now = dt_util.utcnow()
+        due = {stage for stage, due_at in self._next_due.items() if due_at <= now}
+        if not due:
+            return self.data
+
+        _LOGGER.debug("Refreshing %s", ", ".join(sorted(due)))
+        start = time.perf_counter()
+        if self.watchdog is not None:
+            # Ended once the update has been fanned out to the entities
+            self.watchdog.begin_cycle()
+
+        try:
+            # Retries of every request in this cycle share one deadline, the
+            # stage tasks inherit it with the rest of the context
+            with self.api.retry_deadline(API_RETRY_DEADLINE):
+                failures = await self._async_run_pipeline(due)
+
+            fetched_at = dt_util.utcnow()
+            for stage in due - failures.keys():
+                self._next_due[stage] = self._next_run(stage, now)
+                self._fetched_at[stage] = fetched_at
+                self._failures.pop(stage, None)
+
+            if failures:
+                self._async_schedule_revalidation(failures)
+                # Keep serving the last good data of a failed stage until it
+                # is older than the staleness budget
+                if expired := [
+                    stage for stage in failures if self._is_expired(stage, fetched_at)
+                ]:
+                    raise failures[expired[0]]
+                _LOGGER.warning(
+                    "Serving stale %s data: %s",
+                    ", ".join(sorted(failures)),
+                    "; ".join(str(err) for err in failures.values()),
+                )
 
             self._available = True
             self.data["last_update"] = datetime.now(timezone.utc)
+            if self.api.instrumentation is not None:
+                self.api.instrumentation.record_refresh(time.perf_counter() - start)
+            self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
             return self.data
 
         except UnifiSiteManagerConnectionError as err:
             self._available = False
             raise UpdateFailed(f"Connection error: {err}") from err
+        except (UpdateFailed, ConfigEntryAuthFailed):
+            self._available = False
+            raise
         except Exception as err:  # pylint: disable=broad-except
             self._available = False
             _LOGGER.exception("Unexpected error updating coordinator")
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
+    @callback
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the last good data in its stored form."""
+        with self.timed_section("serialize_snapshot"):
+            last_update = self.data.get("last_update")
+            return {
+                "saved_at": dt_util.utcnow().isoformat(),
+                "data": {
+                    "sites": [site.as_dict() for site in self.data["sites"].values()],
+                    "hosts": [host.as_dict() for host in self.data["hosts"].values()],
+                    "devices": [
+                        device.as_dict() for device in self.data["devices"].values()
+                    ],
+                    "metrics": {
+                        site_id: [period.as_dict() for period in periods]
+                        for site_id, periods in self.data["metrics"].items()
+                    },
+                    "last_update": last_update.isoformat() if last_update else None,
+                },
+            }
+
+    async def async_load_snapshot(self) -> bool:
+        """Restore the last saved data, returning if it was fresh enough to use."""
+        try:
+            snapshot = await self._store.async_load()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error loading data snapshot")
+            return False
+        if not snapshot:
+            return False
+
+        saved_at = dt_util.parse_datetime(snapshot.get("saved_at") or "")
+        max_age = timedelta(
+            seconds=self.config_entry.options.get(
+                CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE
+            )
+        )
+        if saved_at is None or dt_util.utcnow() - saved_at > max_age:
+            _LOGGER.debug("Ignoring data snapshot saved at %s", saved_at)
+            return False
+
+        data = snapshot.get("data", {})
+        last_update = data.get("last_update")
+        try:
+            sites = [Site.from_dict(site) for site in data.get("sites", [])]
+            hosts = [Host.from_dict(host) for host in data.get("hosts", [])]
+            devices = [Device.from_dict(device) for device in data.get("devices", [])]
+            metrics = {
+                site_id: [IspPeriod.from_dict(period) for period in periods]
+                for site_id, periods in data.get("metrics", {}).items()
+            }
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.debug("Ignoring unreadable data snapshot: %s", err)
+            return False
+
+        # Seed the metric buffers so the next fetch stays incremental
+        for site_id, periods in metrics.items():
+            buffer = self._metric_buffers.setdefault(site_id, SiteMetricsBuffer())
+            buffer.merge(periods)
+        self._metric_sites.update(metrics)
+
+        self.data = {
+            "sites": {site.site_id: site for site in sites},
+            "hosts": {host.host_id: host for host in hosts},
+            "metrics": {
+                site_id: buffer.periods()
+                for site_id, buffer in self._metric_buffers.items()
+            },
+            "devices": {device.mac: device for device in devices},
+            "last_update": dt_util.parse_datetime(last_update) if last_update else None,
+        }
+
+        # Restored data counts as fetched when it was last refreshed
+        restored_at = self.data["last_update"] or saved_at
+        self._fetched_at = dict.fromkeys(self._intervals, restored_at)
+
+        self._async_update_latest_metrics()
+        self._aggregates = aggregate_sites(
+            {
+                site_id: buffer.columns()
+                for site_id, buffer in self._metric_buffers.items()
+            }
+        )
+        self.device_index.update(self.data["devices"])
+        self.last_update_success = True
+        _LOGGER.debug(
+            "Restored snapshot from %s with %s sites, %s hosts and %s devices",
+            saved_at,
+            len(self.data["sites"]),
+            len(self.data["hosts"]),
+            len(self.data["devices"]),
+        )
+        return True
+
+    @callback
+    def _async_update_latest_metrics(self) -> None:
+        """Index the newest metrics period of every valid site."""
+        self._latest_metrics = {
+            site_id: max(periods, key=lambda period: period.metric_time)
+            for site_id, periods in self.data.get("metrics", {}).items()
+            if periods and self.validate_site_data(site_id)
+        }
+
+    @callback
+    def _async_update_device_counts(self) -> None:
+        """Roll the device index up into counts per host and per site."""
+        index = self.device_index
+        self._host_device_counts = {
+            host_id: index.host_counts(host_id)
+            for host_id in self.data.get("hosts", {})
+        }
+        # A site's devices are those of the host running it. Devices do not
+        # name their site, so sites sharing a host get no counts
+        sites = self.data.get("sites", {})
+        site_hosts = Counter(site.host_id for site in sites.values())
+        self._site_device_counts = {
+            site_id: index.host_counts(site.host_id)
+            for site_id, site in sites.items()
+            if site_hosts[site.host_id] == 1
+        }
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Record which objects changed, then notify listeners."""
+        with self.timed_section("index_latest_metrics"):
+            self._async_update_latest_metrics()
+        with self.timed_section("count_devices"):
+            self._async_update_device_counts()
+        with self.timed_section("track_changes"):
+            changed = self._changes.update(
+                (
+                    ("sites", self.data.get("sites", {})),
+                    ("hosts", self.data.get("hosts", {})),
+                    ("devices", self.data.get("devices", {})),
+                    # Entities only read the newest period of a site
+                    ("metrics", self._latest_metrics),
+                    ("aggregates", self._aggregates),
+                    ("host_devices", self._host_device_counts),
+                    ("site_devices", self._site_device_counts),
+                )
+            )
+        _LOGGER.debug("%s objects changed since the last update", len(changed))
+        with self.timed_section("entity_fanout"):
+            super().async_update_listeners()
+        if self.watchdog is not None:
+            self.watchdog.end_cycle()
+
+    def is_stale(self, kind: str) -> bool:
+        """Return if a data class is served from before its last failed refresh."""
+        return kind in self._failures
+
+    def fetched_at(self, kind: str) -> datetime | None:
+        """Return when a data class was last fetched successfully."""
+        return self._fetched_at.get(kind)
+
+    def has_changed(self, kind: str, object_id: str) -> bool:
+        """Return if a site, host, device or metrics object changed in the last update."""
+        return self._changes.has_changed(kind, object_id)
+
+    async def async_refresh_all(self) -> None:
+        """Refresh every data class regardless of its schedule."""
+        for stage in self._next_due:
+            self._next_due[stage] = datetime.min.replace(tzinfo=timezone.utc)
+        await self.async_refresh()
+
     async def async_refresh_metrics(self) -> None:
         """Refresh only the metrics data."""
         await self._async_update_metrics()
@@ -187,54 +788,63 @@ class UnifiSiteManagerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]
         """Return coordinator availability."""
         return self._available
 
-    def get_host(self, host_id: str) -> dict[str, Any] | None:
+    def get_host(self, host_id: str) -> Host | None:
         """Get host data by ID."""
         return self.data.get("hosts", {}).get(host_id)
 
-    def get_site(self, site_id: str) -> dict[str, Any] | None:
+    def get_site(self, site_id: str) -> Site | None:
         """Get site data by ID."""
         return self.data.get("sites", {}).get(site_id)
 
-    def get_device(self, device_id: str) -> dict[str, Any] | None:
+    def get_device(self, device_id: str) -> Device | None:
         """Get device data by ID (MAC address)."""
         return self.data.get("devices", {}).get(device_id)
 
     def validate_site_data(self, site_id: str) -> bool:
         """Validate site data exists and has required fields."""
-        if not self.data.get("sites"):
-            return False
-        site_data = self.data["sites"].get(site_id)
-        if not site_data:
-            return False
-        required_fields = ["meta", "statistics"]
-        return all(field in site_data for field in required_fields)
+        site = self.get_site(site_id)
+        return site is not None and site.has_statistics
 
-    def get_site_metrics(self, site_id: str) -> list[dict[str, Any]]:
-        """Return the stored metrics list for a given site with validation."""
+    def get_site_metrics(self, site_id: str) -> list[IspPeriod]:
+        """Return the stored metric periods for a given site, newest first."""
         if not self.validate_site_data(site_id):
             _LOGGER.warning("Invalid site_id or missing site data: %s", site_id)
             return []
         return self.data["metrics"].get(site_id, [])
 
-    @property
-    def site_metrics(self) -> dict[str, Any] | None:
-        """Get site metrics."""
-        if not self._site_id:
-            return None
-                
-        metrics = self.coordinator.get_site_metrics(self._site_id)
-        if not metrics or not isinstance(metrics, list) or not metrics:
-            return None
-
-        # Get first metric set
-        metric_set = metrics[0]
-        if not metric_set.get("periods"):
-            return None
-                
-        # Get the most recent period's data
-        periods = metric_set["periods"]
-        if not periods:
-            return None
+    def get_latest_metrics(self, site_id: str) -> IspPeriod | None:
+        """Return the newest metrics period of a site."""
+        return self._latest_metrics.get(site_id)
+
+    def get_host_devices(self, host_id: str) -> list[Device]:
+        """Return the devices managed by a host."""
+        return self.device_index.devices(INDEX_HOST, host_id)
+
+    def get_site_devices(self, site_id: str) -> list[Device]:
+        """Return the devices of a site, those of the host running it.
+
+        Empty when the host runs other sites too, as devices do not name
+        their site.
+        """
+        site = self.get_site(site_id)
+        if site is None or site.host_id is None:
+            return []
+        if any(
+            other.host_id == site.host_id
+            for other_id, other in self.data.get("sites", {}).items()
+            if other_id != site_id
+        ):
+            return []
+        return self.device_index.devices(INDEX_HOST, site.host_id)
+
+    def get_host_device_counts(self, host_id: str) -> DeviceCounts | None:
+        """Return the device counts of a host."""
+        return self._host_device_counts.get(host_id)
+
+    def get_site_device_counts(self, site_id: str) -> DeviceCounts | None:
+        """Return the device counts of a site."""
+        return self._site_device_counts.get(site_id)
 
-        latest_period = periods[0]
-        return latest_period.get("data", {})
\ No newline at end of file
+    def get_site_aggregates(self, site_id: str) -> SiteAggregates | None:
+        """Return the rolling window statistics of a site's metrics."""
+        return self._aggregates.get(site_id)
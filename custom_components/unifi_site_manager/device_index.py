@@ -0,0 +1,154 @@
+"""Multi-key device index for UniFi Site Manager.
+
+Devices are indexed by host, model, product line, status and firmware
+status, plus host/status and host/firmware status pairs, so that the
+devices of a host or site and their aggregate counts are set lookups
+instead of scans over every device. Sites map to devices through the host
+that runs them. Devices do not name their site, so a site whose host runs
+other sites as well has no device counts of its own.
+
+The index is kept in line with the devices of each refresh incrementally:
+only devices that appeared, disappeared or changed an indexed field move
+between buckets.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .models import Device
+
+DEVICE_STATUS_ONLINE = "online"
+FIRMWARE_UP_TO_DATE = "upToDate"
+
+INDEX_HOST = "host"
+INDEX_MODEL = "model"
+INDEX_PRODUCT_LINE = "product_line"
+INDEX_STATUS = "status"
+INDEX_FIRMWARE_STATUS = "firmware_status"
+INDEX_HOST_STATUS = "host_status"
+INDEX_HOST_FIRMWARE_STATUS = "host_firmware_status"
+
+_INDEXES: dict[str, Callable[[Device], Hashable]] = {
+    INDEX_HOST: lambda device: device.host_id,
+    INDEX_MODEL: lambda device: device.model,
+    INDEX_PRODUCT_LINE: lambda device: device.product_line,
+    INDEX_STATUS: lambda device: device.status,
+    INDEX_FIRMWARE_STATUS: lambda device: device.firmware_status,
+    INDEX_HOST_STATUS: lambda device: (device.host_id, device.status),
+    INDEX_HOST_FIRMWARE_STATUS: lambda device: (
+        device.host_id,
+        device.firmware_status,
+    ),
+}
+
+# Indexes summarized in diagnostics
+_SUMMARY_INDEXES = (
+    INDEX_MODEL,
+    INDEX_PRODUCT_LINE,
+    INDEX_STATUS,
+    INDEX_FIRMWARE_STATUS,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceCounts:
+    """Device counts of a host or site."""
+
+    total: int = 0
+    offline: int = 0
+    pending_update: int = 0
+
+
+class DeviceIndex:
+    """Devices keyed by MAC with secondary indexes on their attributes."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._devices: dict[str, Device] = {}
+        self._keys: dict[str, tuple[Hashable, ...]] = {}
+        self._index: dict[str, dict[Hashable, set[str]]] = {
+            name: {} for name in _INDEXES
+        }
+
+    def __len__(self) -> int:
+        """Return the number of indexed devices."""
+        return len(self._devices)
+
+    def _add(self, mac: str, keys: tuple[Hashable, ...]) -> None:
+        """Put a device in the buckets of its keys."""
+        self._keys[mac] = keys
+        for index, key in zip(self._index.values(), keys):
+            index.setdefault(key, set()).add(mac)
+
+    def _remove(self, mac: str) -> None:
+        """Take a device out of the buckets of its keys."""
+        for index, key in zip(self._index.values(), self._keys.pop(mac)):
+            bucket = index[key]
+            bucket.discard(mac)
+            if not bucket:
+                del index[key]
+
+    def update(self, devices: Mapping[str, Device]) -> int:
+        """Bring the index in line with the devices of a refresh.
+
+        Returns how many devices were added, removed or moved between
+        buckets.
+        """
+        moved = 0
+        for mac in self._devices.keys() - devices.keys():
+            self._remove(mac)
+            del self._devices[mac]
+            moved += 1
+
+        for mac, device in devices.items():
+            old = self._devices.get(mac)
+            self._devices[mac] = device
+            if old is device:
+                continue
+            keys = tuple(key_fn(device) for key_fn in _INDEXES.values())
+            if old is not None:
+                if self._keys[mac] == keys:
+                    continue
+                self._remove(mac)
+            self._add(mac, keys)
+            moved += 1
+        return moved
+
+    def count(self, index: str, key: Hashable) -> int:
+        """Return how many devices have a key in an index."""
+        return len(self._index[index].get(key, ()))
+
+    def devices(self, index: str, key: Hashable) -> list[Device]:
+        """Return the devices that have a key in an index."""
+        return [self._devices[mac] for mac in self._index[index].get(key, ())]
+
+    def host_counts(self, host_id: str | None) -> DeviceCounts:
+        """Return the device counts of a host."""
+        total = self.count(INDEX_HOST, host_id)
+        if not total:
+            return DeviceCounts()
+        online = self.count(INDEX_HOST_STATUS, (host_id, DEVICE_STATUS_ONLINE))
+        up_to_date = self.count(
+            INDEX_HOST_FIRMWARE_STATUS, (host_id, FIRMWARE_UP_TO_DATE)
+        )
+        # Devices without a firmware status are not counted as pending
+        unknown = self.count(INDEX_HOST_FIRMWARE_STATUS, (host_id, None))
+        return DeviceCounts(
+            total=total,
+            offline=total - online,
+            pending_update=total - up_to_date - unknown,
+        )
+
+    def summary(self) -> dict[str, Any]:
+        """Return the device counts per model, product line and status."""
+        return {
+            "devices": len(self._devices),
+            **{
+                index: {
+                    str(key): len(macs) for key, macs in self._index[index].items()
+                }
+                for index in _SUMMARY_INDEXES
+            },
+        }
@@ -9,6 +9,7 @@ from homeassistant.const import CONF_API_KEY
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
+from .hub import async_entry_objects, async_get_entry_hub, entry_site_ids
 
 TO_REDACT = {
     # Config entry fields
@@ -21,6 +22,7 @@ TO_REDACT = {
     "cpu.id",
     "hardwareId",
     "id",
+    "host_id",
     "ipAddress",
     "ipAddrs",
     "localId",
@@ -37,41 +39,78 @@ TO_REDACT = {
 }
 
 
+async def _async_get_raw_data(coordinator: Any) -> dict[str, Any]:
+    """Fetch the raw API payloads, which the coordinator does not keep."""
+    try:
+        return {
+            "sites": await coordinator.api.async_get_sites(),
+            "hosts": await coordinator.api.async_get_hosts(),
+            "devices": await coordinator.api.async_get_devices(
+                host_ids=list(coordinator.data.get("hosts", {}))
+            ),
+        }
+    except Exception as err:  # pylint: disable=broad-except
+        return {"error": str(err)}
+
+
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
+    raw_data = await _async_get_raw_data(coordinator)
 
     # Get basic diagnostic data
-    diagnostics_data = {
-        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
-        "coordinator_data": {
-            "sites": len(coordinator.data.get("sites", {})),
-            "hosts": len(coordinator.data.get("hosts", {})),
-            "metrics": len(coordinator.data.get("metrics", {})),
-            "last_update": coordinator.data.get("last_update"),
-            "last_update_success": coordinator.last_update_success,
-            "available": coordinator.available,
-        },
-        # Include redacted version of actual data for debugging
-        "data": async_redact_data(coordinator.data, TO_REDACT),
-    }
+    with coordinator.timed_section("redact_diagnostics"):
+        diagnostics_data = {
+            "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+            "coordinator_data": {
+                "sites": len(coordinator.data.get("sites", {})),
+                "hosts": len(coordinator.data.get("hosts", {})),
+                "devices": len(coordinator.data.get("devices", {})),
+                "metrics": len(coordinator.data.get("metrics", {})),
+                "last_update": coordinator.data.get("last_update"),
+                "last_update_success": coordinator.last_update_success,
+                "available": coordinator.available,
+                "fetched_at": {
+                    kind: coordinator.fetched_at(kind)
+                    for kind in ("sites", "hosts", "devices", "metrics")
+                },
+                "stale": [
+                    kind
+                    for kind in ("sites", "hosts", "devices", "metrics")
+                    if coordinator.is_stale(kind)
+                ],
+            },
+            # Include redacted version of actual data for debugging
+            "data": async_redact_data(
+                {
+                    kind: {
+                        object_id: record.as_dict()
+                        for object_id, record in coordinator.data.get(kind, {}).items()
+                    }
+                    for kind in ("sites", "hosts", "devices")
+                },
+                TO_REDACT,
+            ),
+            "raw_data": async_redact_data(raw_data, TO_REDACT),
+        }
 
     # Add site-specific metrics overview
     site_metrics = {}
-    for site_id, site_data in coordinator.data.get("sites", {}).items():
-        metrics = coordinator.get_site_metrics(site_id)
-        if metrics and metrics[0].get("data"):
-            wan_data = metrics[0]["data"].get("wan", {})
+    for site_id in coordinator.data.get("sites", {}):
+        latest = coordinator.get_latest_metrics(site_id)
+        if latest and latest.has_wan:
             site_metrics[site_id] = {
                 "has_metrics": True,
+                "periods": len(coordinator.get_site_metrics(site_id)),
                 "metrics_overview": {
-                    "download_speed_mbps": wan_data.get("download_kbps", 0) / 1000,
-                    "upload_speed_mbps": wan_data.get("upload_kbps", 0) / 1000,
-                    "latency_avg_ms": wan_data.get("avgLatency"),
-                    "packet_loss_percent": wan_data.get("packetLoss"),
-                    "uptime_percent": wan_data.get("uptime"),
+                    "metric_time": latest.metric_time.isoformat(),
+                    "download_speed_mbps": (latest.download_kbps or 0) / 1000,
+                    "upload_speed_mbps": (latest.upload_kbps or 0) / 1000,
+                    "latency_avg_ms": latest.avg_latency,
+                    "packet_loss_percent": latest.packet_loss,
+                    "uptime_percent": latest.uptime,
                 },
             }
         else:
@@ -84,22 +123,55 @@ async def async_get_config_entry_diagnostics(
 
     # Add host status overview
     host_overview = {}
-    for host_id, host_data in coordinator.data.get("hosts", {}).items():
-        reported_state = host_data.get("reportedState", {})
+    for host_id, host in coordinator.data.get("hosts", {}).items():
         host_overview[host_id] = {
-            "type": host_data.get("type"),
-            "status": reported_state.get("state"),
-            "version": reported_state.get("version"),
+            "type": host.type,
+            "status": host.state,
+            "version": host.version,
             "controllers": [
                 {
-                    "name": controller.get("name"),
-                    "state": controller.get("state"),
-                    "status": controller.get("status"),
+                    "name": controller.name,
+                    "state": controller.state,
+                    "status": controller.status,
                 }
-                for controller in reported_state.get("controllers", [])
+                for controller in host.controllers
             ],
         }
     
     diagnostics_data["host_overview"] = host_overview
 
-    return diagnostics_data
\ No newline at end of file
+    instrumentation = coordinator.api.instrumentation
+    diagnostics_data["instrumentation"] = {
+        "enabled": instrumentation is not None,
+        "rate_limit_remaining": coordinator.api.rate_limit_remaining,
+        "decode": coordinator.api.decode_stats,
+        **(instrumentation.as_dict() if instrumentation is not None else {}),
+    }
+
+    hub = async_get_entry_hub(hass, entry)
+    site_ids = entry_site_ids(entry)
+    diagnostics_data["hub"] = {
+        "shared_by_entries": len(hub.entry_ids) if hub else 1,
+        "owner": hub is None or hub.owner.entry_id == entry.entry_id,
+        "site_filter": sorted(site_ids) if site_ids is not None else None,
+        "visible": {
+            kind: len(async_entry_objects(coordinator, entry, kind))
+            for kind in ("sites", "hosts", "devices")
+        },
+    }
+
+    diagnostics_data["device_index"] = coordinator.device_index.summary()
+
+    statistics = coordinator.statistics
+    diagnostics_data["statistics_import"] = {
+        "enabled": statistics is not None,
+        **(statistics.as_dict() if statistics is not None else {}),
+    }
+
+    watchdog = coordinator.watchdog
+    diagnostics_data["loop_watchdog"] = {
+        "enabled": watchdog is not None,
+        **(watchdog.as_dict() if watchdog is not None else {}),
+    }
+
+    return diagnostics_data
@@ -0,0 +1,160 @@
+"""Incremental entity discovery for UniFi Site Manager.
+
+New objects are built and handed to the platform in chunks of entities,
+yielding to the event loop between chunks, so that setting up a large
+fleet does not hold the loop for the whole build and registration.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Sequence
+from datetime import datetime
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DISCOVERY_REMOVAL_GRACE, DOMAIN, ENTITY_ADD_CHUNK_SIZE
+from .coordinator import UnifiSiteManagerDataUpdateCoordinator
+from .hub import async_entry_objects
+
+_LOGGER = logging.getLogger(__name__)
+
+EntityBuilder = Callable[[str], Sequence[Entity]]
+
+
+async def async_setup_entity_discovery(
+    coordinator: UnifiSiteManagerDataUpdateCoordinator,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    builders: dict[str, EntityBuilder],
+) -> None:
+    """Add entities for new objects and retire entities of removed ones.
+
+    builders maps a coordinator data class ("sites", "hosts", "devices") to a
+    function building the entities for one object ID. The ID sets are
+    diffed after every refresh, so only new objects are built. An object
+    that returned no entities is offered again on the next refresh, since it
+    may not have the data it needs yet. Only the objects of the sites the
+    entry is limited to are considered. An object is retired once it was
+    missing from DISCOVERY_REMOVAL_GRACE fetches of its data class.
+
+    The objects present at setup are added before returning, later ones in
+    a background task of the entry.
+    """
+    known: dict[str, dict[str, Sequence[Entity]]] = {kind: {} for kind in builders}
+    missing: dict[tuple[str, str], int] = {}
+    # Objects waiting to be built by a running discovery
+    pending: set[tuple[str, str]] = set()
+    # Fetch time of each data class when absent objects were last counted
+    counted_fetch: dict[str, datetime | None] = {}
+
+    @callback
+    def _async_retire(kind: str, object_id: str) -> None:
+        """Remove the entities and registry devices of a removed object."""
+        hass = coordinator.hass
+        entity_registry = er.async_get(hass)
+        device_registry = dr.async_get(hass)
+
+        for entity in known[kind].pop(object_id):
+            if entity.hass is None:
+                continue
+            if entity.registry_entry:
+                entity_registry.async_remove(entity.entity_id)
+            else:
+                hass.async_create_task(entity.async_remove(force_remove=True))
+
+            if entity.device_info and (
+                device := device_registry.async_get_device(
+                    identifiers=entity.device_info.get("identifiers", set())
+                )
+            ):
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry.entry_id
+                )
+
+        _LOGGER.debug("Retired entities of removed %s %s", kind, object_id)
+
+    @callback
+    def _async_diff() -> list[tuple[str, str]]:
+        """Diff the object IDs against the known entities.
+
+        Retires objects gone for long enough and returns the new ones.
+        """
+        new_objects: list[tuple[str, str]] = []
+
+        for kind in builders:
+            current = async_entry_objects(coordinator, entry, kind)
+            tracked = known[kind]
+
+            for object_id in current.keys() - tracked.keys():
+                missing.pop((kind, object_id), None)
+                if (kind, object_id) not in pending:
+                    new_objects.append((kind, object_id))
+
+            # Only retire objects that stayed absent across successful
+            # fetches of their data class, so a truncated response does not
+            # wipe entities. Updates where the class was not fetched again
+            # do not count.
+            fetched_at = coordinator.fetched_at(kind)
+            if (
+                not coordinator.last_update_success
+                or fetched_at is None
+                or fetched_at == counted_fetch.get(kind)
+            ):
+                continue
+            counted_fetch[kind] = fetched_at
+            for object_id in tracked.keys() - current.keys():
+                key = (kind, object_id)
+                missing[key] = missing.get(key, 0) + 1
+                if missing[key] >= DISCOVERY_REMOVAL_GRACE:
+                    del missing[key]
+                    _async_retire(kind, object_id)
+            for key in [key for key in missing if key[0] == kind]:
+                if key[1] in current:
+                    del missing[key]
+
+        pending.update(new_objects)
+        return new_objects
+
+    async def _async_add(new_objects: list[tuple[str, str]]) -> None:
+        """Build and add the entities of new objects a chunk at a time."""
+        chunk: list[Entity] = []
+        added = 0
+        try:
+            for kind, object_id in new_objects:
+                pending.discard((kind, object_id))
+                # Skip objects that went away while earlier chunks were added
+                if object_id not in async_entry_objects(coordinator, entry, kind):
+                    continue
+                if entities := builders[kind](object_id):
+                    known[kind][object_id] = entities
+                    chunk.extend(entities)
+                if len(chunk) >= ENTITY_ADD_CHUNK_SIZE:
+                    async_add_entities(chunk)
+                    added += len(chunk)
+                    chunk = []
+                    await asyncio.sleep(0)
+        finally:
+            pending.difference_update(new_objects)
+            if chunk:
+                async_add_entities(chunk)
+                added += len(chunk)
+        if added:
+            _LOGGER.debug("Added %s discovered entities", added)
+
+    @callback
+    def _async_discover() -> None:
+        """Add the entities of objects that appeared since the last update."""
+        if new_objects := _async_diff():
+            entry.async_create_background_task(
+                coordinator.hass,
+                _async_add(new_objects),
+                f"{DOMAIN} entity discovery",
+            )
+
+    await _async_add(_async_diff())
+    entry.async_on_unload(coordinator.async_add_listener(_async_discover))
@@ -9,11 +9,63 @@ from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, MANUFACTURER
+from .const import ATTR_FETCHED_AT, ATTR_STALE, DOMAIN, MANUFACTURER
+from .aggregation import SiteAggregates
 from .coordinator import UnifiSiteManagerDataUpdateCoordinator
+from .device_index import DeviceCounts
+from .models import Device, Host, IspPeriod, Site
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def site_device_info(
+    coordinator: UnifiSiteManagerDataUpdateCoordinator, site_id: str
+) -> DeviceInfo:
+    """Return the device info shared by the entities of a site."""
+    site_data = coordinator.get_site(site_id)
+    name = site_data.name if site_data else site_id
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"site_{site_id}")},
+        name=f"UniFi Site {name}",
+        manufacturer=MANUFACTURER,
+        model="UniFi Site Manager",
+        sw_version=coordinator.data.get("version"),
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+
+def host_device_info(
+    coordinator: UnifiSiteManagerDataUpdateCoordinator, host_id: str
+) -> DeviceInfo:
+    """Return the device info shared by the entities of a host."""
+    host_data = coordinator.get_host(host_id)
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"host_{host_id}")},
+        name=(host_data and host_data.name) or f"UniFi Host {host_id}",
+        manufacturer=MANUFACTURER,
+        model=(host_data and host_data.type) or "Unknown",
+        sw_version=host_data.version if host_data else None,
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+
+def device_device_info(
+    coordinator: UnifiSiteManagerDataUpdateCoordinator, device_id: str
+) -> DeviceInfo:
+    """Return the device info shared by the entities of a device."""
+    device_data = coordinator.get_device(device_id)
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"device_{device_id}")},
+        name=device_data.name if device_data else device_id,
+        manufacturer=MANUFACTURER,
+        model=(device_data and device_data.model) or "Unknown",
+        sw_version=device_data.version if device_data else None,
+        hw_version=device_data.hardware_version if device_data else None,
+        suggested_area=device_data.location if device_data else None,
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+
 class UnifiSiteManagerEntity(CoordinatorEntity[UnifiSiteManagerDataUpdateCoordinator]):
     """Base entity for UniFi Site Manager integration."""
 
@@ -26,114 +78,182 @@ class UnifiSiteManagerEntity(CoordinatorEntity[UnifiSiteManagerDataUpdateCoordin
         site_id: str | None = None,
         host_id: str | None = None,
         device_id: str | None = None,  # Add device_id parameter
+        device_info: DeviceInfo | None = None,
+        entry_id: str | None = None,
     ) -> None:
-        """Initialize the entity."""
+        """Initialize the entity.
+
+        device_info is the device info of the site, host or device, built
+        once by the platform and shared by all of its entities. It is built
+        here when not given.
+
+        entry_id prefixes the unique ID, since entries sharing an API key
+        can show the same site, host or device.
+        """
         super().__init__(coordinator)
         self.entity_description = description
         self._site_id = site_id
         self._host_id = host_id
         self._device_id = device_id  # Store device_id
+        self._last_update_success = coordinator.last_update_success
+        self._stale = False
 
         # Create a single device identifier for all entities
         if site_id:
-            site_data = coordinator.get_site(site_id)
-            _LOGGER.debug("Creating entity for site %s with data: %s", site_id, site_data)
-            name = site_data.get("meta", {}).get("name", site_id)
-            
-            self._attr_unique_id = f"{site_id}_{description.key}"
-            self._attr_device_info = DeviceInfo(
-                identifiers={(DOMAIN, f"site_{site_id}")},
-                name=f"UniFi Site {name}",
-                manufacturer=MANUFACTURER,
-                model="UniFi Site Manager",
-                sw_version=coordinator.data.get("version"),
-                entry_type=DeviceEntryType.SERVICE,
+            self._attr_unique_id = f"{entry_id}_{site_id}_{description.key}"
+            self._attr_device_info = device_info or site_device_info(
+                coordinator, site_id
+            )
+        elif host_id:
+            self._attr_unique_id = f"{entry_id}_{host_id}_{description.key}"
+            self._attr_device_info = device_info or host_device_info(
+                coordinator, host_id
             )
         # Add device info creation for device entities
         elif device_id:
-            device_data = coordinator.get_device(device_id)
-            _LOGGER.debug("Creating entity for device %s with data: %s", device_id, device_data)
-            
-            self._attr_unique_id = f"{device_id}_{description.key}"
-            self._attr_device_info = DeviceInfo(
-                identifiers={(DOMAIN, f"device_{device_id}")},
-                name=device_data.get("name", device_id),
-                manufacturer=MANUFACTURER,
-                model=device_data.get("model", "Unknown"),
-                sw_version=device_data.get("version"),
-                hw_version=device_data.get("hardwareVersion"),
-                suggested_area=device_data.get("location"),
-                entry_type=DeviceEntryType.SERVICE,
+            self._attr_unique_id = f"{entry_id}_{device_id}_{description.key}"
+            self._attr_device_info = device_info or device_device_info(
+                coordinator, device_id
             )
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         if self._site_id:
-            site_data = self.coordinator.get_site(self._site_id)
-            if not site_data:
-                self._attr_available = False
-                self.async_write_ha_state()
-                return
+            available = self.coordinator.get_site(self._site_id) is not None
         elif self._host_id:
-            host_data = self.coordinator.get_host(self._host_id)
-            if not host_data:
-                self._attr_available = False
-                self.async_write_ha_state()
-                return
+            available = self.coordinator.get_host(self._host_id) is not None
         elif self._device_id:  # Add device data check
-            device_data = self.coordinator.get_device(self._device_id)
-            if not device_data:
-                self._attr_available = False
-                self.async_write_ha_state()
-                return
+            available = self.coordinator.get_device(self._device_id) is not None
+        else:
+            available = True
 
-        self._attr_available = True
+        last_update_success = self.coordinator.last_update_success
+        stale = self.stale
+
+        # Skip the state write when nothing this entity shows has changed
+        if (
+            available == self._attr_available
+            and last_update_success == self._last_update_success
+            and stale == self._stale
+            and not self._data_changed()
+        ):
+            return
+
+        self._last_update_success = last_update_success
+        self._stale = stale
+        self._attr_available = available
         self.async_write_ha_state()
 
+    def _data_kinds(self) -> tuple[str, ...]:
+        """Return the coordinator data classes this entity reads."""
+        if self._site_id:
+            return ("sites", "metrics")
+        if self._host_id:
+            return ("hosts",)
+        if self._device_id:
+            return ("devices",)
+        return ()
+
+    @property
+    def stale(self) -> bool:
+        """Return if the entity shows data kept from before a failed refresh."""
+        return any(self.coordinator.is_stale(kind) for kind in self._data_kinds())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag stale data and when it was fetched."""
+        if not self.stale:
+            return None
+        fetched_at = [
+            fetched
+            for kind in self._data_kinds()
+            if (fetched := self.coordinator.fetched_at(kind)) is not None
+        ]
+        return {
+            ATTR_STALE: True,
+            ATTR_FETCHED_AT: min(fetched_at).isoformat() if fetched_at else None,
+        }
+
+    def _data_changed(self) -> bool:
+        """Return if the coordinator data behind this entity changed."""
+        if self._site_id:
+            return any(
+                self.coordinator.has_changed(kind, self._site_id)
+                for kind in ("sites", "metrics", "aggregates", "site_devices")
+            )
+        if self._host_id:
+            return self.coordinator.has_changed(
+                "hosts", self._host_id
+            ) or self.coordinator.has_changed("host_devices", self._host_id)
+        if self._device_id:
+            return self.coordinator.has_changed("devices", self._device_id)
+        return True
+
     @property
-    def site_data(self) -> dict[str, Any] | None:
+    def site_data(self) -> Site | None:
         """Get site data."""
         if not self._site_id:
             return None
         return self.coordinator.get_site(self._site_id)
 
     @property
-    def host_data(self) -> dict[str, Any] | None:
+    def host_data(self) -> Host | None:
         """Get host data."""
         if not self._host_id:
             return None
         return self.coordinator.get_host(self._host_id)
 
     @property
-    def device_data(self) -> dict[str, Any] | None:
+    def device_data(self) -> Device | None:
         """Get device data."""
         if not self._device_id:
             return None
         return self.coordinator.get_device(self._device_id)
 
     @property
-    def site_metrics(self) -> dict[str, Any] | None:
-        """Get site metrics."""
+    def site_metrics(self) -> IspPeriod | None:
+        """Get the most recent metrics period of the site."""
         if not self._site_id:
             return None
-                
-        metrics = self.coordinator.get_site_metrics(self._site_id)
-        if not metrics or not isinstance(metrics, list) or not metrics:
-            return None
-                
-        # Get first metric set
-        metric_set = metrics[0]  # Get first metric result
-        if not metric_set.get("periods"):
-            return None
-                
-        periods = metric_set["periods"]
-        if not periods:
+        return self.coordinator.get_latest_metrics(self._site_id)
+
+    @property
+    def device_counts(self) -> DeviceCounts | None:
+        """Get the device counts of the site or host."""
+        if self._site_id:
+            return self.coordinator.get_site_device_counts(self._site_id)
+        if self._host_id:
+            return self.coordinator.get_host_device_counts(self._host_id)
+        return None
+
+    @property
+    def site_aggregates(self) -> SiteAggregates | None:
+        """Get the rolling window statistics of the site."""
+        if not self._site_id:
             return None
-                
-        # Get most recent period data
-        latest_period = periods[0]
-        return latest_period.get("data", {})
+        return self.coordinator.get_site_aggregates(self._site_id)
+
+
+class UnifiSiteManagerHubEntity(UnifiSiteManagerEntity):
+    """Base entity describing the integration itself rather than a site or device."""
+
+    def __init__(
+        self,
+        coordinator: UnifiSiteManagerDataUpdateCoordinator,
+        description: EntityDescription,
+        entry_id: str,
+    ) -> None:
+        """Initialize the hub entity of a config entry."""
+        super().__init__(coordinator, description)
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"hub_{entry_id}")},
+            name="UniFi Site Manager",
+            manufacturer=MANUFACTURER,
+            model="UniFi Site Manager API",
+            entry_type=DeviceEntryType.SERVICE,
+        )
 
 
 class UnifiSiteManagerSiteEntity(UnifiSiteManagerEntity):
@@ -144,9 +264,17 @@ class UnifiSiteManagerSiteEntity(UnifiSiteManagerEntity):
         coordinator: UnifiSiteManagerDataUpdateCoordinator,
         description: EntityDescription,
         site_id: str,
+        entry_id: str,
+        device_info: DeviceInfo | None = None,
     ) -> None:
         """Initialize the site entity."""
-        super().__init__(coordinator, description, site_id=site_id)
+        super().__init__(
+            coordinator,
+            description,
+            site_id=site_id,
+            device_info=device_info,
+            entry_id=entry_id,
+        )
 
 
 class UnifiSiteManagerHostEntity(UnifiSiteManagerEntity):
@@ -157,9 +285,17 @@ class UnifiSiteManagerHostEntity(UnifiSiteManagerEntity):
         coordinator: UnifiSiteManagerDataUpdateCoordinator,
         description: EntityDescription,
         host_id: str,
+        entry_id: str,
+        device_info: DeviceInfo | None = None,
     ) -> None:
         """Initialize the host entity."""
-        super().__init__(coordinator, description, host_id=host_id)
+        super().__init__(
+            coordinator,
+            description,
+            host_id=host_id,
+            device_info=device_info,
+            entry_id=entry_id,
+        )
 
 
 class UnifiSiteManagerDeviceEntity(UnifiSiteManagerEntity):
@@ -170,6 +306,14 @@ class UnifiSiteManagerDeviceEntity(UnifiSiteManagerEntity):
         coordinator: UnifiSiteManagerDataUpdateCoordinator,
         description: EntityDescription,
         device_id: str,
+        entry_id: str,
+        device_info: DeviceInfo | None = None,
     ) -> None:
         """Initialize the device entity."""
-        super().__init__(coordinator, description, device_id=device_id)
\ No newline at end of file
+        super().__init__(
+            coordinator,
+            description,
+            device_id=device_id,
+            device_info=device_info,
+            entry_id=entry_id,
+        )
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""Long-term statistics import of hourly ISP metrics for UniFi Site Manager.
+
+Instead of leaving WAN history to the recorder sampling sensor states, the
+hourly ISP metrics of every site are imported as external statistics, one
+series per site and metric (``unifi_site_manager:<site>_download``). Each
+hour takes its mean from the 1h period reported by the API and its min/max
+from the 5m periods of that hour while they are still buffered; older hours
+fall back to the 1h period alone, with the reported maximum latency as the
+latency max.
+
+Hours are imported once. The newest imported hour of a site is read back
+from the recorder the first time the site is seen and tracked from then on,
+so each fetch only adds the hours that closed since the last one. A site
+the API returned no hours for counts as checked up to the last closed hour,
+so a site without ISP data does not force a backfill of every site.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+from statistics import fmean
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import PERCENTAGE, UnitOfDataRate, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, HISTORY_BUCKET, KBPS_TO_MBPS
+from .models import IspPeriod
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _mbps(kbps: float | None) -> float | None:
+    """Convert a rate in kbps to Mbps."""
+    return kbps / KBPS_TO_MBPS if kbps is not None else None
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryMetric:
+    """A WAN metric imported as an hourly statistic."""
+
+    key: str
+    name: str
+    unit: str
+    value_fn: Callable[[IspPeriod], float | None]
+    # Highest value within a period, for metrics the API reports one of
+    peak_fn: Callable[[IspPeriod], float | None] = lambda period: None
+
+
+HISTORY_METRICS: tuple[HistoryMetric, ...] = (
+    HistoryMetric(
+        key="download",
+        name="ISP download speed",
+        unit=UnitOfDataRate.MEGABITS_PER_SECOND,
+        value_fn=lambda period: _mbps(period.download_kbps),
+    ),
+    HistoryMetric(
+        key="upload",
+        name="ISP upload speed",
+        unit=UnitOfDataRate.MEGABITS_PER_SECOND,
+        value_fn=lambda period: _mbps(period.upload_kbps),
+    ),
+    HistoryMetric(
+        key="latency",
+        name="ISP latency",
+        unit=UnitOfTime.MILLISECONDS,
+        value_fn=lambda period: period.avg_latency,
+        peak_fn=lambda period: period.max_latency,
+    ),
+    HistoryMetric(
+        key="packet_loss",
+        name="ISP packet loss",
+        unit=PERCENTAGE,
+        value_fn=lambda period: period.packet_loss,
+    ),
+)
+
+
+def statistic_id(site_id: str, metric: str) -> str:
+    """Return the external statistic ID of a site metric."""
+    return f"{DOMAIN}:{slugify(site_id)}_{metric}"
+
+
+def _hour(moment: datetime) -> datetime:
+    """Return the start of the hour a moment falls in."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _statistic(
+    metric: HistoryMetric,
+    start: datetime,
+    period: IspPeriod,
+    samples: Iterable[IspPeriod],
+) -> StatisticData | None:
+    """Return the statistic of one hour, None if the hour has no value."""
+    values = [
+        value for sample in samples if (value := metric.value_fn(sample)) is not None
+    ]
+    mean = metric.value_fn(period)
+    if mean is None:
+        if not values:
+            return None
+        mean = fmean(values)
+    peaks = [
+        value
+        for sample in (period, *samples)
+        if (value := metric.peak_fn(sample)) is not None
+    ]
+    return StatisticData(
+        start=start,
+        mean=mean,
+        min=min(mean, *values),
+        max=max(mean, *values, *peaks),
+    )
+
+
+class IspStatisticsImporter:
+    """Import closed hours of ISP metrics into long-term statistics, once each."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        # Start of the newest imported or checked hour of each site, None
+        # until the site has been through a backfill
+        self._imported: dict[str, datetime | None] = {}
+        self.imported_hours = 0
+        self.last_import: datetime | None = None
+
+    async def _async_last_imported(self, site_id: str) -> datetime | None:
+        """Return the start of the newest hour the recorder holds for a site."""
+        # Every metric of an hour is imported together, one series will do
+        stat_id = statistic_id(site_id, HISTORY_METRICS[0].key)
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, stat_id, False, {"mean"}
+        )
+        if rows := last.get(stat_id):
+            return dt_util.utc_from_timestamp(rows[0]["start"])
+        return None
+
+    async def async_resume_time(self, site_ids: Iterable[str]) -> datetime | None:
+        """Return where the next fetch can start, None if a site needs a backfill."""
+        site_ids = set(site_ids)
+        # Forget sites that no longer exist
+        for site_id in set(self._imported) - site_ids:
+            del self._imported[site_id]
+        for site_id in site_ids - set(self._imported):
+            self._imported[site_id] = await self._async_last_imported(site_id)
+
+        starts = list(self._imported.values())
+        if not starts or None in starts:
+            return None
+        return min(start for start in starts if start is not None) + HISTORY_BUCKET
+
+    @callback
+    def async_import(
+        self,
+        site_id: str,
+        site_name: str,
+        hourly: Iterable[IspPeriod],
+        recent: Iterable[IspPeriod],
+        now: datetime,
+    ) -> int:
+        """Import the closed hours of a site not imported yet, returning how many.
+
+        hourly holds the site's 1h periods, recent its buffered 5m periods.
+        Called for every site of a fetch, including those it returned no
+        periods for.
+        """
+        last = self._imported.get(site_id)
+        hours: dict[datetime, IspPeriod] = {}
+        for period in hourly:
+            start = _hour(period.metric_time)
+            if start + HISTORY_BUCKET > now or (last is not None and start <= last):
+                continue
+            hours[start] = period
+        if not hours:
+            if last is None:
+                # Nothing to backfill, resume from the last closed hour
+                self._imported[site_id] = _hour(now) - HISTORY_BUCKET
+            return 0
+
+        samples: dict[datetime, list[IspPeriod]] = {}
+        for period in recent:
+            if (start := _hour(period.metric_time)) in hours:
+                samples.setdefault(start, []).append(period)
+
+        starts = sorted(hours)
+        for metric in HISTORY_METRICS:
+            statistics = [
+                data
+                for start in starts
+                if (
+                    data := _statistic(
+                        metric, start, hours[start], samples.get(start, ())
+                    )
+                )
+                is not None
+            ]
+            if not statistics:
+                continue
+            async_add_external_statistics(
+                self.hass,
+                StatisticMetaData(
+                    has_mean=True,
+                    has_sum=False,
+                    name=f"{site_name} {metric.name}",
+                    source=DOMAIN,
+                    statistic_id=statistic_id(site_id, metric.key),
+                    unit_of_measurement=metric.unit,
+                ),
+                statistics,
+            )
+
+        self._imported[site_id] = starts[-1]
+        self.imported_hours += len(starts)
+        self.last_import = now
+        return len(starts)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the importer state for diagnostics."""
+        imported = [start for start in self._imported.values() if start is not None]
+        return {
+            "sites": len(self._imported),
+            "sites_awaiting_backfill": len(self._imported) - len(imported),
+            "imported_hours": self.imported_hours,
+            "last_import": self.last_import,
+            "resume_from": min(imported, default=None),
+        }
@@ -0,0 +1,217 @@
+"""Shared API clients and coordinators for UniFi Site Manager config entries.
+
+Config entries using the same API key share one hub: a single API client
+(with its rate limit state, request scheduler and response cache) and a
+single coordinator. Hubs are kept in hass.data[DOMAIN] keyed by a hash of
+the key and reference counted, so the hub is torn down when the last entry
+using it unloads. Each entry can then narrow its own view to a subset of
+the account's sites.
+
+The entry that created a hub owns it: its options drive polling,
+instrumentation and the loop watchdog. When the owner unloads while other
+entries still use the hub, ownership passes to one of them until the
+owner is set up again, as it is on a reload.
+
+Each entry releases the hub it was set up with, even when reauth has since
+changed the API key in its data.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+import hashlib
+import logging
+from typing import Any
+from uuid import uuid4
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant, callback
+
+from .api import UnifiSiteManagerAPI
+from .const import (
+    CONF_INSTRUMENTATION,
+    CONF_SITES,
+    DATA_ENTRY_HUBS,
+    DATA_HUBS,
+    DEFAULT_API_HOST,
+    DEFAULT_INSTRUMENTATION,
+    DOMAIN,
+)
+from .coordinator import UnifiSiteManagerDataUpdateCoordinator
+from .instrumentation import Instrumentation
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def hub_key(api_key: str) -> str:
+    """Return the registry key of an API key, without keeping the key itself."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def new_entry_unique_id(api_key: str) -> str:
+    """Return a unique ID for a new config entry of an API key.
+
+    Several entries can share a key, so the key's hash gets a random suffix.
+    """
+    return f"{hub_key(api_key)}_{uuid4().hex[:8]}"
+
+
+@dataclass
+class UnifiSiteManagerHub:
+    """An API client and coordinator shared by the entries of one account."""
+
+    key: str
+    api: UnifiSiteManagerAPI
+    coordinator: UnifiSiteManagerDataUpdateCoordinator
+    entry_ids: set[str] = field(default_factory=set)
+    # Held while an entry loads the first data, so others wait for it
+    setup_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    ready: bool = False
+    # Owner that handed the hub over while reloading, it takes it back
+    # when it is set up again
+    released_owner_id: str | None = None
+
+    @property
+    def owner(self) -> ConfigEntry:
+        """Return the entry whose options drive the hub."""
+        return self.coordinator.config_entry
+
+
+def _instrumentation(entry: ConfigEntry) -> Instrumentation | None:
+    """Return a collector if the entry enables instrumentation."""
+    if entry.options.get(CONF_INSTRUMENTATION, DEFAULT_INSTRUMENTATION):
+        return Instrumentation()
+    return None
+
+
+@callback
+def async_apply_owner(hub: UnifiSiteManagerHub, entry: ConfigEntry) -> None:
+    """Make an entry the owner of a hub and apply its options."""
+    enabled = entry.options.get(CONF_INSTRUMENTATION, DEFAULT_INSTRUMENTATION)
+    if enabled != (hub.api.instrumentation is not None):
+        hub.api.instrumentation = _instrumentation(entry)
+    hub.coordinator.async_apply_entry(entry)
+
+
+@callback
+def async_acquire_hub(hass: HomeAssistant, entry: ConfigEntry) -> UnifiSiteManagerHub:
+    """Return the hub of an entry's API key, creating it on first use."""
+    hubs: dict[str, UnifiSiteManagerHub] = hass.data[DOMAIN].setdefault(
+        DATA_HUBS, {}
+    )
+    key = hub_key(entry.data[CONF_API_KEY])
+    # Unload releases the hub the entry was set up with, as reauth changes
+    # the key in the entry data before reloading
+    hass.data[DOMAIN].setdefault(DATA_ENTRY_HUBS, {})[entry.entry_id] = key
+
+    if (hub := hubs.get(key)) is None:
+        api = UnifiSiteManagerAPI(
+            hass=hass,
+            api_key=entry.data[CONF_API_KEY],
+            host=DEFAULT_API_HOST,
+            instrumentation=_instrumentation(entry),
+        )
+        hub = hubs[key] = UnifiSiteManagerHub(
+            key=key,
+            api=api,
+            coordinator=UnifiSiteManagerDataUpdateCoordinator(
+                hass=hass,
+                api=api,
+                entry=entry,
+            ),
+        )
+    elif entry.entry_id in (hub.owner.entry_id, hub.released_owner_id):
+        # The owner reloaded, for example after an options change
+        async_apply_owner(hub, entry)
+        hub.released_owner_id = None
+
+    hub.entry_ids.add(entry.entry_id)
+    _LOGGER.debug(
+        "Entry %s uses hub %s shared by %s entries",
+        entry.entry_id,
+        key[:8],
+        len(hub.entry_ids),
+    )
+    return hub
+
+
+async def async_release_hub(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Drop an entry's reference to its hub, returning if the hub was torn down."""
+    hubs: dict[str, UnifiSiteManagerHub] = hass.data[DOMAIN].get(DATA_HUBS, {})
+    key = hass.data[DOMAIN].get(DATA_ENTRY_HUBS, {}).pop(entry.entry_id, None)
+    if key is None or (hub := hubs.get(key)) is None:
+        return False
+
+    hub.entry_ids.discard(entry.entry_id)
+    if hub.entry_ids:
+        if hub.owner.entry_id == entry.entry_id:
+            new_owner = hass.config_entries.async_get_entry(
+                next(iter(hub.entry_ids))
+            )
+            if new_owner is not None:
+                async_apply_owner(hub, new_owner)
+                hub.released_owner_id = entry.entry_id
+        return False
+
+    del hubs[key]
+    await hub.coordinator.async_shutdown()
+    _LOGGER.debug("Removed hub %s", key[:8])
+    return True
+
+
+@callback
+def async_get_entry_hub(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> UnifiSiteManagerHub | None:
+    """Return the hub an entry was set up with, None if it is not loaded."""
+    key = hass.data[DOMAIN].get(DATA_ENTRY_HUBS, {}).get(entry.entry_id)
+    if key is None:
+        return None
+    return hass.data[DOMAIN].get(DATA_HUBS, {}).get(key)
+
+
+def entry_site_ids(entry: ConfigEntry) -> frozenset[str] | None:
+    """Return the sites an entry is limited to, None for all sites."""
+    if sites := entry.options.get(CONF_SITES):
+        return frozenset(sites)
+    return None
+
+
+@callback
+def async_entry_objects(
+    coordinator: UnifiSiteManagerDataUpdateCoordinator,
+    entry: ConfigEntry,
+    kind: str,
+) -> Mapping[str, Any]:
+    """Return the sites, hosts, devices or metrics visible to an entry.
+
+    Hosts are kept when they run one of the selected sites, and devices
+    when their host is kept.
+    """
+    objects: Mapping[str, Any] = coordinator.data.get(kind, {})
+    if (site_ids := entry_site_ids(entry)) is None:
+        return objects
+
+    if kind in ("sites", "metrics"):
+        return {
+            object_id: obj
+            for object_id, obj in objects.items()
+            if object_id in site_ids
+        }
+
+    host_ids = {
+        site.host_id
+        for site_id, site in coordinator.data.get("sites", {}).items()
+        if site_id in site_ids
+    }
+    if kind == "hosts":
+        return {
+            host_id: host for host_id, host in objects.items() if host_id in host_ids
+        }
+    return {
+        object_id: obj
+        for object_id, obj in objects.items()
+        if getattr(obj, "host_id", None) in host_ids
+    }
@@ -0,0 +1,176 @@
+"""Runtime instrumentation for the UniFi Site Manager integration.
+
+Instrumentation is opt-in. When it is disabled the API client and the
+coordinator hold None instead of an Instrumentation object and skip every
+measurement behind a single attribute check.
+"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import math
+from typing import Any
+
+from .const import INSTRUMENTATION_SAMPLES
+
+
+def percentile(samples: Iterable[float], quantile: float) -> float | None:
+    """Return the nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(quantile * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    """Counters and recent latency samples of one endpoint."""
+
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    bytes: int = 0
+    decode_time: float = 0.0
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=INSTRUMENTATION_SAMPLES)
+    )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters and latency percentiles in milliseconds."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "bytes": self.bytes,
+            "decode_time_ms": round(self.decode_time * 1000, 3),
+            "latency_ms": _latency_summary(self.latencies),
+        }
+
+
+def _latency_summary(samples: Iterable[float]) -> dict[str, float | None]:
+    """Return p50/p95/p99 of latency samples in milliseconds."""
+    ordered = sorted(samples)
+    summary: dict[str, float | None] = {}
+    for name, quantile in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        value = percentile(ordered, quantile)
+        summary[name] = round(value * 1000, 3) if value is not None else None
+    return summary
+
+
+class Instrumentation:
+    """Collect request and refresh statistics.
+
+    Counters are cumulative since setup. Latency and stage timings keep a
+    bounded window of recent samples, so percentiles follow the current
+    behaviour of the cloud API rather than its whole history.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the collector."""
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.stages: dict[str, deque[float]] = {}
+        self.last_stage_times: dict[str, float] = {}
+        self.last_refresh_time: float | None = None
+
+    def _endpoint(self, endpoint: str) -> EndpointStats:
+        """Return the stats of an endpoint, creating them on first use."""
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def record_request(
+        self, endpoint: str, latency: float, size: int, failed: bool = False
+    ) -> None:
+        """Record a completed request."""
+        stats = self._endpoint(endpoint)
+        stats.requests += 1
+        stats.bytes += size
+        stats.latencies.append(latency)
+        if failed:
+            stats.errors += 1
+
+    def record_decode(self, endpoint: str, seconds: float) -> None:
+        """Record the time spent decoding a response body."""
+        self._endpoint(endpoint).decode_time += seconds
+
+    def record_retry(self, endpoint: str) -> None:
+        """Record a retried request."""
+        self._endpoint(endpoint).retries += 1
+
+    def record_rate_limited(self, endpoint: str) -> None:
+        """Record a 429 response."""
+        self._endpoint(endpoint).rate_limited += 1
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        """Record how long a refresh stage took."""
+        samples = self.stages.get(stage)
+        if samples is None:
+            samples = self.stages[stage] = deque(maxlen=INSTRUMENTATION_SAMPLES)
+        samples.append(seconds)
+        self.last_stage_times[stage] = seconds
+
+    def record_refresh(self, seconds: float) -> None:
+        """Record how long a whole refresh cycle took."""
+        self.last_refresh_time = seconds
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests made."""
+        return sum(stats.requests for stats in self.endpoints.values())
+
+    @property
+    def retries(self) -> int:
+        """Return the number of retried requests."""
+        return sum(stats.retries for stats in self.endpoints.values())
+
+    @property
+    def rate_limited(self) -> int:
+        """Return the number of 429 responses."""
+        return sum(stats.rate_limited for stats in self.endpoints.values())
+
+    @property
+    def bytes(self) -> int:
+        """Return the number of response bytes received."""
+        return sum(stats.bytes for stats in self.endpoints.values())
+
+    def latency(self, quantile: float) -> float | None:
+        """Return a latency percentile across all endpoints, in milliseconds."""
+        value = percentile(
+            (
+                sample
+                for stats in self.endpoints.values()
+                for sample in stats.latencies
+            ),
+            quantile,
+        )
+        return round(value * 1000, 3) if value is not None else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every statistic in a JSON compatible form."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "bytes": self.bytes,
+            "endpoints": {
+                endpoint: stats.as_dict()
+                for endpoint, stats in self.endpoints.items()
+            },
+            "stages": {
+                stage: {
+                    "last_ms": round(self.last_stage_times[stage] * 1000, 3),
+                    **_latency_summary(samples),
+                }
+                for stage, samples in self.stages.items()
+            },
+            "last_refresh_ms": (
+                round(self.last_refresh_time * 1000, 3)
+                if self.last_refresh_time is not None
+                else None
+            ),
+        }
@@ -0,0 +1,69 @@
+"""ISP metrics buffering for UniFi Site Manager."""
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
+
+from .aggregation import empty_columns, period_row
+from .const import METRICS_BUFFER_SIZE
+from .models import IspPeriod
+
+
+class SiteMetricsBuffer:
+    """Bounded time-series of ISP metric periods for a single site.
+
+    Periods are kept oldest first in a ring buffer so that new periods are
+    appended in O(1) and the oldest ones fall off once the buffer is full.
+    The same periods are kept packed into float columns for the window
+    statistics, updated as periods are merged.
+    """
+
+    def __init__(self, maxlen: int = METRICS_BUFFER_SIZE) -> None:
+        """Initialize the buffer."""
+        self._maxlen = maxlen
+        self._times: deque[datetime] = deque(maxlen=maxlen)
+        self._periods: deque[IspPeriod] = deque(maxlen=maxlen)
+        self._columns = empty_columns()
+
+    def __len__(self) -> int:
+        """Return the number of buffered periods."""
+        return len(self._periods)
+
+    @property
+    def latest_time(self) -> datetime | None:
+        """Return the timestamp of the newest buffered period."""
+        return self._times[-1] if self._times else None
+
+    def merge(self, periods: Iterable[IspPeriod]) -> int:
+        """Merge periods by timestamp, returning how many were new."""
+        added = 0
+        for period in sorted(periods, key=lambda period: period.metric_time):
+            latest = self.latest_time
+            if latest is None or period.metric_time > latest:
+                self._times.append(period.metric_time)
+                self._periods.append(period)
+                for column, value in zip(self._columns.values(), period_row(period)):
+                    column.append(value)
+                    if len(column) > self._maxlen:
+                        del column[0]
+                added += 1
+            elif period.metric_time in self._times:
+                # Refresh a period the API reported again
+                index = self._times.index(period.metric_time)
+                self._periods[index] = period
+                for column, value in zip(self._columns.values(), period_row(period)):
+                    column[index] = value
+        return added
+
+    def columns(self) -> dict[str, array]:
+        """Return the buffered periods packed into columns, oldest first.
+
+        The columns are live and must not be modified.
+        """
+        return self._columns
+
+    def periods(self) -> list[IspPeriod]:
+        """Return the buffered periods, newest first."""
+        return list(reversed(self._periods))
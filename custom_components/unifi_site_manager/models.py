@@ -0,0 +1,257 @@
+"""Data models for the UniFi Site Manager integration.
+
+The API returns large nested payloads of which only a handful of fields are
+used. Each record below keeps just those fields in a slotted, frozen
+dataclass that is built once per refresh, so entities read plain attributes
+instead of walking nested dicts and the raw payloads can be dropped.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from functools import lru_cache
+import logging
+from typing import Any
+
+from .const import TIMESTAMP_CACHE_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _parse_iso(raw: str) -> datetime | None:
+    """Parse an ISO 8601 string into an aware datetime, cached per string."""
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError:
+        _LOGGER.debug("Invalid timestamp: %s", raw)
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def parse_timestamp(raw: Any) -> datetime | None:
+    """Parse an API timestamp.
+
+    The API sends the same few strings over and over (every device reports
+    the same adoption time on each poll, every site shares metric times), so
+    results are cached per raw string and unchanged values are not parsed
+    again.
+    """
+    if not raw:
+        return None
+    if isinstance(raw, datetime):
+        return raw
+    if not isinstance(raw, str):
+        return None
+    return _parse_iso(raw)
+
+
+class _Record:
+    """Serialization helpers shared by the records."""
+
+    __slots__ = ()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record as a JSON compatible dict."""
+        data = asdict(self)  # type: ignore[call-overload]
+        for key, value in data.items():
+            if isinstance(value, datetime):
+                data[key] = value.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Any:
+        """Rebuild a record from as_dict output, ignoring unknown keys."""
+        names = {field.name for field in fields(cls)}  # type: ignore[arg-type]
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+
+@dataclass(frozen=True, slots=True)
+class Site(_Record):
+    """A site and the statistics the entities use."""
+
+    site_id: str
+    host_id: str | None
+    name: str
+    total_devices: int | None
+    offline_devices: int
+    pending_update_devices: int
+    wan_uptime: float
+    has_statistics: bool
+
+    @classmethod
+    def from_api(cls, raw: dict[str, Any]) -> Site:
+        """Build a site from an /ea/sites item."""
+        statistics = raw.get("statistics") or {}
+        counts = statistics.get("counts") or {}
+        return cls(
+            site_id=raw["siteId"],
+            host_id=raw.get("hostId"),
+            name=(raw.get("meta") or {}).get("name", raw["siteId"]),
+            total_devices=counts.get("totalDevice"),
+            offline_devices=counts.get("offlineDevice", 0),
+            pending_update_devices=counts.get("pendingUpdateDevice", 0),
+            wan_uptime=(statistics.get("percentages") or {}).get("wanUptime", 0),
+            has_statistics="meta" in raw and "statistics" in raw,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Controller(_Record):
+    """An application controller running on a host."""
+
+    name: str | None
+    state: str | None
+    status: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class Host(_Record):
+    """A UniFi OS host and its reported state."""
+
+    host_id: str
+    type: str | None
+    state: str | None
+    version: str | None
+    controllers: tuple[Controller, ...]
+    name: str | None = None
+
+    @property
+    def is_connected(self) -> bool:
+        """Return if the host is connected to the cloud."""
+        return self.state == "connected"
+
+    def controller_active(self, name: str) -> bool:
+        """Return if a named controller is active."""
+        return any(
+            controller.name == name and controller.state == "active"
+            for controller in self.controllers
+        )
+
+    @classmethod
+    def from_api(cls, raw: dict[str, Any]) -> Host:
+        """Build a host from an /ea/hosts item."""
+        reported_state = raw.get("reportedState") or {}
+        return cls(
+            host_id=raw["id"],
+            type=raw.get("type"),
+            state=reported_state.get("state"),
+            version=reported_state.get("version"),
+            controllers=tuple(
+                Controller(
+                    name=controller.get("name"),
+                    state=controller.get("state"),
+                    status=controller.get("status"),
+                )
+                for controller in reported_state.get("controllers") or ()
+            ),
+            name=reported_state.get("name") or reported_state.get("hostname"),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Host:
+        """Rebuild a host from as_dict output."""
+        return cls(
+            host_id=data["host_id"],
+            type=data.get("type"),
+            state=data.get("state"),
+            version=data.get("version"),
+            controllers=tuple(
+                Controller.from_dict(controller)
+                for controller in data.get("controllers") or ()
+            ),
+            name=data.get("name"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Device(_Record):
+    """A device managed by a host."""
+
+    mac: str
+    host_id: str | None
+    name: str
+    model: str | None
+    product_line: str | None
+    version: str | None
+    hardware_version: str | None
+    location: str | None
+    ip: str | None
+    status: str | None
+    firmware_status: str | None
+    is_managed: bool
+    adoption_time: datetime | None
+    startup_time: datetime | None
+
+    @classmethod
+    def from_api(cls, raw: dict[str, Any], host_id: str | None = None) -> Device:
+        """Build a device from an item of an /ea/devices group."""
+        return cls(
+            mac=raw["mac"],
+            host_id=host_id,
+            name=raw.get("name", raw["mac"]),
+            model=raw.get("model"),
+            product_line=raw.get("productLine"),
+            version=raw.get("version"),
+            hardware_version=raw.get("hardwareVersion"),
+            location=raw.get("location"),
+            ip=raw.get("ip"),
+            status=raw.get("status"),
+            firmware_status=raw.get("firmwareStatus"),
+            is_managed=raw.get("isManaged", False),
+            adoption_time=parse_timestamp(raw.get("adoptionTime")),
+            startup_time=parse_timestamp(raw.get("startupTime")),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Device:
+        """Rebuild a device from as_dict output."""
+        names = {field.name for field in fields(cls)}
+        values = {key: value for key, value in data.items() if key in names}
+        values["adoption_time"] = parse_timestamp(values.get("adoption_time"))
+        values["startup_time"] = parse_timestamp(values.get("startup_time"))
+        return cls(**values)
+
+
+@dataclass(frozen=True, slots=True)
+class IspPeriod(_Record):
+    """One ISP metrics period of a site."""
+
+    metric_time: datetime
+    has_wan: bool
+    isp_name: str | None = None
+    download_kbps: float | None = None
+    upload_kbps: float | None = None
+    avg_latency: float | None = None
+    max_latency: float | None = None
+    packet_loss: float | None = None
+    uptime: float | None = None
+
+    @classmethod
+    def from_api(cls, raw: dict[str, Any]) -> IspPeriod | None:
+        """Build a period from an /ea/isp-metrics period, None if it has no time."""
+        metric_time = parse_timestamp(raw.get("metricTime"))
+        if metric_time is None:
+            return None
+        wan = (raw.get("data") or {}).get("wan") or {}
+        return cls(
+            metric_time=metric_time,
+            has_wan=bool(wan),
+            isp_name=wan.get("ispName"),
+            download_kbps=wan.get("download_kbps"),
+            upload_kbps=wan.get("upload_kbps"),
+            avg_latency=wan.get("avgLatency"),
+            max_latency=wan.get("maxLatency"),
+            packet_loss=wan.get("packetLoss"),
+            uptime=wan.get("uptime"),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> IspPeriod:
+        """Rebuild a period from as_dict output."""
+        names = {field.name for field in fields(cls)}
+        values = {key: value for key, value in data.items() if key in names}
+        values["metric_time"] = parse_timestamp(values.get("metric_time"))
+        return cls(**values)
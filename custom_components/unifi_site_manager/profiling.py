@@ -0,0 +1,155 @@
+"""Event loop blocking watchdog for UniFi Site Manager refreshes.
+
+The watchdog is opt-in. Each synchronous section of a refresh (building
+records, merging metrics, fanning updates out to entities) is timed, and
+sections that hold the event loop longer than a threshold are logged. A
+cProfile profiler runs only inside those sections, never across an await,
+so the summary of the worst cycle shows this integration's code and not
+whatever else the loop ran in between.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import cProfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import io
+import logging
+import pstats
+import time
+from typing import Any
+
+from .const import LOOP_PROFILE_LINES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _Cycle:
+    """Section timings and profile of one refresh cycle."""
+
+    started: datetime
+    profile: cProfile.Profile = field(default_factory=cProfile.Profile)
+    sections: dict[str, float] = field(default_factory=dict)
+    flagged: list[str] = field(default_factory=list)
+
+    @property
+    def blocked(self) -> float:
+        """Return the total time the cycle held the loop."""
+        return sum(self.sections.values())
+
+
+class LoopWatchdog:
+    """Time synchronous refresh sections and keep a profile of the worst cycle."""
+
+    def __init__(self, threshold: float) -> None:
+        """Initialize the watchdog with a threshold in seconds."""
+        self._threshold = threshold
+        self._cycle: _Cycle | None = None
+        self._in_section = False
+        self.cycles = 0
+        self.flagged_sections = 0
+        self.last_cycle: dict[str, Any] | None = None
+        self.worst_cycle: dict[str, Any] | None = None
+        self._worst_blocked = 0.0
+
+    def begin_cycle(self) -> None:
+        """Start collecting a new refresh cycle."""
+        if self._cycle is not None:
+            self.end_cycle()
+        self._cycle = _Cycle(started=datetime.now(timezone.utc))
+
+    def end_cycle(self) -> None:
+        """Finish the current cycle and keep its profile if it is the worst so far."""
+        cycle, self._cycle = self._cycle, None
+        if cycle is None:
+            return
+        self.cycles += 1
+        self.last_cycle = self._summary(cycle)
+        if cycle.blocked > self._worst_blocked:
+            self._worst_blocked = cycle.blocked
+            self.worst_cycle = {**self.last_cycle, "profile": self._profile(cycle)}
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Time and profile a synchronous section of the current cycle.
+
+        A section used outside a refresh, such as diagnostics redaction, is
+        treated as a cycle of its own.
+        """
+        if self._in_section:
+            # Nested sections are covered by the outer one
+            yield
+            return
+
+        standalone = self._cycle is None
+        if standalone:
+            self.begin_cycle()
+        cycle = self._cycle
+        assert cycle is not None
+
+        self._in_section = True
+        start = time.perf_counter()
+        try:
+            cycle.profile.enable()
+            profiling = True
+        except ValueError:
+            # Another profiler, such as the profiler integration, is running
+            profiling = False
+        try:
+            yield
+        finally:
+            if profiling:
+                cycle.profile.disable()
+            elapsed = time.perf_counter() - start
+            self._in_section = False
+            cycle.sections[name] = cycle.sections.get(name, 0.0) + elapsed
+            if elapsed > self._threshold:
+                self.flagged_sections += 1
+                cycle.flagged.append(name)
+                _LOGGER.warning(
+                    "%s blocked the event loop for %.1f ms (threshold %.1f ms)",
+                    name,
+                    elapsed * 1000,
+                    self._threshold * 1000,
+                )
+            if standalone:
+                self.end_cycle()
+
+    @staticmethod
+    def _summary(cycle: _Cycle) -> dict[str, Any]:
+        """Return the section timings of a cycle."""
+        return {
+            "started": cycle.started.isoformat(),
+            "blocked_ms": round(cycle.blocked * 1000, 3),
+            "sections_ms": {
+                name: round(seconds * 1000, 3)
+                for name, seconds in cycle.sections.items()
+            },
+            "flagged": cycle.flagged,
+        }
+
+    @staticmethod
+    def _profile(cycle: _Cycle) -> list[str]:
+        """Return the top functions of a cycle by cumulative time."""
+        stream = io.StringIO()
+        try:
+            stats = pstats.Stats(cycle.profile, stream=stream)
+        except TypeError:
+            # Nothing was recorded
+            return []
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+            LOOP_PROFILE_LINES
+        )
+        return [line for line in stream.getvalue().splitlines() if line.strip()]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the watchdog state for diagnostics."""
+        return {
+            "threshold_ms": round(self._threshold * 1000, 3),
+            "cycles": self.cycles,
+            "flagged_sections": self.flagged_sections,
+            "last_cycle": self.last_cycle,
+            "worst_cycle": self.worst_cycle,
+        }
@@ -0,0 +1,96 @@
+"""Request scheduling for the UniFi Site Manager API client."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestScheduler:
+    """Limit in-flight requests and pace them against the API quota.
+
+    A semaphore caps how many requests run at once, so independent endpoints
+    overlap instead of queueing behind a single lock. A token bucket sized to
+    the account rate limit gates when each request may start. The bucket
+    refills continuously until the server reports its own quota through the
+    rate limit headers, after which the server's numbers are authoritative
+    until the advertised reset time.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        rate_limit: int,
+        period: float = 60.0,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        self._capacity = float(max(1, rate_limit))
+        self._refill_rate = self._capacity / period
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._reset_at: float | None = None
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of requests that may start right now."""
+        self._refill()
+        return self._tokens
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a free request slot and a rate limit token."""
+        async with self._semaphore:
+            await self._acquire_token()
+            yield
+
+    def update_quota(self, remaining: int | None, reset: float | None) -> None:
+        """Feed the server reported quota into the bucket.
+
+        Args:
+            remaining: Value of X-RateLimit-Remaining
+            reset: Value of X-RateLimit-Reset as a unix timestamp
+        """
+        self._refill()
+        if remaining is not None:
+            self._tokens = min(self._tokens, float(max(0, remaining)))
+        if reset is not None:
+            self._reset_at = time.monotonic() + max(0.0, reset - time.time())
+
+    def _refill(self) -> None:
+        """Top up the bucket for the time elapsed since the last check."""
+        now = time.monotonic()
+        if self._reset_at is not None:
+            if now >= self._reset_at:
+                self._tokens = self._capacity
+                self._reset_at = None
+        else:
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._updated) * self._refill_rate,
+            )
+        self._updated = now
+
+    async def _acquire_token(self) -> None:
+        """Take a token from the bucket, sleeping until one is available."""
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+
+            if self._reset_at is not None:
+                wait_time = self._reset_at - time.monotonic()
+                _LOGGER.warning(
+                    "Rate limit reached. Waiting %.1f seconds before next request",
+                    wait_time,
+                )
+            else:
+                wait_time = (1 - self._tokens) / self._refill_rate
+                _LOGGER.debug("Pacing request for %.2f seconds", wait_time)
+
+            await asyncio.sleep(max(wait_time, 0.01))
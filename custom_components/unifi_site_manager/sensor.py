@@ -5,7 +5,6 @@ import logging
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
-import dateutil.parser
 from typing import Any, Final
 
 from homeassistant.components.sensor import (
@@ -19,6 +18,7 @@ from homeassistant.const import (
     PERCENTAGE,
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
     UnitOfDataRate,
+    UnitOfInformation,
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
@@ -46,8 +46,18 @@ from .const import (
     ICON_UPTIME,
     KBPS_TO_MBPS,
     STATE_CLASS_MEASUREMENT,
+    STATE_CLASS_TOTAL_INCREASING,
+)
+from .discovery import async_setup_entity_discovery
+from .entity import (
+    UnifiSiteManagerDeviceEntity,
+    UnifiSiteManagerHostEntity,
+    UnifiSiteManagerHubEntity,
+    UnifiSiteManagerSiteEntity,
+    device_device_info,
+    host_device_info,
+    site_device_info,
 )
-from .entity import UnifiSiteManagerSiteEntity, UnifiSiteManagerDeviceEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,7 +65,13 @@ _LOGGER = logging.getLogger(__name__)
 class UnifiSensorEntityDescription(SensorEntityDescription):
     """Class describing UniFi sensor entities."""
 
-    value_fn: Callable[[dict[str, Any]], StateType | datetime]
+    value_fn: Callable[[Any], StateType | datetime]
+    # Read the value from the site record instead of the latest metrics period
+    from_site: bool = False
+    # Read the value from the rolling window statistics of the site
+    from_aggregates: bool = False
+    # Read the value from the device counts of the site or host
+    from_devices: bool = False
 
 SITE_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
     UnifiSensorEntityDescription(
@@ -65,7 +81,7 @@ SITE_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
         native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
         device_class=SensorDeviceClass.DATA_RATE,
         state_class=STATE_CLASS_MEASUREMENT,
-        value_fn=lambda data: data.get("wan", {}).get("download_kbps", 0) / KBPS_TO_MBPS,
+        value_fn=lambda period: (period.download_kbps or 0) / KBPS_TO_MBPS,
     ),
     UnifiSensorEntityDescription(
         key="upload_speed",
@@ -74,7 +90,7 @@ SITE_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
         native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
         device_class=SensorDeviceClass.DATA_RATE,
         state_class=STATE_CLASS_MEASUREMENT,
-        value_fn=lambda data: data.get("wan", {}).get("upload_kbps", 0) / KBPS_TO_MBPS,
+        value_fn=lambda period: (period.upload_kbps or 0) / KBPS_TO_MBPS,
     ),
     UnifiSensorEntityDescription(
         key="latency_average",
@@ -83,7 +99,7 @@ SITE_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
         native_unit_of_measurement=UnitOfTime.MILLISECONDS,
         device_class=SensorDeviceClass.DURATION,
         state_class=STATE_CLASS_MEASUREMENT,
-        value_fn=lambda data: data.get("wan", {}).get("avgLatency"),
+        value_fn=lambda period: period.avg_latency,
     ),
     UnifiSensorEntityDescription(
         key="latency_max",
@@ -92,7 +108,7 @@ SITE_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
         native_unit_of_measurement=UnitOfTime.MILLISECONDS,
         device_class=SensorDeviceClass.DURATION,
         state_class=STATE_CLASS_MEASUREMENT,
-        value_fn=lambda data: data.get("wan", {}).get("maxLatency"),
+        value_fn=lambda period: period.max_latency,
     ),
     UnifiSensorEntityDescription(
         key="packet_loss",
@@ -100,7 +116,7 @@ SITE_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
         icon=ICON_PACKET_LOSS,
         native_unit_of_measurement=PERCENTAGE,
         state_class=STATE_CLASS_MEASUREMENT,
-        value_fn=lambda data: data.get("wan", {}).get("packetLoss", 0),
+        value_fn=lambda period: period.packet_loss or 0,
     ),
     UnifiSensorEntityDescription(
         key="uptime",
@@ -108,7 +124,99 @@ SITE_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
         icon=ICON_UPTIME,
         native_unit_of_measurement=PERCENTAGE,
         state_class=STATE_CLASS_MEASUREMENT,
-        value_fn=lambda data: data.get("wan", {}).get("uptime", 0),
+        value_fn=lambda period: period.uptime or 0,
+    ),
+    # Rolling windows over the buffered 5m periods
+    UnifiSensorEntityDescription(
+        key="download_speed_1h",
+        translation_key="download_speed_1h",
+        icon=ICON_SPEED_TEST,
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda aggregates: aggregates.download_1h,
+        from_aggregates=True,
+    ),
+    UnifiSensorEntityDescription(
+        key="download_speed_24h",
+        translation_key="download_speed_24h",
+        icon=ICON_SPEED_TEST,
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=STATE_CLASS_MEASUREMENT,
+        value_fn=lambda aggregates: aggregates.download_24h,
+        from_aggregates=True,
+    ),
+    UnifiSensorEntityDescription(
+        key="upload_speed_1h",
+        translation_key="upload_speed_1h",
+        icon=ICON_SPEED_TEST,
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda aggregates: aggregates.upload_1h,
+        from_aggregates=True,
+    ),
+    UnifiSensorEntityDescription(
+        key="upload_speed_24h",
+        translation_key="upload_speed_24h",
+        icon=ICON_SPEED_TEST,
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=STATE_CLASS_MEASUREMENT,
+        value_fn=lambda aggregates: aggregates.upload_24h,
+        from_aggregates=True,
+    ),
+    UnifiSensorEntityDescription(
+        key="latency_average_1h",
+        translation_key="latency_average_1h",
+        icon=ICON_LATENCY,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda aggregates: aggregates.latency_1h,
+        from_aggregates=True,
+    ),
+    UnifiSensorEntityDescription(
+        key="latency_average_24h",
+        translation_key="latency_average_24h",
+        icon=ICON_LATENCY,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=STATE_CLASS_MEASUREMENT,
+        value_fn=lambda aggregates: aggregates.latency_24h,
+        from_aggregates=True,
+    ),
+    UnifiSensorEntityDescription(
+        key="latency_p95_24h",
+        translation_key="latency_p95_24h",
+        icon=ICON_LATENCY,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=STATE_CLASS_MEASUREMENT,
+        value_fn=lambda aggregates: aggregates.latency_p95_24h,
+        from_aggregates=True,
+    ),
+    UnifiSensorEntityDescription(
+        key="packet_loss_24h",
+        translation_key="packet_loss_24h",
+        icon=ICON_PACKET_LOSS,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=STATE_CLASS_MEASUREMENT,
+        value_fn=lambda aggregates: aggregates.packet_loss_24h,
+        from_aggregates=True,
+    ),
+    UnifiSensorEntityDescription(
+        key="uptime_24h",
+        translation_key="uptime_24h",
+        icon=ICON_UPTIME,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=STATE_CLASS_MEASUREMENT,
+        value_fn=lambda aggregates: aggregates.uptime_24h,
+        from_aggregates=True,
     ),
     UnifiSensorEntityDescription(
         key="total_devices",
@@ -116,7 +224,52 @@ SITE_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
         icon=ICON_CLIENTS,
         state_class=STATE_CLASS_MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get("counts", {}).get("totalDevice", 0),
+        value_fn=lambda site: site.total_devices or 0,
+        from_site=True,
+    ),
+    # Rolled up from the device index, follows the devices interval
+    UnifiSensorEntityDescription(
+        key="devices_offline",
+        translation_key="devices_offline",
+        icon=ICON_DEVICE,
+        state_class=STATE_CLASS_MEASUREMENT,
+        value_fn=lambda counts: counts.offline,
+        from_devices=True,
+    ),
+    UnifiSensorEntityDescription(
+        key="devices_pending_update",
+        translation_key="devices_pending_update",
+        icon="mdi:update",
+        state_class=STATE_CLASS_MEASUREMENT,
+        value_fn=lambda counts: counts.pending_update,
+        from_devices=True,
+    ),
+)
+
+HOST_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
+    UnifiSensorEntityDescription(
+        key="devices",
+        translation_key="devices",
+        icon=ICON_DEVICE,
+        state_class=STATE_CLASS_MEASUREMENT,
+        value_fn=lambda counts: counts.total,
+        from_devices=True,
+    ),
+    UnifiSensorEntityDescription(
+        key="devices_offline",
+        translation_key="devices_offline",
+        icon=ICON_DEVICE,
+        state_class=STATE_CLASS_MEASUREMENT,
+        value_fn=lambda counts: counts.offline,
+        from_devices=True,
+    ),
+    UnifiSensorEntityDescription(
+        key="devices_pending_update",
+        translation_key="devices_pending_update",
+        icon="mdi:update",
+        state_class=STATE_CLASS_MEASUREMENT,
+        value_fn=lambda counts: counts.pending_update,
+        from_devices=True,
     ),
 )
 
@@ -126,28 +279,28 @@ DEVICE_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
         translation_key="firmware_version",
         icon="mdi:text-box-check",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get("version"),
+        value_fn=lambda device: device.version,
     ),
     UnifiSensorEntityDescription(
         key="ip_address",
         translation_key="ip_address",
         icon="mdi:ip-network",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get("ip"),
+        value_fn=lambda device: device.ip,
     ),
     UnifiSensorEntityDescription(
         key="model",
         translation_key="model",
         icon=ICON_DEVICE,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get("model"),
+        value_fn=lambda device: device.model,
     ),
     UnifiSensorEntityDescription(
         key="product_line",
         translation_key="product_line",
         icon=ICON_DEVICE,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get("productLine"),
+        value_fn=lambda device: device.product_line,
     ),
     UnifiSensorEntityDescription(
         key="adoption_time",
@@ -155,11 +308,7 @@ DEVICE_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
         icon=ICON_ADOPTION,
         device_class=SensorDeviceClass.TIMESTAMP,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: (
-            dateutil.parser.parse(data["adoptionTime"])
-            if data.get("adoptionTime")
-            else None
-        ),
+        value_fn=lambda device: device.adoption_time,
     ),
     UnifiSensorEntityDescription(
         key="startup_time",
@@ -167,9 +316,112 @@ DEVICE_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
         icon=ICON_STARTUP,
         device_class=SensorDeviceClass.TIMESTAMP,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: (
-            dateutil.parser.parse(data["startupTime"])
-            if data.get("startupTime")
+        value_fn=lambda device: device.startup_time,
+    ),
+)
+
+# Created only when instrumentation is enabled, value_fn receives the API client
+INSTRUMENTATION_SENSORS: Final[tuple[UnifiSensorEntityDescription, ...]] = (
+    UnifiSensorEntityDescription(
+        key="api_requests",
+        translation_key="api_requests",
+        icon="mdi:api",
+        state_class=STATE_CLASS_TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda api: api.instrumentation.requests,
+    ),
+    UnifiSensorEntityDescription(
+        key="api_latency_p50",
+        translation_key="api_latency_p50",
+        icon=ICON_LATENCY,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda api: api.instrumentation.latency(0.50),
+    ),
+    UnifiSensorEntityDescription(
+        key="api_latency_p95",
+        translation_key="api_latency_p95",
+        icon=ICON_LATENCY,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda api: api.instrumentation.latency(0.95),
+    ),
+    UnifiSensorEntityDescription(
+        key="api_latency_p99",
+        translation_key="api_latency_p99",
+        icon=ICON_LATENCY,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda api: api.instrumentation.latency(0.99),
+    ),
+    UnifiSensorEntityDescription(
+        key="api_bytes",
+        translation_key="api_bytes",
+        icon="mdi:download-network",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=STATE_CLASS_TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda api: api.instrumentation.bytes,
+    ),
+    UnifiSensorEntityDescription(
+        key="api_decode_time",
+        translation_key="api_decode_time",
+        icon="mdi:code-json",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=STATE_CLASS_TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda api: round(
+            sum(
+                stats.decode_time
+                for stats in api.instrumentation.endpoints.values()
+            )
+            * 1000,
+            3,
+        ),
+    ),
+    UnifiSensorEntityDescription(
+        key="api_retries",
+        translation_key="api_retries",
+        icon="mdi:refresh",
+        state_class=STATE_CLASS_TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda api: api.instrumentation.retries,
+    ),
+    UnifiSensorEntityDescription(
+        key="api_rate_limited",
+        translation_key="api_rate_limited",
+        icon="mdi:speedometer-slow",
+        state_class=STATE_CLASS_TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda api: api.instrumentation.rate_limited,
+    ),
+    UnifiSensorEntityDescription(
+        key="api_rate_limit_remaining",
+        translation_key="api_rate_limit_remaining",
+        icon="mdi:gauge",
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda api: api.rate_limit_remaining,
+    ),
+    UnifiSensorEntityDescription(
+        key="refresh_duration",
+        translation_key="refresh_duration",
+        icon="mdi:timer-sync-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda api: (
+            round(api.instrumentation.last_refresh_time * 1000, 3)
+            if api.instrumentation.last_refresh_time is not None
             else None
         ),
     ),
@@ -182,61 +434,80 @@ async def async_setup_entry(
 ) -> None:
     """Set up the UniFi Site Manager sensors."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    
-    _LOGGER.debug("Setting up sensors with sites data: %s", coordinator.data["sites"])
-    
-    entities: list[UnifiSiteManagerSensor | UnifiSiteManagerDeviceSensor] = []
 
-    # Add site-level sensors
-    for site_id, site_data in coordinator.data["sites"].items():
+    def _build_site_sensors(site_id: str) -> list[UnifiSiteManagerSensor]:
+        """Build the sensors of a site once it has metrics."""
         # Check if site has metrics
-        site_metrics = coordinator.get_site_metrics(site_id)
-        _LOGGER.debug("Site %s metrics: %s", site_id, site_metrics)
-        
-        if not site_metrics or not isinstance(site_metrics, list) or not site_metrics:
+        latest = coordinator.get_latest_metrics(site_id)
+        if not latest:
             _LOGGER.debug("No valid metrics found for site %s", site_id)
-            continue
-            
-        # Verify data structure
-        metric_set = site_metrics[0]
-        if not metric_set.get("periods"):
-            _LOGGER.debug("No periods found in metrics for site %s", site_id)
-            continue
-            
-        periods = metric_set["periods"]
-        if not periods:
-            _LOGGER.debug("Empty periods list for site %s", site_id)
-            continue
-            
-        latest_data = periods[0].get("data", {})
-        if not latest_data.get("wan"):
+            return []
+
+        if not latest.has_wan:
             _LOGGER.debug("No WAN data found for site %s", site_id)
-            continue
+            return []
 
         # Create sensors since we have valid data
-        for description in SITE_SENSORS:
-            _LOGGER.debug("Creating sensor %s for site %s", description.key, site_id)
-            entities.append(
-                UnifiSiteManagerSensor(
-                    coordinator=coordinator,
-                    description=description,
-                    site_id=site_id,
-                )
+        device_info = site_device_info(coordinator, site_id)
+        return [
+            UnifiSiteManagerSensor(
+                coordinator=coordinator,
+                description=description,
+                site_id=site_id,
+                entry_id=config_entry.entry_id,
+                device_info=device_info,
             )
+            for description in SITE_SENSORS
+        ]
 
-    # Add device-level sensors
-    for device_id, device_data in coordinator.data.get("devices", {}).items():
-        _LOGGER.debug("Creating sensors for device %s", device_id)
-        entities.extend(
+    def _build_host_sensors(host_id: str) -> list[UnifiSiteManagerHostSensor]:
+        """Build the device rollup sensors of a host."""
+        device_info = host_device_info(coordinator, host_id)
+        return [
+            UnifiSiteManagerHostSensor(
+                coordinator=coordinator,
+                description=description,
+                host_id=host_id,
+                entry_id=config_entry.entry_id,
+                device_info=device_info,
+            )
+            for description in HOST_SENSORS
+        ]
+
+    def _build_device_sensors(device_id: str) -> list[UnifiSiteManagerDeviceSensor]:
+        """Build the sensors of a device."""
+        device_info = device_device_info(coordinator, device_id)
+        return [
             UnifiSiteManagerDeviceSensor(
                 coordinator=coordinator,
                 description=description,
                 device_id=device_id,
+                entry_id=config_entry.entry_id,
+                device_info=device_info,
             )
             for description in DEVICE_SENSORS
-        )
+        ]
 
-    async_add_entities(entities)
+    await async_setup_entity_discovery(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        {
+            "sites": _build_site_sensors,
+            "hosts": _build_host_sensors,
+            "devices": _build_device_sensors,
+        },
+    )
+
+    if coordinator.api.instrumentation is not None:
+        async_add_entities(
+            UnifiSiteManagerInstrumentationSensor(
+                coordinator=coordinator,
+                description=description,
+                entry_id=config_entry.entry_id,
+            )
+            for description in INSTRUMENTATION_SENSORS
+        )
 
 class UnifiSiteManagerSensor(UnifiSiteManagerSiteEntity, SensorEntity):
     """Representation of a UniFi Site Manager Sensor."""
@@ -246,12 +517,23 @@ class UnifiSiteManagerSensor(UnifiSiteManagerSiteEntity, SensorEntity):
     @property
     def native_value(self) -> StateType | datetime:
         """Return the state of the sensor with validation."""
+        if self.entity_description.from_site:
+            site = self.site_data
+            return self.entity_description.value_fn(site) if site else None
+
+        if self.entity_description.from_aggregates:
+            aggregates = self.site_aggregates
+            return self.entity_description.value_fn(aggregates) if aggregates else None
+
+        if self.entity_description.from_devices:
+            counts = self.device_counts
+            return self.entity_description.value_fn(counts) if counts else None
+
         metrics = self.site_metrics
         if not metrics:
             return None
         
-        wan_data = metrics.get("wan", {})
-        if not wan_data:
+        if not metrics.has_wan:
             _LOGGER.debug(
                 "No WAN data available for sensor %s", 
                 self.entity_description.key
@@ -274,27 +556,37 @@ class UnifiSiteManagerSensor(UnifiSiteManagerSiteEntity, SensorEntity):
         """Return additional state attributes."""
         metrics = self.site_metrics
         if not metrics:
-            return {}
-        
-        metrics_data = metrics.get("wan", {})
-        site_data = self.site_data or {}
+            return super().extra_state_attributes or {}
         
         attrs = {
-            ATTR_ISP_NAME: metrics_data.get("ispName"),
-            ATTR_DOWNLOAD_SPEED: metrics_data.get("download_kbps"),
-            ATTR_UPLOAD_SPEED: metrics_data.get("upload_kbps"),
-            ATTR_LATENCY_AVG: metrics_data.get("avgLatency"),
-            ATTR_LATENCY_MAX: metrics_data.get("maxLatency"), 
-            ATTR_PACKET_LOSS: metrics_data.get("packetLoss"),
-            ATTR_UPTIME: metrics_data.get("uptime"),
+            ATTR_ISP_NAME: metrics.isp_name,
+            ATTR_DOWNLOAD_SPEED: metrics.download_kbps,
+            ATTR_UPLOAD_SPEED: metrics.upload_kbps,
+            ATTR_LATENCY_AVG: metrics.avg_latency,
+            ATTR_LATENCY_MAX: metrics.max_latency,
+            ATTR_PACKET_LOSS: metrics.packet_loss,
+            ATTR_UPTIME: metrics.uptime,
         }
         
         # Add total devices only if available in site data
-        if site_data.get("statistics", {}).get("counts", {}).get("totalDevice") is not None:
-            attrs[ATTR_TOTAL_DEVICES] = site_data["statistics"]["counts"]["totalDevice"]
-            
+        site_data = self.site_data
+        if site_data and site_data.total_devices is not None:
+            attrs[ATTR_TOTAL_DEVICES] = site_data.total_devices
+
+        attrs.update(super().extra_state_attributes or {})
         return attrs
     
+class UnifiSiteManagerHostSensor(UnifiSiteManagerHostEntity, SensorEntity):
+    """Representation of a UniFi Site Manager host device rollup sensor."""
+
+    entity_description: UnifiSensorEntityDescription
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        counts = self.device_counts
+        return self.entity_description.value_fn(counts) if counts else None
+
 class UnifiSiteManagerDeviceSensor(UnifiSiteManagerDeviceEntity, SensorEntity):
     """Representation of a UniFi Site Manager Device Sensor."""
 
@@ -315,4 +607,41 @@ class UnifiSiteManagerDeviceSensor(UnifiSiteManagerDeviceEntity, SensorEntity):
                 err,
                 self.device_data
             )
-            return None
\ No newline at end of file
+            return None
+
+
+class UnifiSiteManagerInstrumentationSensor(UnifiSiteManagerHubEntity, SensorEntity):
+    """Diagnostic sensor reporting how the API client and refreshes perform."""
+
+    entity_description: UnifiSensorEntityDescription
+
+    @property
+    def available(self) -> bool:
+        """Return if the shared API client still collects statistics.
+
+        A hub shared by several entries follows the options of its owner,
+        which may have instrumentation turned off.
+        """
+        return super().available and self.coordinator.api.instrumentation is not None
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the current statistic."""
+        if self.coordinator.api.instrumentation is None:
+            return None
+        return self.entity_description.value_fn(self.coordinator.api)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the time of each refresh stage on the refresh duration sensor."""
+        if (
+            self.entity_description.key != "refresh_duration"
+            or self.coordinator.api.instrumentation is None
+        ):
+            return None
+        return {
+            f"{stage}_ms": round(seconds * 1000, 3)
+            for stage, seconds in (
+                self.coordinator.api.instrumentation.last_stage_times.items()
+            )
+        }
@@ -45,15 +45,19 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             target_entities = [e for e in target_entities if e is not None]
 
         # Get unique list of coordinators that need refreshing
+        # Entries of the same account share a coordinator, which is only
+        # refreshed once
         coordinators = set()
-        for entry_id, coordinator in hass.data[DOMAIN].items():
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            if (coordinator := hass.data[DOMAIN].get(entry.entry_id)) is None:
+                continue
             if not target_entities:
                 # No specific entities targeted, refresh all coordinators
                 coordinators.add(coordinator)
             else:
                 # Check if any target entities belong to this coordinator
                 for entity in target_entities:
-                    if entity.config_entry_id == entry_id:
+                    if entity.config_entry_id == entry.entry_id:
                         coordinators.add(coordinator)
                         break
 
@@ -64,7 +68,9 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         for coordinator in coordinators:
             try:
                 if refresh_type == "all":
-                    await coordinator.async_refresh()
+                    # Fetch full bodies instead of revalidating cached ones
+                    coordinator.api.clear_cache()
+                    await coordinator.async_refresh_all()
                 elif refresh_type == "metrics":
                     await coordinator.async_refresh_metrics()
                 elif refresh_type == "sites":
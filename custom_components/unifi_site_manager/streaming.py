@@ -0,0 +1,94 @@
+"""Incremental parsing of large JSON responses for UniFi Site Manager.
+
+The ISP metrics endpoints return one object per site inside the top level
+``data`` array, and a 24h window across many sites runs to megabytes.
+Rather than decoding the whole body at once, the bytes are fed in as they
+arrive and every item of the array is decoded on its own as soon as it is
+complete. Bytes before the item being received are dropped, so peak memory
+is bounded by the largest item instead of the whole response.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+import re
+from typing import Any
+
+# Strings are matched whole so brackets inside them are skipped. A lone
+# quote is a string cut off at the end of the buffer.
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|["\[\]{}]', re.DOTALL)
+
+
+class JsonArrayStream:
+    """Split the objects of a top level array member out of a streamed JSON object."""
+
+    def __init__(self, key: str, decoder: Callable[[bytes], Any]) -> None:
+        """Initialize the parser for the array stored under key."""
+        self._key = json.dumps(key).encode()
+        self._decoder = decoder
+        self._buffer = bytearray()
+        # Offset of the next byte to scan and of the item being received
+        self._pos = 0
+        self._item_start: int | None = None
+        self._depth = 0
+        self._last_key: bytes | None = None
+        self._in_array = False
+        self._seen_root = False
+        self.bytes = 0
+        self.items = 0
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Add received bytes, returning the array items they completed."""
+        self._buffer += chunk
+        self.bytes += len(chunk)
+        buffer = self._buffer
+        items: list[Any] = []
+
+        pos = len(buffer)
+        for match in _TOKEN.finditer(buffer, self._pos):
+            token = match.group()
+            if token == b'"':
+                # Wait for the rest of the string
+                pos = match.start()
+                break
+
+            if token[0] == 0x22:  # a complete string
+                if self._depth == 1:
+                    self._last_key = token
+            elif token in (b"{", b"["):
+                self._depth += 1
+                self._seen_root = True
+                if (
+                    token == b"["
+                    and self._depth == 2
+                    and self._last_key == self._key
+                ):
+                    self._in_array = True
+                elif token == b"{" and self._in_array and self._depth == 3:
+                    self._item_start = match.start()
+            else:
+                if self._in_array and self._depth == 3 and self._item_start is not None:
+                    items.append(
+                        self._decoder(bytes(buffer[self._item_start : match.end()]))
+                    )
+                    self._item_start = None
+                elif self._in_array and self._depth == 2:
+                    self._in_array = False
+                self._depth -= 1
+                if self._depth < 0:
+                    raise ValueError("Unbalanced JSON brackets")
+
+        # Drop everything before the item being received
+        keep = self._item_start if self._item_start is not None else pos
+        del buffer[:keep]
+        self._pos = pos - keep
+        if self._item_start is not None:
+            self._item_start = 0
+
+        self.items += len(items)
+        return items
+
+    def close(self) -> None:
+        """Check the whole document was received."""
+        if not self._seen_root or self._depth or self._buffer.strip():
+            raise ValueError(f"Truncated JSON document after {self.bytes} bytes")